@@ -0,0 +1,36 @@
+"""
+Shared fixtures and options for the benchmarks.
+
+The cases marked `slow` (a single round of 12! swaps takes minutes, even
+with `--benchmark-disable`) only run with `--run-slow`.
+"""
+
+import pytest
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--run-slow", action="store_true", help="also run the benchmarks marked slow"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--run-slow"):
+        return
+    skip_slow = pytest.mark.skip(reason="needs --run-slow")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
+
+
+@pytest.fixture
+def record_ns_per(benchmark):
+    """Record the mean time per item as `ns_per_<item>`, unless benchmarking
+    is disabled."""
+
+    def record(item, cnt):
+        if benchmark.stats is not None:
+            mean = benchmark.stats.stats.mean
+            benchmark.extra_info[f"ns_per_{item}"] = mean * 1e9 / cnt
+
+    return record
@@ -1,7 +1,13 @@
 # -*- coding: utf-8 -*-
 from __future__ import print_function
 
-from ec_gen.combin import comb, emk_comb_gen
+from ec_gen.combin import (
+    comb,
+    emk,
+    emk_comb_gen,
+    multiset_comb_count,
+    multiset_comb_gen,
+)
 from ec_gen.combin_old import emk_gen
 
 
@@ -12,6 +18,13 @@ def run_emk_new(n, k):
     return cnt
 
 
+def run_emk_iter(n, k):
+    cnt = 1
+    for _ in emk_comb_gen(n, k, iterative=True):
+        cnt += 1
+    return cnt
+
+
 def run_emk_old(n, k):
     cnt = 1
     for _ in emk_gen(n, k):
@@ -19,6 +32,22 @@ def run_emk_old(n, k):
     return cnt
 
 
+def run_multiset(mults, k):
+    cnt = 1
+    for _ in multiset_comb_gen(mults, k):
+        cnt += 1
+    return cnt
+
+
+def run_multiset_dedup(mults, k):
+    # expand the multiset and deduplicate the emk output by counts
+    values = [v for v, m in enumerate(mults) for _ in range(m)]
+    seen = set()
+    for seq in emk(len(values), k):
+        seen.add(tuple(v for v, bit in zip(values, seq) if bit))
+    return len(seen)
+
+
 def test_emk_new(benchmark) -> None:
     """[summary]
 
@@ -31,6 +60,18 @@ def test_emk_new(benchmark) -> None:
     assert cnt == comb(n, k)
 
 
+def test_emk_iter(benchmark) -> None:
+    """[summary]
+
+    Arguments:
+        benchmark ([type]): [description]
+    """
+    n = 18
+    k = 7
+    cnt = benchmark(run_emk_iter, n, k)
+    assert cnt == comb(n, k)
+
+
 def test_emk_old(benchmark) -> None:
     """[summary]
 
@@ -41,3 +82,27 @@ def test_emk_old(benchmark) -> None:
     k = 7
     cnt = benchmark(run_emk_old, n, k)
     assert cnt == comb(n, k)
+
+
+def test_multiset(benchmark) -> None:
+    """[summary]
+
+    Arguments:
+        benchmark ([type]): [description]
+    """
+    mults = [3, 3, 3, 3, 3, 3]
+    k = 9
+    cnt = benchmark(run_multiset, mults, k)
+    assert cnt == multiset_comb_count(mults, k)
+
+
+def test_multiset_dedup(benchmark) -> None:
+    """[summary]
+
+    Arguments:
+        benchmark ([type]): [description]
+    """
+    mults = [3, 3, 3, 3, 3, 3]
+    k = 9
+    cnt = benchmark(run_multiset_dedup, mults, k)
+    assert cnt == multiset_comb_count(mults, k)
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+from __future__ import print_function
+
+from math import factorial
+
+import pytest
+
+from ec_gen.ehr import ehr_gen, ehr_gen_loopless
+
+
+def run_ehr(n):
+    alphabets = list("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+    cnt = 1
+    for x in ehr_gen(n):
+        alphabets[0], alphabets[x] = alphabets[x], alphabets[0]
+        cnt += 1
+    return cnt
+
+
+def run_ehr_loopless(n):
+    alphabets = list("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+    cnt = 1
+    for x in ehr_gen_loopless(n):
+        alphabets[0], alphabets[x] = alphabets[x], alphabets[0]
+        cnt += 1
+    return cnt
+
+
+def test_ehr(benchmark) -> None:
+    """[summary]
+
+    Arguments:
+        benchmark ([type]): [description]
+    """
+    cnt = benchmark(run_ehr, 8)
+    assert cnt == 40320
+
+
+def test_ehr_loopless(benchmark) -> None:
+    """[summary]
+
+    Arguments:
+        benchmark ([type]): [description]
+    """
+    cnt = benchmark(run_ehr_loopless, 8)
+    assert cnt == 40320
+
+
+@pytest.mark.parametrize("n", [10, 11, pytest.param(12, marks=pytest.mark.slow)])
+def test_ehr_large(benchmark, record_ns_per, n) -> None:
+    """List-reversing engine, one round per n (12! swaps take a while).
+
+    Arguments:
+        benchmark ([type]): [description]
+    """
+    cnt = benchmark.pedantic(run_ehr, args=(n,), rounds=1, iterations=1)
+    record_ns_per("swap", cnt)
+    assert cnt == factorial(n)
+
+
+@pytest.mark.parametrize("n", [10, 11, pytest.param(12, marks=pytest.mark.slow)])
+def test_ehr_loopless_large(benchmark, record_ns_per, n) -> None:
+    """Loopless engine, one round per n (12! swaps take a while).
+
+    Arguments:
+        benchmark ([type]): [description]
+    """
+    cnt = benchmark.pedantic(run_ehr_loopless, args=(n,), rounds=1, iterations=1)
+    record_ns_per("swap", cnt)
+    assert cnt == factorial(n)
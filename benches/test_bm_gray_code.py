@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+from __future__ import print_function
+
+import pytest
+
+from ec_gen.gray_code import brgc_gen, brgc_gen_loopless
+
+
+def run_brgc(gen, n):
+    cnt = 1
+    for _ in gen(n):
+        cnt += 1
+    return cnt
+
+
+@pytest.mark.parametrize("n", [12, 16, 20])
+def test_brgc_gen(benchmark, record_ns_per, n) -> None:
+    """Recursive engine: the cost per flip grows with n.
+
+    Arguments:
+        benchmark ([type]): [description]
+    """
+    cnt = benchmark(run_brgc, brgc_gen, n)
+    record_ns_per("flip", cnt)
+    assert cnt == 2**n
+
+
+@pytest.mark.parametrize("n", [12, 16, 20])
+def test_brgc_gen_loopless(benchmark, record_ns_per, n) -> None:
+    """Loopless engine: the cost per flip stays flat as n grows.
+
+    Arguments:
+        benchmark ([type]): [description]
+    """
+    cnt = benchmark(run_brgc, brgc_gen_loopless, n)
+    record_ns_per("flip", cnt)
+    assert cnt == 2**n
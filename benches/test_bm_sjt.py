@@ -1,8 +1,12 @@
 # -*- coding: utf-8 -*-
 from __future__ import print_function
 
-from ec_gen.sjt import PlainChanges, sjt_gen
-from ec_gen.sjt_list import sjt2
+from math import factorial
+
+import pytest
+
+from ec_gen.sjt import PlainChanges, sjt_gen, sjt_gen_loopless
+from ec_gen.sjt_list import sjt2, sjt2_batches, sjt2_buffer
 
 
 def run_sjt_new(n):
@@ -14,6 +18,15 @@ def run_sjt_new(n):
     return cnt
 
 
+def run_sjt_loopless(n):
+    alphabets = list("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+    cnt = 0
+    for x in sjt_gen_loopless(n):
+        cnt += 1
+        alphabets[x], alphabets[x + 1] = alphabets[x + 1], alphabets[x]
+    return cnt
+
+
 def run_sjt_old(n):
     alphabets = list("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
     cnt = 0
@@ -23,6 +36,26 @@ def run_sjt_old(n):
     return cnt
 
 
+def run_sjt_buffer(n):
+    alphabets = list("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+    cnt = 0
+    for perm in sjt2_buffer(n):
+        _ = list(alphabets[i] for i in perm)
+        cnt += 1
+    return cnt
+
+
+def run_sjt_batches(n):
+    import numpy as np
+
+    alphabets = np.array(list("ABCDEFGHIJKLMNOPQRSTUVWXYZ"))
+    cnt = 0
+    for perms in sjt2_batches(n):
+        _ = alphabets[perms]
+        cnt += len(perms)
+    return cnt
+
+
 def run_plain_changes(n):
     alphabets = list("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
     cnt = 1
@@ -32,6 +65,15 @@ def run_plain_changes(n):
     return cnt
 
 
+def run_plain_changes_loopless(n):
+    alphabets = list("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+    cnt = 1
+    for x in sjt_gen_loopless(n, origin=False):
+        alphabets[x], alphabets[x + 1] = alphabets[x + 1], alphabets[x]
+        cnt += 1
+    return cnt
+
+
 def test_sjt_new(benchmark) -> None:
     """[summary]
 
@@ -52,6 +94,26 @@ def test_sjt_old(benchmark) -> None:
     assert cnt == 40320
 
 
+def test_sjt_buffer(benchmark) -> None:
+    """[summary]
+
+    Arguments:
+        benchmark ([type]): [description]
+    """
+    cnt = benchmark(run_sjt_buffer, 8)
+    assert cnt == 40320
+
+
+def test_sjt_batches(benchmark) -> None:
+    """[summary]
+
+    Arguments:
+        benchmark ([type]): [description]
+    """
+    cnt = benchmark(run_sjt_batches, 8)
+    assert cnt == 40320
+
+
 def test_plain_changes(benchmark) -> None:
     """[summary]
 
@@ -60,3 +122,51 @@ def test_plain_changes(benchmark) -> None:
     """
     cnt = benchmark(run_plain_changes, 8)
     assert cnt == 40320
+
+
+@pytest.mark.parametrize("n", [10, 11, pytest.param(12, marks=pytest.mark.slow)])
+def test_sjt_new_large(benchmark, record_ns_per, n) -> None:
+    """Recursive engine, one round per n (12! swaps take a while).
+
+    Arguments:
+        benchmark ([type]): [description]
+    """
+    cnt = benchmark.pedantic(run_sjt_new, args=(n,), rounds=1, iterations=1)
+    record_ns_per("swap", cnt)
+    assert cnt == factorial(n)
+
+
+@pytest.mark.parametrize("n", [10, 11, pytest.param(12, marks=pytest.mark.slow)])
+def test_sjt_loopless_large(benchmark, record_ns_per, n) -> None:
+    """Loopless engine, one round per n (12! swaps take a while).
+
+    Arguments:
+        benchmark ([type]): [description]
+    """
+    cnt = benchmark.pedantic(run_sjt_loopless, args=(n,), rounds=1, iterations=1)
+    record_ns_per("swap", cnt)
+    assert cnt == factorial(n)
+
+
+@pytest.mark.parametrize("n", [10, 11, pytest.param(12, marks=pytest.mark.slow)])
+def test_plain_changes_large(benchmark, record_ns_per, n) -> None:
+    """Recursive PlainChanges, one round per n.
+
+    Arguments:
+        benchmark ([type]): [description]
+    """
+    cnt = benchmark.pedantic(run_plain_changes, args=(n,), rounds=1, iterations=1)
+    assert cnt == factorial(n)
+
+
+@pytest.mark.parametrize("n", [10, 11, pytest.param(12, marks=pytest.mark.slow)])
+def test_plain_changes_loopless_large(benchmark, record_ns_per, n) -> None:
+    """Loopless PlainChanges, one round per n.
+
+    Arguments:
+        benchmark ([type]): [description]
+    """
+    cnt = benchmark.pedantic(
+        run_plain_changes_loopless, args=(n,), rounds=1, iterations=1
+    )
+    assert cnt == factorial(n)
@@ -15,14 +15,57 @@ except PackageNotFoundError:  # pragma: no cover
 finally:
     del version, PackageNotFoundError
 
+# Binomial coefficients
+from ec_gen.binomial import BinomialTable, binomial
+
 # Combinations
-from ec_gen.combin import comb, emk, emk_comb_gen
+from ec_gen.combin import (
+    EmkSwapCache,
+    comb,
+    emk,
+    emk_batches,
+    emk_bits,
+    emk_comb_gen,
+    emk_comb_gen_iter,
+    emk_index,
+    emk_index_gen,
+    emk_prune,
+    emk_rank,
+    emk_swap_reader,
+    emk_unrank,
+    multiset_comb,
+    multiset_comb_count,
+    multiset_comb_gen,
+)
 
 # EHR permutations
-from ec_gen.ehr import ehr_gen
+from ec_gen.ehr import ehr_gen, ehr_gen_loopless
 
 # Gray codes
-from ec_gen.gray_code import brgc, brgc_gen
+from ec_gen.gray_code import (
+    brgc,
+    brgc_batches,
+    brgc_flips_array,
+    brgc_flips_chunks,
+    brgc_gen,
+    brgc_gen_loopless,
+    brgc_int,
+    brgc_rank,
+    brgc_subset_sums,
+    brgc_subset_sums_chunks,
+    brgc_unrank,
+    mrgc,
+    mrgc_gen,
+)
+
+# Permutation costs
+from ec_gen.perm_eval import qap_best, qap_cost_chunks, tour_best, tour_cost_chunks
+
+# Matrix permanent
+from ec_gen.permanent import permanent
+
+# SAT evaluation
+from ec_gen.sat_eval import cnf_to_csr, sat_count, sat_gen
 
 # Set bipartitions
 from ec_gen.set_bipart import set_bipart, stirling2nd2
@@ -31,23 +74,93 @@ from ec_gen.set_bipart import set_bipart, stirling2nd2
 from ec_gen.set_partition import set_partition, stirling2nd
 
 # Permutations
-from ec_gen.sjt import PlainChanges, sjt_gen
+from ec_gen.sjt import (
+    PlainChanges,
+    sjt_gen,
+    sjt_gen_loopless,
+    sjt_rank,
+    sjt_swaps_array,
+    sjt_swaps_chunks,
+    sjt_unrank,
+)
 
 # Permutations (list form)
-from ec_gen.sjt_list import sjt2
+from ec_gen.sjt_list import sjt2, sjt2_batches, sjt2_buffer
+
+# Subset objectives
+from ec_gen.subset_eval import (
+    ksubset_best,
+    ksubset_objective_chunks,
+    ksubset_threshold,
+    subset_best,
+    subset_objective_chunks,
+    subset_threshold,
+)
 
 __all__ = [
+    # Binomial coefficients
+    "BinomialTable",
+    "binomial",
     # Combinations
     "comb",
     "emk",
     "emk_comb_gen",
+    "emk_comb_gen_iter",
+    "EmkSwapCache",
+    "emk_rank",
+    "emk_unrank",
+    "emk_bits",
+    "emk_batches",
+    "emk_index",
+    "emk_index_gen",
+    "emk_prune",
+    "emk_swap_reader",
+    "multiset_comb",
+    "multiset_comb_gen",
+    "multiset_comb_count",
     # Gray codes
     "brgc",
     "brgc_gen",
+    "brgc_gen_loopless",
+    "brgc_int",
+    "brgc_batches",
+    "brgc_rank",
+    "brgc_unrank",
+    "brgc_flips_array",
+    "brgc_flips_chunks",
+    "brgc_subset_sums",
+    "brgc_subset_sums_chunks",
+    "mrgc",
+    "mrgc_gen",
+    # Matrix permanent
+    "permanent",
+    # Permutation costs
+    "tour_cost_chunks",
+    "tour_best",
+    "qap_cost_chunks",
+    "qap_best",
+    # SAT evaluation
+    "cnf_to_csr",
+    "sat_gen",
+    "sat_count",
+    # Subset objectives
+    "subset_objective_chunks",
+    "subset_best",
+    "subset_threshold",
+    "ksubset_objective_chunks",
+    "ksubset_best",
+    "ksubset_threshold",
     # Permutations
     "PlainChanges",
     "sjt_gen",
+    "sjt_gen_loopless",
+    "sjt_rank",
+    "sjt_unrank",
+    "sjt_swaps_array",
+    "sjt_swaps_chunks",
     "sjt2",
+    "sjt2_buffer",
+    "sjt2_batches",
     # Set partitions
     "set_partition",
     "stirling2nd",
@@ -56,4 +169,5 @@ __all__ = [
     "stirling2nd2",
     # EHR permutations
     "ehr_gen",
+    "ehr_gen_loopless",
 ]
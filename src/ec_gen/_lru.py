@@ -0,0 +1,107 @@
+"""
+Budgeted LRU Caches
+
+Both BinomialTable in binomial and EmkSwapCache in combin keep sized
+values (Pascal rows, swap tables) under a total budget, evict the least
+recently used values first, and report hit/miss statistics in the spirit
+of functools.lru_cache. BudgetLRU holds that bookkeeping once; the caches
+only decide what a value is and how its size is measured.
+"""
+
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+class BudgetLRU:
+    """LRU mapping whose values have a size, capped by a total budget
+
+    Examples:
+        >>> lru = BudgetLRU(budget=5, size=len)
+        >>> lru.put("a", [1, 2]), lru.put("b", [1, 2, 3]), lru.get("a")
+        (True, True, [1, 2])
+        >>> lru.put("c", [1]), lru.get("b"), len(lru), lru.used
+        (True, None, 2, 3)
+        >>> lru.hits, lru.misses, lru.evictions
+        (1, 1, 1)
+    """
+
+    def __init__(self, budget: int, size: Callable[[Any], int]) -> None:
+        """
+        :param budget: The maximum total size of the stored values
+        :type budget: int
+        :param size: The function that measures a value
+        :type size: Callable[[Any], int]
+        """
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._size = size
+        self._budget = budget
+        self.used = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def budget(self) -> int:
+        """The maximum total size of the stored values."""
+        return self._budget
+
+    @budget.setter
+    def budget(self, value: int) -> None:
+        self._budget = value
+        self._evict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def peek(self, key: Hashable) -> Optional[Any]:
+        """Return the value of `key`, or None, without counting a hit or
+        a miss and without refreshing it."""
+        return self._data.get(key)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the value of `key` and mark it as most recently used, or
+        None. Either way the lookup counts as a hit or a miss."""
+        value = self._data.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._data.move_to_end(key)
+        return value
+
+    def record_miss(self) -> None:
+        """Count a miss that was served without a lookup."""
+        self.misses += 1
+
+    def put(self, key: Hashable, value: Any) -> bool:
+        """Store `value` under a new `key`, evicting the least recently
+        used values to stay within the budget. A value larger than the
+        whole budget is not stored. Return whether it was stored."""
+        nbytes = self._size(value)
+        if nbytes > self._budget:
+            return False
+        self._data[key] = value
+        self.used += nbytes
+        self._evict()
+        return True
+
+    def clear(self) -> None:
+        """Drop all values and reset the statistics."""
+        self._data.clear()
+        self.used = 0
+        self.hits = self.misses = self.evictions = 0
+
+    def _evict(self) -> None:
+        while self.used > self._budget:
+            _, value = self._data.popitem(last=False)
+            self.used -= self._size(value)
+            self.evictions += 1
+
+
+if __name__ == "__main__":
+    import doctest
+
+    doctest.testmod()
@@ -0,0 +1,34 @@
+"""
+Range Arguments
+
+Most generators in this package can be entered in the middle of their
+sequence through `start` and `stop` arguments, with the same meaning as in
+slicing: `start` is the first position produced and `stop` the position to
+stop before. This code validates such a pair in one place, so that every
+generator accepts and rejects the same ranges.
+"""
+
+from typing import Optional
+
+
+def check_range(start: int, stop: Optional[int], total: int) -> tuple[int, int]:
+    """Validate a `start`/`stop` range and clamp `stop` to `total`.
+
+    :param start: The first position, must be non-negative
+    :type start: int
+    :param stop: The position to stop before, or None for `total`
+    :type stop: Optional[int]
+    :param total: The length of the sequence
+    :type total: int
+    :return: The pair `(start, stop)`, with `start <= stop <= total` unless
+              `start` is already past the end.
+
+    Examples:
+        >>> check_range(2, None, 5), check_range(2, 9, 5), check_range(4, 1, 5)
+        ((2, 5), (2, 5), (4, 4))
+    """
+    if start < 0:
+        raise ValueError("start must be non-negative")
+    if stop is None or stop > total:
+        stop = total
+    return start, max(start, stop)
@@ -0,0 +1,178 @@
+"""
+Binomial Coefficients
+
+This code provides the binomial coefficients C(n, k), i.e. the number of
+ways to choose k items out of n, for the rest of the package: the 'comb'
+function in combin, the rank/unrank code and the benchmarks all count
+combinations through it.
+
+Single coefficients are computed with math.comb, which uses a
+multiplicative formula in C. Nothing is cached and nothing recurses, so a
+query for large n neither grows memory nor hits the recursion limit.
+
+For bulk queries a 'BinomialTable' keeps whole Pascal rows. A row is built
+multiplicatively, C(n, k + 1) = C(n, k) * (n - k) / (k + 1), without
+needing the rows above it. The rows are kept in least-recently-used order,
+and the total number of stored coefficients is capped: when a new row would
+exceed the cap, the oldest rows are evicted first. The cache can also be
+inspected with cache_info and emptied with cache_clear.
+
+The table also answers a NumPy vector of (n, k) pairs at once. As long as
+every n is at most 66, so that all coefficients fit in int64, it looks the
+pairs up in a small precomputed Pascal triangle with one fancy-indexing
+operation. Otherwise it falls back to Python integers in an object array.
+
+Unlike the 'comb' convention in combin, the table follows the usual
+definition: C(n, k) is 0 when k < 0 or k > n.
+"""
+
+from math import comb as math_comb
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from ec_gen._lru import BudgetLRU
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# largest n for which every C(n, k) fits in int64
+_INT64_MAX_N = 66
+
+
+class BinomialCacheInfo(NamedTuple):
+    """Statistics of a `BinomialTable`, in the spirit of `functools.lru_cache`."""
+
+    hits: int
+    misses: int
+    evictions: int
+    rows: int
+    items: int
+    max_items: int
+
+
+class BinomialTable:
+    """Bounded cache of Pascal rows for bulk binomial queries
+
+    Examples:
+        >>> table = BinomialTable(max_items=100)
+        >>> table.row(5)
+        [1, 5, 10, 10, 5, 1]
+        >>> table(5, 2), table(5, 6), table(5, -1)
+        (10, 0, 0)
+        >>> table.many([5, 10, 66], [2, 3, 33]).tolist()
+        [10, 120, 7219428434016265740]
+        >>> table.cache_info()
+        BinomialCacheInfo(hits=0, misses=1, evictions=0, rows=1, items=6, max_items=100)
+    """
+
+    def __init__(self, max_items: int = 1 << 16) -> None:
+        """
+        :param max_items: The maximum number of coefficients kept in the
+                  cached rows, defaults to 65536
+        :type max_items: int
+        """
+        self._rows = BudgetLRU(max_items, len)
+        self._triangle: Any = None
+
+    @property
+    def max_items(self) -> int:
+        """The maximum number of coefficients kept in the cached rows."""
+        return self._rows.budget
+
+    @max_items.setter
+    def max_items(self, value: int) -> None:
+        self._rows.budget = value
+
+    def __call__(self, n: int, k: int) -> int:
+        """
+        Return C(n, k), from a cached row if there is one.
+
+        :param n: The total number of items
+        :type n: int
+        :param k: The number of items to choose
+        :type k: int
+        :return: The binomial coefficient, 0 if `k < 0` or `k > n`.
+        """
+        row = self._rows.peek(n)
+        if row is not None:
+            return row[k] if 0 <= k <= n else 0
+        return math_comb(n, k) if 0 <= k <= n else 0
+
+    def row(self, n: int) -> list[int]:
+        """
+        Return the Pascal row `[C(n, 0), ..., C(n, n)]`.
+
+        The row is built on a miss and cached, unless it alone exceeds
+        `max_items`. Do not modify the returned list.
+
+        :param n: The row index (non-negative)
+        :type n: int
+        :return: The list of binomial coefficients of row `n`.
+        """
+        if n < 0:
+            raise ValueError("n must be non-negative")
+        row = self._rows.get(n)
+        if row is not None:
+            return row
+        row = [1] * (n + 1)
+        for k in range(n // 2):
+            row[k + 1] = row[n - k - 1] = row[k] * (n - k) // (k + 1)
+        self._rows.put(n, row)
+        return row
+
+    def many(self, ns: Any, ks: Any) -> "np.ndarray":
+        """
+        Return C(n, k) for arrays of `n` and `k` values (broadcast together).
+
+        :param ns: The values of `n` (non-negative)
+        :param ks: The values of `k`
+        :return: A NumPy `int64` array if every `n` is at most 66, an object
+                  array of Python integers otherwise.
+        """
+        import numpy as np
+
+        ns, ks = np.broadcast_arrays(np.asarray(ns), np.asarray(ks))
+        if ns.size and ns.min() < 0:
+            raise ValueError("n must be non-negative")
+        valid = (ks >= 0) & (ks <= ns)
+        if ns.size == 0 or ns.max() <= _INT64_MAX_N:
+            triangle = self._int64_triangle()
+            return np.where(valid, triangle[ns, np.where(valid, ks, 0)], 0)
+        result = np.zeros(ns.shape, dtype=object)
+        for idx in zip(*np.nonzero(valid)):
+            result[idx] = math_comb(int(ns[idx]), int(ks[idx]))
+        return result
+
+    def cache_info(self) -> BinomialCacheInfo:
+        """Report the hit/miss statistics and the size of the row cache."""
+        rows = self._rows
+        return BinomialCacheInfo(
+            rows.hits, rows.misses, rows.evictions, len(rows), rows.used, rows.budget
+        )
+
+    def cache_clear(self) -> None:
+        """Drop all cached rows and reset the statistics."""
+        self._rows.clear()
+
+    def _int64_triangle(self) -> "np.ndarray":
+        """Return the Pascal triangle up to row 66 as an int64 matrix."""
+        import numpy as np
+
+        if self._triangle is None:
+            triangle = np.zeros((_INT64_MAX_N + 1, _INT64_MAX_N + 1), dtype=np.int64)
+            triangle[:, 0] = 1
+            for n in range(1, _INT64_MAX_N + 1):
+                triangle[n, 1 : n + 1] = (
+                    triangle[n - 1, :n] + triangle[n - 1, 1 : n + 1]
+                )
+            self._triangle = triangle
+        return self._triangle
+
+
+binomial = BinomialTable()
+"""The shared `BinomialTable` of the package."""
+
+
+if __name__ == "__main__":
+    import doctest
+
+    doctest.testmod()
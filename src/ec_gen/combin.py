@@ -13,7 +13,8 @@ Output varies depending on which function is used. Some functions return the tot
 number of possible combinations, while others generate the actual combinations.
 
 The code achieves its purpose through several different algorithms:
-- 'comb' uses recursion and memoization to calculate combinations
+- 'comb' calculates the number of combinations with the shared
+  'BinomialTable' of the binomial module
 - 'emk_comb_gen' uses the "homogeneous revolving-door" algorithm to generate
   all possible combinations by swapping pairs of elements
 
@@ -21,24 +22,96 @@ An important logic flow is how it handles different cases. When generating
 combinations, it treats even and odd numbers of elements differently, using
 separate functions for each case. This helps the algorithm work efficiently.
 
+Every swap produced by the recursive functions has to travel up a chain of
+suspended generators whose depth grows with n and k. 'emk_comb_gen_iter'
+produces the identical sequence without nested generators: the pending
+calls are kept on an explicit stack, and expanding a call pushes its body
+in reverse order. Chains of calls with the same k run as loops, so the
+stack holds O(k) entries however large n is. Both 'emk_comb_gen' and 'emk'
+accept iterative=True to switch to it.
+
+When the same (n, k) is requested over and over, even the iterative engine
+is wasted work. An 'EmkSwapCache' stores each swap sequence once as a
+compact array and replays it on later calls. Its memory budget is bounded,
+the least recently used tables are evicted first, and it keeps hit/miss
+statistics. Pass it as cache= to 'emk_comb_gen' or 'emk' to use it.
+
+The order can also be entered in the middle, so that a sweep can be split
+across workers. 'emk_rank' and 'emk_unrank' convert between k-subsets and
+their positions, and 'emk_comb_gen' and 'emk' accept start and stop. Both
+walk down the recursion once, skipping every call that lies entirely
+before the target using its number of swaps, comb(n, k) - 1, and the fixed
+states in which it begins and ends.
+
 The 'emk' function brings everything together. It generates all combinations by
 starting with 'k' ones followed by 'n-k' zeros, then repeatedly swapping
 elements based on pairs from 'emk_comb_gen'. This allows producing all
 possible combinations without storing them all in memory at once.
 
+For set operations, 'emk_bits' yields each combination as an integer
+bitmask instead of a list, together with the XOR delta of the two swapped
+bits, so popcount- and mask-based consumers never touch a list.
+
+For sparse problems, 'emk_index_gen' follows the same order but keeps the
+combination as k sorted element indices, and reports each step as the
+element that left, the element that entered and its slot in the sorted
+list. Because the revolving door is homogeneous, the new element always
+takes the slot of the old one. 'emk_index' yields the sorted lists.
+
+For branch-and-bound searches, 'emk_prune' yields the combinations like
+'emk' but accepts a position m through send(). It then skips ahead to the
+first combination that differs from the current one at position m or
+above. Every recursive call keeps the positions at or above its n fixed,
+so the skipped calls cost O(1) each using their fixed exit states, and the
+list is restored to the state where the skipped stretch ends.
+
+For vectorized scoring, 'emk_batches' yields the combinations as rows of
+2D NumPy uint8 arrays (optionally bit-packed). Since every swap exchanges a
+zero and a one, a batch is the previous row XOR the cumulative XOR of the
+swapped positions, computed in one go per batch. NumPy is only needed for
+'emk_batches'.
+
+For items with duplicates, 'multiset_comb_gen' generates the combinations
+of a multiset, given by the multiplicities of its distinct values, as
+vectors of counts. Each step moves one element from one value to another,
+reported as the pair (down, up). The order is the emk order of the "stars
+and bars" strings of the counts, restricted to counts within the
+multiplicities, which remains a minimal-change order. It is generated
+directly on an explicit stack, so no duplicate or excluded combination is
+ever visited. 'multiset_comb' yields the count vectors and
+'multiset_comb_count' counts them.
+
 Overall, this provides a comprehensive toolkit for working with combinations, from
 simple counting to generating all possibilities. It's designed to be efficient
 and flexible.
 """
 
-from functools import lru_cache
-from typing import Generator
+from array import array
+from bisect import bisect_left
+from itertools import chain, islice
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Generator,
+    Iterable,
+    NamedTuple,
+    Optional,
+    Sequence,
+)
+
+from ec_gen._lru import BudgetLRU
+from ec_gen._ranges import check_range
+from ec_gen.binomial import binomial
+
+if TYPE_CHECKING:
+    import numpy as np
 
 
 def comb(n: int, k: int) -> int:
     """
     The `comb` function calculates the number of combinations of `k` elements from a set of `n` elements
-    using recursion and memoization.
+    using the shared binomial table.
 
     :param n: The parameter `n` represents the total number of items or elements
               available for selection in the combination
@@ -61,33 +134,17 @@ def comb(n: int, k: int) -> int:
         True
 
     """
-    return 1 if k >= n or k <= 0 else comb_recur(n, k)
-
-
-@lru_cache
-def comb_recur(n: int, k: int) -> int:
-    """
-    The function `comb_recur` calculates the number of combinations of `k` elements
-    from a set of `n` elements using recursion and memoization.
+    return 1 if k >= n or k <= 0 else binomial(n, k)
 
-    :param n: The parameter `n` represents the total number of items to choose
-              from
-    :type n: int
-    :param k: The parameter `k` represents the number of elements to be chosen
-              from a set of `n` elements. It is used in the calculation of
-              the binomial coefficient, which is the number of ways to choose
-              `k` elements from a set of `n` elements
-    :type k: int
-    :return: The function `comb_recur` returns the sum of two values,
-              `val_a` and `val_b`.
-    """
-    n -= 1
-    val_a = 1 if k == 1 else comb_recur(n, k - 1)
-    val_b = 1 if k == n else comb_recur(n, k)
-    return val_a + val_b
 
-
-def emk_comb_gen(n: int, k: int) -> Generator[tuple[int, int], None, None]:
+def emk_comb_gen(
+    n: int,
+    k: int,
+    iterative: bool = False,
+    cache: Optional["EmkSwapCache"] = None,
+    start: int = 0,
+    stop: Optional[int] = None,
+) -> Generator[tuple[int, int], None, None]:
     """Generate all combinations by homogeneous revoling-door
 
     The `emk_comb_gen` function generates combinations (by swapping pairs of
@@ -100,6 +157,19 @@ def emk_comb_gen(n: int, k: int) -> Generator[tuple[int, int], None, None]:
     :param k: The parameter `k` represents the number of elements to be
               selected in each combination
     :type k: int
+    :param iterative: If true, the swaps are produced by `emk_comb_gen_iter`
+              instead of the recursive generators, defaults to False
+    :type iterative: bool
+    :param cache: If given, the swaps are read from (and stored in) this
+              `EmkSwapCache`, defaults to None
+    :type cache: Optional[EmkSwapCache]
+    :param start: The position in the swap sequence to start from. Any
+              range other than the full one is served by
+              `emk_comb_gen_iter` (or the cache), defaults to 0
+    :type start: int
+    :param stop: The position in the swap sequence to stop before,
+              defaults to None (the end of the sequence)
+    :type stop: Optional[int]
     :return: The function `emk_gen` returns a generator object that yields
               pairs of integers `(x, y)`.
 
@@ -127,6 +197,12 @@ def emk_comb_gen(n: int, k: int) -> Generator[tuple[int, int], None, None]:
         swap 1 and 2
         swap 2 and 3
     """
+    if cache is not None:
+        yield from cache.gen(n, k, start, stop)
+        return
+    if iterative or start != 0 or stop is not None:
+        yield from emk_comb_gen_iter(n, k, start, stop)
+        return
     if k >= n or k <= 0:
         return
     if k == 1:
@@ -261,7 +337,506 @@ def emk_neg_odd(n: int, k: int) -> Generator[tuple[int, int], None, None]:
         yield from emk_neg_odd(n - 1, k)
 
 
-def emk(n: int, k: int, zero: int = 0, one: int = 1) -> Generator[list, None, None]:
+# Operations on the explicit stack of `emk_comb_gen_iter`
+_SWAP, _UP, _DOWN, _GEN_EVEN, _GEN_ODD, _NEG_EVEN, _NEG_ODD = range(7)
+
+# ... and of `multiset_comb_gen`, which shares `_SWAP`
+_MS_GEN, _MS_NEG = 7, 8
+
+# `emk_gen_*(a, b)` first calls itself on `(a - 1, b)`. Such a chain is run
+# bottom-up as a loop: `(_*_TAIL, i, b)` is the rest of the body of
+# `emk_gen_*(i, b)`, for i = i, ..., a, and `(_CHAIN, a, b)` below it marks
+# the top of the chain.
+_EVEN_TAIL, _ODD_TAIL, _CHAIN = 9, 10, 11
+
+
+def emk_comb_gen_iter(
+    n: int, k: int, start: int = 0, stop: Optional[int] = None
+) -> Generator[tuple[int, int], None, None]:
+    """Generate all combinations by homogeneous revolving-door, iteratively
+
+    The `emk_comb_gen_iter` function yields exactly the same swap pairs as
+    `emk_comb_gen`, but without nested generators. The calls of the
+    recursive functions (`emk_gen_even`, `emk_gen_odd`, `emk_neg_even` and
+    `emk_neg_odd`) are kept on an explicit stack of `(op, n, k)` entries.
+    Expanding a call pushes its body in reverse order, so each swap is
+    produced in amortized O(1) time, however deep the recursion would be.
+
+    The only calls that recurse with the same `k` are the leading calls of
+    `emk_gen_even` and `emk_gen_odd` and the trailing (tail) calls of
+    `emk_neg_even` and `emk_neg_odd`. A chain of leading calls is run as a
+    loop over `n` with a single counter entry, and a tail call leaves
+    nothing behind, so the stack holds O(k) entries whatever `n` is.
+
+    The stream can start at any position: whole calls before `start` are
+    skipped using their known number of swaps, so the setup costs only
+    O(n) stack operations, and the stack stays within O(k) entries.
+
+    :param n: The parameter `n` represents the total number of elements in the
+              set, and `k` represents the number of elements to be selected
+              in each combination
+    :type n: int
+    :param k: The parameter `k` represents the number of elements to be
+              selected in each combination
+    :type k: int
+    :param start: The position in the swap sequence to start from,
+              defaults to 0
+    :type start: int
+    :param stop: The position in the swap sequence to stop before,
+              defaults to None (the end of the sequence, comb(n, k) - 1)
+    :type stop: Optional[int]
+    :return: The function `emk_comb_gen_iter` returns a generator object that
+              yields pairs of integers `(x, y)`.
+
+    Examples:
+        >>> list(emk_comb_gen_iter(4, 2))
+        [(1, 2), (0, 1), (2, 3), (1, 0), (0, 2)]
+        >>> list(emk_comb_gen_iter(16, 5)) == list(emk_comb_gen(16, 5))
+        True
+        >>> list(emk_comb_gen_iter(4, 2, start=2, stop=4))
+        [(2, 3), (1, 0)]
+    """
+    if k >= n or k <= 0:
+        return
+    if stop is not None:
+        yield from islice(emk_comb_gen_iter(n, k, start), max(0, stop - start))
+        return
+    stack, _ = _emk_seek(n, k, start)
+    push = stack.append
+    pop = stack.pop
+    while stack:
+        op, a, b = pop()
+        if op == _SWAP:
+            yield (a, b)
+        elif op == _GEN_EVEN:  # body of emk_gen_even(b + 1, b), reversed
+            if b < a - 1:
+                push((_CHAIN, a, b))
+                push((_EVEN_TAIL, b + 2, b))
+            if b != 2:
+                push((_GEN_EVEN, b - 1, b - 2))
+            push((_SWAP, b - 2, b - 1))
+            yield (b - 1, b)
+        elif op == _GEN_ODD:  # body of emk_gen_odd(b + 1, b), reversed
+            if b < a - 1:
+                push((_CHAIN, a, b))
+                push((_ODD_TAIL, b + 2, b))
+            push((_UP, b - 2, 0) if b == 3 else (_GEN_ODD, b - 1, b - 2))
+            push((_SWAP, b - 2, b - 1))
+            yield (b - 1, b)
+        elif op == _EVEN_TAIL:  # rest of the body of emk_gen_even(a, b)
+            if a == stack[-1][1]:
+                pop()  # the top of the chain
+            else:
+                push((_EVEN_TAIL, a + 1, b))
+            if b != 2:
+                push((_GEN_EVEN, a - 2, b - 2))
+            push((_SWAP, b - 2, a - 2))
+            push((_DOWN, a - 3, 0) if b == 2 else (_NEG_ODD, a - 2, b - 1))
+            yield (a - 2, a - 1)
+        elif op == _ODD_TAIL:  # rest of the body of emk_gen_odd(a, b)
+            if a == stack[-1][1]:
+                pop()  # the top of the chain
+            else:
+                push((_ODD_TAIL, a + 1, b))
+            push((_UP, a - 3, 0) if b == 3 else (_GEN_ODD, a - 2, b - 2))
+            push((_SWAP, b - 2, a - 2))
+            push((_NEG_EVEN, a - 2, b - 1))
+            yield (a - 2, a - 1)
+        elif op == _NEG_EVEN:  # body of emk_neg_even, reversed
+            if b < a - 1:
+                push((_NEG_EVEN, a - 1, b))
+                push((_SWAP, a - 1, a - 2))
+                push((_UP, a - 3, 0) if b == 2 else (_GEN_ODD, a - 2, b - 1))
+            else:
+                push((_SWAP, a - 1, a - 2))
+            push((_SWAP, a - 2, b - 2))
+            if b != 2:
+                push((_NEG_EVEN, a - 2, b - 2))
+        elif op == _NEG_ODD:  # body of emk_neg_odd, reversed
+            if b >= a - 1:
+                push((_SWAP, a - 1, a - 2))
+            else:
+                push((_NEG_ODD, a - 1, b))
+                push((_SWAP, a - 1, a - 2))
+                push((_GEN_EVEN, a - 2, b - 1))
+            push((_SWAP, a - 2, b - 2))
+            push((_DOWN, a - 3, 0) if b == 3 else (_NEG_ODD, a - 2, b - 2))
+        elif op == _UP:  # (i, i + 1) for i in range(b, n)
+            for i in range(b, a):
+                yield (i, i + 1)
+        else:  # (i, i - 1) for i in range(n - b, 0, -1)
+            for i in range(a - b, 0, -1):
+                yield (i, i - 1)
+
+
+def _emk_body(op: int, a: int, b: int) -> list[tuple[int, int, int]]:
+    """Return the body of a recursive call, in forward order.
+
+    This is the same expansion as in `emk_comb_gen_iter`, which inlines it
+    (pushed in reverse order) for speed. A chain of leading calls
+    `emk_gen_*(a - 1, b)` becomes the bottom call `emk_gen_*(b + 1, b)`
+    followed by a tail counter and the `_CHAIN` marker of its top. A tail
+    entry `(_*_TAIL, a, b)` stands for the rest of the body of
+    `emk_gen_*(a, b)` after its leading call.
+    """
+    if (op == _GEN_EVEN or op == _GEN_ODD) and b < a - 1:
+        tail = _EVEN_TAIL if op == _GEN_EVEN else _ODD_TAIL
+        return [(op, b + 1, b), (tail, b + 2, b), (_CHAIN, a, b)]
+    if op == _GEN_EVEN or op == _EVEN_TAIL:
+        body = [
+            (_SWAP, a - 2, a - 1),
+            (_DOWN, a - 3, 0) if b == 2 else (_NEG_ODD, a - 2, b - 1),
+            (_SWAP, b - 2, a - 2),
+        ]
+        if op == _GEN_EVEN:  # a == b + 1: no room for the middle call
+            del body[1]
+        if b != 2:
+            body.append((_GEN_EVEN, a - 2, b - 2))
+    elif op == _GEN_ODD or op == _ODD_TAIL:
+        body = [
+            (_SWAP, a - 2, a - 1),
+            (_NEG_EVEN, a - 2, b - 1),
+            (_SWAP, b - 2, a - 2),
+            (_UP, a - 3, 0) if b == 3 else (_GEN_ODD, a - 2, b - 2),
+        ]
+        if op == _GEN_ODD:  # a == b + 1: no room for the middle call
+            del body[1]
+    elif op == _NEG_EVEN:
+        body = [] if b == 2 else [(_NEG_EVEN, a - 2, b - 2)]
+        body.append((_SWAP, a - 2, b - 2))
+        if b < a - 1:
+            body.append((_UP, a - 3, 0) if b == 2 else (_GEN_ODD, a - 2, b - 1))
+            body.append((_SWAP, a - 1, a - 2))
+            body.append((_NEG_EVEN, a - 1, b))
+        else:
+            body.append((_SWAP, a - 1, a - 2))
+    else:
+        body = [
+            (_DOWN, a - 3, 0) if b == 3 else (_NEG_ODD, a - 2, b - 2),
+            (_SWAP, a - 2, b - 2),
+        ]
+        if b >= a - 1:
+            body.append((_SWAP, a - 1, a - 2))
+        else:
+            body.append((_GEN_EVEN, a - 2, b - 1))
+            body.append((_SWAP, a - 1, a - 2))
+            body.append((_NEG_ODD, a - 1, b))
+    return body
+
+
+def _emk_root(n: int, k: int) -> tuple[int, int, int]:
+    """Return the stack entry that generates all swaps of `(n, k)`."""
+    if k == 1:
+        return (_UP, n - 1, 0)
+    return (_GEN_EVEN if k % 2 == 0 else _GEN_ODD, n, k)
+
+
+def _emk_skip(
+    op: int, a: int, b: int, state: int, top: int = 0
+) -> tuple[int, int]:
+    """Return the number of swaps of a stack entry and the combination
+    (as a bitmask) after all of them have been applied to `state`.
+
+    Every call is entered in a fixed state: `emk_gen_*(a, b)` goes from
+    `b` ones followed by `a - b` zeros to the reverse on positions below
+    `a`, and `emk_neg_*(a, b)` goes the other way. `_UP` moves the one at
+    position 0 up to position `a`, and `_DOWN` moves it back. A tail entry
+    covers the rest of its chain, up to `emk_gen_*(top, b)`: it ends where
+    that call ends, after comb(i - 1, b - 1) swaps for each level i.
+    """
+    if op == _SWAP:
+        return 1, state ^ (1 << a | 1 << b)
+    if op == _UP or op == _DOWN:
+        return a - b, state ^ (1 | 1 << a)
+    if op == _EVEN_TAIL or op == _ODD_TAIL:
+        _, after = _emk_skip(_GEN_EVEN, top, b, state)
+        return comb(top, b) - comb(a - 1, b), after
+    low = (1 << b) - 1
+    if op == _GEN_EVEN or op == _GEN_ODD:
+        low <<= a - b
+    return comb(a, b) - 1, state >> a << a | low
+
+
+def _emk_expand(stack: list[tuple[int, int, int]], op: int, a: int, b: int) -> None:
+    """Replace the popped entry `(op, a, b)` by its body on `stack`, with
+    `_UP` and `_DOWN` as single swaps."""
+    if op == _UP:
+        stack.extend((_SWAP, i, i + 1) for i in range(a - 1, b - 1, -1))
+        return
+    if op == _DOWN:
+        stack.extend((_SWAP, i, i - 1) for i in range(1, a - b + 1))
+        return
+    if op == _EVEN_TAIL or op == _ODD_TAIL:
+        if a == stack[-1][1]:
+            stack.pop()  # the top of the chain
+        else:
+            stack.append((op, a + 1, b))
+    stack.extend(reversed(_emk_body(op, a, b)))
+
+
+def _emk_seek(n: int, k: int, start: int) -> tuple[list[tuple[int, int, int]], int]:
+    """Return the stack of `emk_comb_gen_iter` after `start` swaps, and the
+    combination (as a bitmask) at that point.
+    """
+    if start < 0:
+        raise ValueError("start must be non-negative")
+    stack = [_emk_root(n, k)]
+    state = (1 << k) - 1
+    while start > 0 and stack:
+        op, a, b = stack.pop()
+        top = stack[-1][1] if op == _EVEN_TAIL or op == _ODD_TAIL else 0
+        count, after = _emk_skip(op, a, b, state, top)
+        if count <= start:
+            start -= count
+            state = after
+            if top:
+                stack.pop()  # the whole chain is skipped
+        elif op == _UP:
+            state ^= 1 | 1 << start
+            stack.append((_UP, a, start))
+            start = 0
+        elif op == _DOWN:
+            state ^= 1 << a | 1 << (a - start)
+            stack.append((_DOWN, a, start))
+            start = 0
+        else:
+            _emk_expand(stack, op, a, b)
+    return stack, state
+
+
+def emk_rank(n: int, subset: Iterable[int]) -> int:
+    """
+    The function `emk_rank` returns the position of a k-subset in the
+    order generated by `emk`.
+
+    The subset is given by the positions of the ones in the lists yielded
+    by `emk(n, k)`. Whole recursive calls that cannot contain the subset
+    are skipped using their number of swaps, so this takes O(n) steps.
+
+    :param n: The parameter `n` represents the total number of elements
+    :type n: int
+    :param subset: The positions (from 0 to n - 1) of the chosen elements
+    :type subset: Iterable[int]
+    :return: The position `r` such that `emk_unrank(n, k, r)` gives back
+              the subset.
+
+    Examples:
+        >>> [emk_rank(4, s) for s in ([0, 1], [0, 2], [1, 2], [1, 3], [0, 3], [2, 3])]
+        [0, 1, 2, 3, 4, 5]
+    """
+    target = 0
+    for i in subset:
+        if not 0 <= i < n:
+            raise ValueError(f"element {i} out of range")
+        target |= 1 << i
+    k = bin(target).count("1")
+    if k >= n or k <= 0:
+        return 0
+    stack = [_emk_root(n, k)]
+    state = (1 << k) - 1
+    rank = 0
+    while state != target:
+        op, a, b = stack.pop()
+        top = stack[-1][1] if op == _EVEN_TAIL or op == _ODD_TAIL else 0
+        count, after = _emk_skip(op, a, b, state, top)
+        if op == _SWAP or (target ^ state) >> (top or a if op > _DOWN else a + 1):
+            # the subset is not reached inside this entry
+            rank += count
+            state = after
+            if top:
+                stack.pop()  # the whole chain is skipped
+        elif op == _UP or op == _DOWN:
+            # a single one moves through positions 0..a, one step per swap
+            pos = (target & ((2 << a) - 1)).bit_length() - 1
+            return rank + (pos if op == _UP else a - pos)
+        else:
+            _emk_expand(stack, op, a, b)
+    return rank
+
+
+def emk_unrank(n: int, k: int, rank: int) -> list[int]:
+    """
+    The function `emk_unrank` returns the k-subset at a given position of
+    the order generated by `emk`.
+
+    :param n: The parameter `n` represents the total number of elements
+    :type n: int
+    :param k: The parameter `k` represents the number of elements in each
+              combination
+    :type k: int
+    :param rank: The position in the order, from 0 to comb(n, k) - 1
+    :type rank: int
+    :return: The sorted positions of the chosen elements.
+
+    Examples:
+        >>> [emk_unrank(4, 2, r) for r in range(6)]
+        [[0, 1], [0, 2], [1, 2], [1, 3], [0, 3], [2, 3]]
+    """
+    if not 0 <= rank < comb(n, k):
+        raise ValueError("rank out of range")
+    if k >= n or k <= 0:
+        return list(range(max(0, min(k, n))))
+    _, state = _emk_seek(n, k, rank)
+    return [i for i in range(n) if state >> i & 1]
+
+
+class EmkCacheInfo(NamedTuple):
+    """Statistics of an `EmkSwapCache`, in the spirit of `functools.lru_cache`."""
+
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    nbytes: int
+    max_bytes: int
+
+
+class EmkSwapCache:
+    """LRU cache of compact swap tables for `emk_comb_gen`
+
+    The swap sequence of each `(n, k)` is generated once by
+    `emk_comb_gen_iter` and stored flat, as `x0, y0, x1, y1, ...`, in an
+    `array('H')` (or `array('L')` if `n` does not fit in 16 bits). Further
+    requests for the same `(n, k)` simply iterate over the stored array.
+
+    The total size of the stored tables never exceeds `max_bytes`: the least
+    recently used tables are evicted first. The size of a table is known
+    before it is built, so a table larger than the whole budget is never
+    materialized by `gen`: its swaps are streamed from `emk_comb_gen_iter`
+    instead. Use `fits` to check this before asking `swaps` for the table.
+
+    Examples:
+        >>> cache = EmkSwapCache(max_bytes=1 << 16)
+        >>> list(emk_comb_gen(4, 2, cache=cache))
+        [(1, 2), (0, 1), (2, 3), (1, 0), (0, 2)]
+        >>> list(cache.gen(4, 2)) == list(emk_comb_gen(4, 2))
+        True
+        >>> cache.cache_info()
+        EmkCacheInfo(hits=1, misses=1, evictions=0, entries=1, nbytes=20, max_bytes=65536)
+    """
+
+    def __init__(self, max_bytes: int = 1 << 24) -> None:
+        """
+        :param max_bytes: The memory budget for the stored swap tables, in
+                  bytes, defaults to 16 MiB
+        :type max_bytes: int
+        """
+        self._tables = BudgetLRU(max_bytes, _array_nbytes)
+
+    @property
+    def max_bytes(self) -> int:
+        """The memory budget for the stored swap tables, in bytes."""
+        return self._tables.budget
+
+    @max_bytes.setter
+    def max_bytes(self, value: int) -> None:
+        self._tables.budget = value
+
+    def fits(self, n: int, k: int) -> bool:
+        """
+        The method `fits` tells whether the swap table of `(n, k)` can be
+        stored within `max_bytes`.
+
+        :param n: The total number of elements
+        :type n: int
+        :param k: The number of elements in each combination
+        :type k: int
+        :return: True if the table is not larger than the budget.
+        """
+        return self._table_nbytes(n, k) <= self._tables.budget
+
+    def swaps(self, n: int, k: int) -> array:
+        """
+        The method `swaps` returns the flat swap table of `emk_comb_gen(n, k)`,
+        generating it on a miss. A table larger than `max_bytes` is built for
+        the caller but not stored, see `fits`.
+
+        :param n: The total number of elements
+        :type n: int
+        :param k: The number of elements in each combination
+        :type k: int
+        :return: The swaps `x0, y0, x1, y1, ...` as an `array`.
+        """
+        table = self._tables.get((n, k))
+        if table is not None:
+            return table
+        table = array(self._typecode(n))
+        for pair in emk_comb_gen_iter(n, k):
+            table.extend(pair)
+        self._tables.put((n, k), table)
+        return table
+
+    def gen(
+        self, n: int, k: int, start: int = 0, stop: Optional[int] = None
+    ) -> Generator[tuple[int, int], None, None]:
+        """
+        The method `gen` yields the same swap pairs as `emk_comb_gen(n, k)`,
+        taken from the cached table.
+
+        :param n: The total number of elements
+        :type n: int
+        :param k: The number of elements in each combination
+        :type k: int
+        :param start: The position in the swap sequence to start from,
+                  defaults to 0
+        :type start: int
+        :param stop: The position in the swap sequence to stop before,
+                  defaults to None (the end of the sequence)
+        :type stop: Optional[int]
+        :return: A generator object that yields pairs of integers `(x, y)`.
+        """
+        start, stop = check_range(start, stop, comb(n, k) - 1)
+        if (n, k) not in self._tables and not self.fits(n, k):
+            self._tables.record_miss()  # too large to store, so stream it
+            yield from emk_comb_gen_iter(n, k, start, stop)
+            return
+        table = self.swaps(n, k)
+        if start != 0 or stop != len(table) // 2:
+            table = table[2 * start : 2 * stop]
+        it = iter(table)
+        yield from zip(it, it)
+
+    def cache_info(self) -> EmkCacheInfo:
+        """Report the hit/miss statistics and the memory use of the cache."""
+        tables = self._tables
+        return EmkCacheInfo(
+            tables.hits,
+            tables.misses,
+            tables.evictions,
+            len(tables),
+            tables.used,
+            tables.budget,
+        )
+
+    def cache_clear(self) -> None:
+        """Drop all stored tables and reset the statistics."""
+        self._tables.clear()
+
+    @staticmethod
+    def _typecode(n: int) -> str:
+        return "H" if n <= 1 << 16 else "L"
+
+    @classmethod
+    def _table_nbytes(cls, n: int, k: int) -> int:
+        count = comb(n, k) - 1 if 0 < k < n else 0
+        return 2 * array(cls._typecode(n)).itemsize * count
+
+
+def _array_nbytes(table: array) -> int:
+    """Return the size of the items of an `array`, in bytes."""
+    return table.itemsize * len(table)
+
+
+def emk(
+    n: int,
+    k: int,
+    zero: int = 0,
+    one: int = 1,
+    iterative: bool = False,
+    cache: Optional[EmkSwapCache] = None,
+    start: int = 0,
+    stop: Optional[int] = None,
+) -> Generator[list, None, None]:
     """
     The emk function generates combinations by swapping pairs of integers using
     the emk algorithm.
@@ -277,6 +852,18 @@ def emk(n: int, k: int, zero: int = 0, one: int = 1) -> Generator[list, None, No
                   set to 0, defaults to 0 (optional)
     :param One: The value that represents a "1" in the combinations
                   generated by the algorithm, defaults to 1 (optional)
+    :param iterative: If true, the swaps are produced by `emk_comb_gen_iter`
+                  instead of the recursive generators, defaults to False
+    :type iterative: bool
+    :param cache: If given, the swaps are read from (and stored in) this
+                  `EmkSwapCache`, defaults to None
+    :type cache: Optional[EmkSwapCache]
+    :param start: The position of the first combination to generate,
+                  defaults to 0
+    :type start: int
+    :param stop: The position of the combination to stop before, defaults
+                  to None (the end of the sequence, comb(n, k))
+    :type stop: Optional[int]
 
     Examples:
         >>> for s in emk(6, 3, zero="◾", one="◽"):
@@ -303,13 +890,616 @@ def emk(n: int, k: int, zero: int = 0, one: int = 1) -> Generator[list, None, No
         ◾◾◽◾◽◽
         ◾◾◾◽◽◽
     """
-    seq = [one] * k + [zero] * (n - k)
+    total = comb(n, k)
+    start, stop = check_range(start, stop, total)
+    if start == stop:
+        return
+    if start == 0:
+        seq = [one] * k + [zero] * (n - k)
+    else:
+        seq = [zero] * n
+        for i in emk_unrank(n, k, start):
+            seq[i] = one
     yield seq
-    for pos_x, pos_y in emk_comb_gen(n, k):
+    last = None if stop == total else stop - 1
+    for pos_x, pos_y in emk_comb_gen(n, k, iterative, cache, start, last):
         seq[pos_x], seq[pos_y] = seq[pos_y], seq[pos_x]
         yield seq
 
 
+def emk_bits(
+    n: int,
+    k: int,
+    iterative: bool = False,
+    cache: Optional[EmkSwapCache] = None,
+    start: int = 0,
+    stop: Optional[int] = None,
+) -> Generator[tuple[int, int], None, None]:
+    """
+    The function `emk_bits` generates the same combinations as `emk`, each
+    as an integer bitmask.
+
+    Bit `i` of the mask is set if position `i` of the list from `emk` holds
+    a one. Each mask is yielded together with the XOR delta from the
+    previous mask, i.e. the two swapped bits (0 for the first mask).
+
+    :param n: The parameter `n` represents the total number of elements
+    :type n: int
+    :param k: The parameter `k` represents the number of ones in each
+              combination
+    :type k: int
+    :param iterative: If true, the swaps are produced by `emk_comb_gen_iter`
+              instead of the recursive generators, defaults to False
+    :type iterative: bool
+    :param cache: If given, the swaps are read from (and stored in) this
+              `EmkSwapCache`, defaults to None
+    :type cache: Optional[EmkSwapCache]
+    :param start: The position of the first combination to generate,
+              defaults to 0
+    :type start: int
+    :param stop: The position of the combination to stop before, defaults
+              to None (the end of the sequence, comb(n, k))
+    :type stop: Optional[int]
+    :return: The function `emk_bits` returns a generator object that yields
+              pairs of integers `(mask, delta)`.
+
+    Examples:
+        >>> for mask, delta in emk_bits(4, 2):
+        ...     print(f"{mask:04b} {delta:04b}")
+        ...
+        0011 0000
+        0101 0110
+        0110 0011
+        1010 1100
+        1001 0011
+        1100 0101
+    """
+    total = comb(n, k)
+    start, stop = check_range(start, stop, total)
+    if start == stop:
+        return
+    mask = 0
+    for i in range(k) if start == 0 else emk_unrank(n, k, start):
+        mask |= 1 << i
+    yield mask, 0
+    last = None if stop == total else stop - 1
+    for pos_x, pos_y in emk_comb_gen(n, k, iterative, cache, start, last):
+        delta = 1 << pos_x | 1 << pos_y
+        mask ^= delta
+        yield mask, delta
+
+
+def emk_prune(
+    n: int, k: int, zero: Any = 0, one: Any = 1
+) -> Generator[list[Any], Optional[int], None]:
+    """
+    The function `emk_prune` generates the same combinations as `emk`, but
+    lets the consumer skip ahead: after receiving a combination, send the
+    integer `m` to declare that no combination agreeing with it on
+    positions `m, ..., n - 1` is wanted.
+
+    The generator then skips every following combination until one of
+    those positions changes. Since the calls of the recursion keep all
+    positions at or above their `n` fixed, whole calls are skipped in O(1)
+    each, using their fixed exit state, and only the calls that do touch
+    the positions are expanded. The list is restored to the state in which
+    the skipped stretch ends before the next swap is applied, so the next
+    combination yielded is exactly the one `emk` would produce after the
+    skipped stretch. Sending `None` (or calling `next`) does not prune.
+
+    The same list object is yielded every time and is updated in place.
+
+    :param n: The parameter `n` represents the total number of elements
+    :type n: int
+    :param k: The parameter `k` represents the number of ones in each
+              combination
+    :type k: int
+    :param zero: The value used for unselected positions, defaults to 0
+    :type zero: Any
+    :param one: The value used for selected positions, defaults to 1
+    :type one: Any
+    :return: The function `emk_prune` returns a generator object that yields
+              the combinations as lists, and accepts an optional position
+              `m` through `send`.
+
+    Examples:
+        >>> gen = emk_prune(5, 2)
+        >>> seq = next(gen)
+        >>> while True:
+        ...     print(seq)
+        ...     try:
+        ...         # nothing with the last element selected is of interest
+        ...         seq = gen.send(4 if seq[4] else None)
+        ...     except StopIteration:
+        ...         break
+        ...
+        [1, 1, 0, 0, 0]
+        [1, 0, 1, 0, 0]
+        [0, 1, 1, 0, 0]
+        [0, 1, 0, 1, 0]
+        [1, 0, 0, 1, 0]
+        [0, 0, 1, 1, 0]
+        [0, 0, 1, 0, 1]
+    """
+    seq = [one] * k + [zero] * (n - k)
+    if k >= n or k <= 0:
+        yield seq
+        return
+    stack = [_emk_root(n, k)]
+    state = (1 << k) - 1
+    fixed = yield seq
+    while stack:
+        if fixed is not None:
+            # skip the entries that leave the positions from `fixed` on alone
+            while stack:
+                op, a, b = stack[-1]
+                if op == _SWAP:
+                    if max(a, b) >= fixed:
+                        break
+                    state ^= 1 << a | 1 << b
+                    stack.pop()
+                elif op == _EVEN_TAIL or op == _ODD_TAIL:
+                    stack.pop()
+                    top = stack[-1][1]
+                    if top <= fixed:
+                        _, state = _emk_skip(op, a, b, state, top)
+                        stack.pop()  # the whole chain is skipped
+                    else:
+                        _emk_expand(stack, op, a, b)
+                elif (a + 1 if op == _UP or op == _DOWN else a) <= fixed:
+                    _, state = _emk_skip(op, a, b, state)
+                    stack.pop()
+                else:
+                    stack.pop()
+                    _emk_expand(stack, op, a, b)
+            for i in range(min(fixed, n)):
+                seq[i] = one if state >> i & 1 else zero
+            fixed = None
+            continue
+        op, a, b = stack.pop()
+        if op == _SWAP:
+            state ^= 1 << a | 1 << b
+            seq[a], seq[b] = seq[b], seq[a]
+            fixed = yield seq
+        else:
+            _emk_expand(stack, op, a, b)
+
+
+def emk_index_gen(
+    n: int, k: int, start: int = 0, stop: Optional[int] = None
+) -> Generator[tuple[int, int, int], None, None]:
+    """
+    The function `emk_index_gen` generates the steps of the `emk` order as
+    element identities instead of positional swaps.
+
+    The current combination is kept as a sorted list of its `k` elements.
+    Each step yields `(removed, added, slot)`: element `removed` leaves the
+    combination and element `added` enters it, at the same `slot` of the
+    sorted list. The slot does not change because the revolving door is
+    homogeneous: no element of the combination lies between the two
+    swapped positions. The swaps come from `emk_comb_gen_iter`, whose
+    stack holds O(k) entries, so only O(k) state is kept however large
+    `n` is.
+
+    :param n: The parameter `n` represents the total number of elements
+    :type n: int
+    :param k: The parameter `k` represents the number of elements in each
+              combination
+    :type k: int
+    :param start: The position in the step sequence to start from (step
+              `i` leads from combination `i` to combination `i + 1`),
+              defaults to 0
+    :type start: int
+    :param stop: The position in the step sequence to stop before,
+              defaults to None (the end of the sequence, comb(n, k) - 1)
+    :type stop: Optional[int]
+    :return: The function `emk_index_gen` returns a generator object that
+              yields triples of integers `(removed, added, slot)`.
+
+    Examples:
+        >>> for removed, added, slot in emk_index_gen(4, 2):
+        ...     print(f"slot {slot}: {removed} -> {added}")
+        ...
+        slot 1: 1 -> 2
+        slot 0: 0 -> 1
+        slot 1: 2 -> 3
+        slot 0: 1 -> 0
+        slot 0: 0 -> 2
+    """
+    if start >= comb(n, k) - 1:
+        return  # no swaps left, as in `emk_comb_gen`
+    chosen = emk_unrank(n, k, start) if 0 < k < n else []
+    for pos_x, pos_y in emk_comb_gen_iter(n, k, start, stop):
+        slot = bisect_left(chosen, pos_x)
+        if slot < len(chosen) and chosen[slot] == pos_x:
+            removed, added = pos_x, pos_y
+        else:
+            removed, added = pos_y, pos_x
+            slot = bisect_left(chosen, pos_y)
+        chosen[slot] = added
+        yield removed, added, slot
+
+
+def emk_index(
+    n: int, k: int, start: int = 0, stop: Optional[int] = None
+) -> Generator[list[int], None, None]:
+    """
+    The function `emk_index` generates the same combinations as `emk`, each
+    as the sorted list of its `k` elements.
+
+    :param n: The parameter `n` represents the total number of elements
+    :type n: int
+    :param k: The parameter `k` represents the number of elements in each
+              combination
+    :type k: int
+    :param start: The position of the first combination to generate,
+              defaults to 0
+    :type start: int
+    :param stop: The position of the combination to stop before, defaults
+              to None (the end of the sequence, comb(n, k))
+    :type stop: Optional[int]
+
+    Examples:
+        >>> for chosen in emk_index(4, 2):
+        ...     print(chosen)
+        ...
+        [0, 1]
+        [0, 2]
+        [1, 2]
+        [1, 3]
+        [0, 3]
+        [2, 3]
+    """
+    total = comb(n, k)
+    start, stop = check_range(start, stop, total)
+    if start == stop:
+        return
+    chosen = emk_unrank(n, k, start)
+    yield chosen
+    for _, added, slot in emk_index_gen(n, k, start, stop - 1):
+        chosen[slot] = added
+        yield chosen
+
+
+def emk_swap_reader(
+    n: int, k: int, cache: Optional[EmkSwapCache] = None
+) -> Callable[[int], "np.ndarray"]:
+    """
+    The function `emk_swap_reader` returns a function that reads the swaps
+    of `emk_comb_gen(n, k)` in order, a given number at a time, as flat
+    NumPy `intp` arrays `[x0, y0, x1, y1, ...]`.
+
+    The swaps are sliced from the table of `cache` if it fits there, or
+    else drawn from a stream (`cache.gen`, or `emk_comb_gen_iter` if there
+    is no cache), so the vectorized consumers of the swaps all pick their
+    source the same way.
+
+    :param n: The parameter `n` represents the total number of elements
+    :type n: int
+    :param k: The parameter `k` represents the number of elements in each
+              combination
+    :type k: int
+    :param cache: If given, the swaps are read from (and stored in) this
+              `EmkSwapCache`, defaults to None
+    :type cache: Optional[EmkSwapCache]
+    :return: A function that takes a number of swaps `count` and returns
+              the next `count` swaps as an array of length `2 * count`.
+
+    Examples:
+        >>> read = emk_swap_reader(4, 2)
+        >>> read(2).tolist(), read(3).tolist()
+        ([1, 2, 0, 1], [2, 3, 1, 0, 0, 2])
+    """
+    import numpy as np
+
+    if cache is not None and cache.fits(n, k):
+        flat = np.asarray(cache.swaps(n, k))
+        done = 0  # number of swaps read so far
+
+        def read_table(count: int) -> "np.ndarray":
+            nonlocal done
+            pairs = flat[2 * done : 2 * (done + count)]
+            done += count
+            return pairs.astype(np.intp)
+
+        return read_table
+    swaps = chain.from_iterable(
+        emk_comb_gen_iter(n, k) if cache is None else cache.gen(n, k)
+    )
+
+    def read_stream(count: int) -> "np.ndarray":
+        return np.fromiter(swaps, dtype=np.intp, count=2 * count)
+
+    return read_stream
+
+
+def emk_batches(
+    n: int,
+    k: int,
+    batch_size: int = 4096,
+    out: Any = None,
+    packed: bool = False,
+    cache: Optional[EmkSwapCache] = None,
+) -> Generator["np.ndarray", None, None]:
+    """
+    The function `emk_batches` generates the combinations of `emk` as rows
+    of 2D NumPy `uint8` arrays, `batch_size` consecutive combinations at a
+    time.
+
+    Every swap of the revolving door exchanges a zero and a one, so it
+    toggles both positions. The swaps of a batch are scattered into a
+    toggle matrix, and the rows are the last row of the previous batch
+    XOR the cumulative XOR of the toggles, all in vectorized form.
+
+    :param n: The parameter `n` represents the total number of elements
+    :type n: int
+    :param k: The parameter `k` represents the number of ones in each
+              combination
+    :type k: int
+    :param batch_size: The maximum number of combinations per batch,
+              defaults to 4096
+    :type batch_size: int
+    :param out: An optional `uint8` buffer of shape `(batch_size, width)`
+              that is reused for every batch, where `width` is `n`, or
+              `ceil(n / 8)` if `packed`. The yielded arrays are then views
+              of it and are overwritten by the next batch, defaults to None
+    :param packed: If true, the rows are bit-packed as by `numpy.packbits`
+              (into `out` when given), defaults to False
+    :type packed: bool
+    :param cache: If given, the swaps are read from (and stored in) this
+              `EmkSwapCache`, defaults to None
+    :type cache: Optional[EmkSwapCache]
+    :return: The function `emk_batches` returns a generator object that
+              yields NumPy `uint8` arrays with one combination per row.
+
+    Examples:
+        >>> for batch in emk_batches(4, 2, batch_size=4):
+        ...     print(batch.tolist())
+        ...
+        [[1, 1, 0, 0], [1, 0, 1, 0], [0, 1, 1, 0], [0, 1, 0, 1]]
+        [[1, 0, 0, 1], [0, 0, 1, 1]]
+    """
+    import numpy as np
+
+    if batch_size < 1:
+        raise ValueError("batch_size must be positive")
+    width = (n + 7) // 8 if packed else n
+    if out is not None and (out.shape != (batch_size, width) or out.dtype != np.uint8):
+        raise ValueError(f"out must be a uint8 array of shape {(batch_size, width)}")
+    total = comb(n, k)
+    state = np.zeros(n, dtype=np.uint8)
+    state[: max(0, k)] = 1
+    toggles = np.zeros((batch_size, n), dtype=np.uint8)
+    if packed:
+        # zero-padded to whole bytes; bits[:, j, b] is bit b of byte j
+        padded = np.zeros((batch_size, 8 * width), dtype=np.uint8)
+        bits = padded.reshape(batch_size, width, 8)
+        rows = padded[:, :n]
+    else:
+        rows = np.empty((batch_size, n), dtype=np.uint8) if out is None else out
+    read_swaps = emk_swap_reader(n, k, cache)
+    for first in range(0, total, batch_size):
+        count = min(batch_size, total - first)
+        # row r of the batch is combination first + r, reached by swap first + r - 1
+        skip = 1 if first == 0 else 0
+        pairs = read_swaps(count - skip)
+        toggles[:count] = 0
+        idx = np.arange(skip, count)
+        toggles[idx, pairs[0::2]] = 1
+        toggles[idx, pairs[1::2]] = 1
+        batch = rows[:count]
+        np.bitwise_xor.accumulate(toggles[:count], axis=0, out=batch)
+        batch ^= state
+        state[:] = batch[-1]
+        if packed:
+            # numpy.packbits has no `out`, so pack in place, bit by bit
+            dest = np.empty((count, width), np.uint8) if out is None else out[:count]
+            np.copyto(dest, bits[:count, :, 0])
+            for b in range(1, 8):
+                dest <<= 1
+                dest |= bits[:count, :, b]
+            batch = dest
+        elif out is None:
+            batch = batch.copy()
+        yield batch
+
+
+def multiset_comb_count(mults: Sequence[int], k: int) -> int:
+    """
+    The function `multiset_comb_count` counts the combinations of `k`
+    elements of a multiset, i.e. the vectors `(c_0, ..., c_{t-1})` with
+    `0 <= c_i <= mults[i]` and `c_0 + ... + c_{t-1} == k`.
+
+    :param mults: The multiplicities of the `t` distinct values
+    :type mults: Sequence[int]
+    :param k: The number of elements to choose
+    :type k: int
+    :return: The number of combinations.
+
+    Examples:
+        >>> multiset_comb_count([2, 1, 3], 3)
+        6
+        >>> multiset_comb_count([1] * 6, 3) == comb(6, 3)
+        True
+    """
+    if k < 0:
+        return 0
+    ways = [1] + [0] * k
+    for mult in mults:
+        # ways[j] = sum of the previous ways[j - mult .. j], as a sliding window
+        window = 0
+        new_ways = [0] * (k + 1)
+        for j in range(k + 1):
+            window += ways[j]
+            if j > mult:
+                window -= ways[j - mult - 1]
+            new_ways[j] = window
+        ways = new_ways
+    return ways[k]
+
+
+def multiset_comb_gen(
+    mults: Sequence[int], k: int
+) -> Generator[tuple[int, int], None, None]:
+    """Generate the combinations of a multiset in minimal-change order
+
+    The combinations of `k` elements of the multiset with multiplicities
+    `mults` are the vectors of counts `(c_0, ..., c_{t-1})` with
+    `0 <= c_i <= mults[i]` summing to `k`. Starting from the one that takes
+    as many of the first values as possible, each step replaces one element
+    by another: one count goes down by one and another goes up by one.
+
+    The order is the `emk` order of the "stars and bars" strings of the
+    counts (`k` ones separated by `t - 1` zeros), restricted to the counts
+    within the multiplicities. The restriction is still a minimal-change
+    order, and it is generated directly, without visiting the excluded
+    strings: the calls of the recursion (`c_{t-1} == 0`, then
+    `c_{t-1} == 1` in reverse, then `c_{t-1} >= 2`) are kept on an explicit
+    stack, and calls without any combination are never pushed.
+
+    :param mults: The multiplicities of the `t` distinct values
+    :type mults: Sequence[int]
+    :param k: The number of elements to choose
+    :type k: int
+    :return: The function `multiset_comb_gen` returns a generator object
+              that yields pairs `(down, up)`: the value whose count goes down
+              and the value whose count goes up.
+
+    Examples:
+        >>> for down, up in multiset_comb_gen([2, 1, 2], 2):
+        ...     print(f"{down} -> {up}")
+        ...
+        0 -> 1
+        0 -> 2
+        1 -> 0
+        0 -> 2
+    """
+    num = len(mults)
+    cap = [0]
+    for mult in mults:
+        cap.append(cap[-1] + mult)
+    if num == 0 or not 0 <= k <= cap[num]:
+        return
+    drops: dict[tuple[int, int], int] = {}
+
+    def drop(j: int, b: int) -> int:
+        """The value that loses an element from the last combination of the
+        prefix problem `(j, b)` to that of `(j, b - 1)`."""
+        key = (j, b)
+        if key not in drops:
+            after = _multiset_last(mults, cap, j, mults[j - 1], b - 1)
+            before = _multiset_last(mults, cap, j, mults[j - 1], b)
+            drops[key] = next(i for i in range(j) if before[i] != after[i])
+        return drops[key]
+
+    # entries (op, j, r, b): the combinations of b elements of the first j
+    # values, with the multiplicity of value j - 1 lowered to r
+    stack = [(_MS_GEN, num, mults[num - 1], k)]
+    push = stack.append
+    pop = stack.pop
+    while stack:
+        op, j, r, b = pop()
+        if op == _SWAP:
+            yield (j, r)
+            continue
+        if j <= 1:  # a single combination
+            continue
+        last = j - 1
+        has_a = b <= cap[last]  # c_last == 0
+        has_b = r >= 1 and 1 <= b <= cap[last] + 1  # c_last == 1
+        has_c = r >= 2 and b >= 2  # c_last >= 2
+        if op == _MS_GEN:  # reversed
+            if has_c:
+                push((_MS_GEN, j, r - 2, b - 2))
+                if has_b:
+                    # from the first combination of (last, b - 1)
+                    push((_SWAP, bisect_left(cap, b - 1) - 1, last, 0))
+            if has_b:
+                push((_MS_NEG, last, mults[last - 1], b - 1))
+                if has_a:
+                    push((_SWAP, drop(last, b), last, 0))
+            if has_a:
+                push((_MS_GEN, last, mults[last - 1], b))
+        else:
+            if has_a:
+                push((_MS_NEG, last, mults[last - 1], b))
+                if has_b:
+                    push((_SWAP, last, drop(last, b), 0))
+            if has_b:
+                push((_MS_GEN, last, mults[last - 1], b - 1))
+                if has_c:
+                    push((_SWAP, last, bisect_left(cap, b - 1) - 1, 0))
+            if has_c:
+                push((_MS_NEG, j, r - 2, b - 2))
+
+
+def multiset_comb(mults: Sequence[int], k: int) -> Generator[list[int], None, None]:
+    """
+    The function `multiset_comb` generates the combinations of `k` elements
+    of a multiset, as lists of counts, in the order of `multiset_comb_gen`.
+
+    The same list object is yielded every time and is updated in place.
+
+    :param mults: The multiplicities of the `t` distinct values
+    :type mults: Sequence[int]
+    :param k: The number of elements to choose
+    :type k: int
+    :return: The function `multiset_comb` returns a generator object that
+              yields lists `[c_0, ..., c_{t-1}]`.
+
+    Examples:
+        >>> for counts in multiset_comb([2, 1, 2], 2):
+        ...     print(counts)
+        ...
+        [2, 0, 0]
+        [1, 1, 0]
+        [0, 1, 1]
+        [1, 0, 1]
+        [0, 0, 2]
+    """
+    if not 0 <= k <= sum(mults):
+        return
+    counts = []
+    rest = k
+    for mult in mults:
+        counts.append(min(mult, rest))
+        rest -= counts[-1]
+    yield counts
+    for down, up in multiset_comb_gen(mults, k):
+        counts[down] -= 1
+        counts[up] += 1
+        yield counts
+
+
+def _multiset_last(
+    mults: Sequence[int], cap: list[int], j: int, r: int, b: int
+) -> list[int]:
+    """Return the last combination of `b` elements of the first `j` values
+    (with the multiplicity of value `j - 1` lowered to `r`) in the order of
+    `multiset_comb_gen`.
+    """
+    counts = [0] * j
+    while j > 1:
+        # the calls with c_{j-1} >= 2 come last, two elements at a time
+        pairs = min(r // 2, b // 2)
+        counts[j - 1] += 2 * pairs
+        r -= 2 * pairs
+        b -= 2 * pairs
+        if r >= 1 and 1 <= b <= cap[j - 1] + 1:
+            # c_{j-1} == 1 comes last, ending at the first combination
+            counts[j - 1] += 1
+            b -= 1
+            for i in range(j - 1):
+                counts[i] = min(mults[i], b)
+                b -= counts[i]
+            return counts
+        j -= 1
+        r = mults[j - 1]
+    if j == 1:
+        counts[0] += b
+    return counts
+
+
 if __name__ == "__main__":
     import doctest
 
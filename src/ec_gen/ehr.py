@@ -30,12 +30,24 @@ An important aspect of this algorithm is its efficiency. Instead of generating
 and storing all permutations at once, it yields them one at a time. This
 approach saves memory and allows for processing of permutations as they're
 generated, which can be very useful when working with large sets of elements.
+
+The partial reversal of b costs O(index) work and builds a new list every
+time. The function ehr_gen_loopless produces the same swaps with O(1) work
+and no allocation per swap. Two observations make this possible. First, the
+index that changes in c is the same as the digit that changes in a
+reflected mixed-radix gray code, so focus pointers find it without a loop,
+as in mrgc_gen. Second, a reversal of b does not have to be finished at
+once: after a reversal of the first h entries, entry r is not looked at
+again for about r! swaps. So only the first two pairs are swapped right
+away, and the rest is kept on a small stack of pending reversals, one pair
+of which is swapped at each later step. Since the two lowest digits of c
+never touch b, they are unrolled into five plain yields.
 """
 
 from typing import Generator
 
 
-def ehr_gen(n: int) -> Generator[int, None, None]:
+def ehr_gen(n: int, loopless: bool = False) -> Generator[int, None, None]:
     """
     The function `ehr` generates all permutations of a given length using EHR algorithm.
 
@@ -51,6 +63,9 @@ def ehr_gen(n: int) -> Generator[int, None, None]:
     :param n: The parameter `n` represents the number of elements in the
               permutation
     :type n: int
+    :param loopless: If true, the swaps are produced by `ehr_gen_loopless`
+              instead of the list-reversing loop, defaults to False
+    :type loopless: bool
 
     Examples:
         >>> for i in ehr_gen(4):
@@ -80,6 +95,9 @@ def ehr_gen(n: int) -> Generator[int, None, None]:
         swap 0 and 1
         swap 0 and 2
     """
+    if loopless:
+        yield from ehr_gen_loopless(n)
+        return
     if n < 2:
         return
 
@@ -100,6 +118,76 @@ def ehr_gen(n: int) -> Generator[int, None, None]:
         perm[1:idx] = perm[idx - 1 : 0 : -1]
 
 
+def ehr_gen_loopless(n: int) -> Generator[int, None, None]:
+    """
+    The function `ehr_gen_loopless` generates the same swaps as `ehr_gen`,
+    with O(1) work and no allocation per swap.
+
+    Between two steps in which the third or a higher entry of the state
+    advances, the swaps alternate between the first two entries of `perm`,
+    which do not change in the meantime. The entry that advances next is
+    found with focus pointers, and the reversal of `perm` that follows it
+    is spread over the next steps (see the module description).
+
+    :param n: The parameter `n` represents the number of elements in the
+              permutation
+    :type n: int
+    :return: The function `ehr_gen_loopless` returns a generator object.
+
+    Examples:
+        >>> list(ehr_gen_loopless(3))
+        [1, 2, 1, 2, 1]
+        >>> list(ehr_gen_loopless(7)) == list(ehr_gen(7))
+        True
+    """
+    if n < 3:
+        if n == 2:
+            yield 1
+        return
+
+    perm = list(range(n))  # perm[0] is never used
+    last = n - 3  # the state entry idx has index idx - 3 below
+    digit = [0] * (last + 1)
+    sign = [1] * (last + 1)
+    focus = list(range(last + 1))
+    lo = [0] * n  # stack of pending reversals perm[lo..hi]
+    hi = [0] * n
+    top = 0
+    while True:
+        first, second = perm[1], perm[2]
+        yield first
+        yield second
+        yield first
+        yield second
+        yield first
+        j = focus[0]
+        if j == last:
+            return
+        focus[0] = 0
+        digit[j] += sign[j]
+        if digit[j] == 0 or digit[j] == j + 3:
+            sign[j] = -sign[j]
+            focus[j] = focus[j + 1]
+            focus[j + 1] = j + 1
+        if top:  # swap one pair of the most recent pending reversal
+            t = top - 1
+            a, b = lo[t], hi[t]
+            perm[a], perm[b] = perm[b], perm[a]
+            lo[t] = a + 1
+            hi[t] = b - 1
+            if a + 2 >= b:
+                top = t
+        yield perm[j + 3]
+        h = j + 2  # reverse perm[1..h]
+        perm[1], perm[h] = perm[h], perm[1]
+        if h >= 4:
+            perm[2], perm[h - 1] = perm[h - 1], perm[2]
+            if h >= 6:
+                lo[top] = 3
+                hi[top] = h - 2
+                top += 1
+
+
 if __name__ == "__main__":
     import doctest
 
@@ -32,16 +32,60 @@ of bits and flips them one at a time based on the output of brgc_gen.
 This transformation is what converts the simple sequence of numbers into a
 valid Gray code.
 
+For large n the recursive brgc_gen pays for its elegance: every flip index
+has to travel up a chain of up to n suspended generator frames. The
+brgc_gen_loopless function produces exactly the same sequence without any
+recursion. It relies on the ruler function: the k-th flip (counting from
+1) is the number of trailing zeros of k, which costs O(1) per flip no
+matter how large n is. Both brgc_gen and brgc accept loopless=True to
+switch to this engine.
+
+Two further output modes avoid the per-word list altogether. brgc_int
+yields each code word packed into a Python int, together with the mask of
+the bit that was just flipped. brgc_batches computes whole chunks of code
+words at once as NumPy uint64 arrays using the closed form r ^ (r >> 1),
+so a downstream filter can work on millions of words per call.
+
+Since the r-th code word is simply r ^ (r >> 1), the sequence can be
+entered anywhere. brgc_rank and brgc_unrank convert between packed code
+words and positions, and brgc_gen, brgc and brgc_int accept start and
+stop arguments so that disjoint ranges can be generated independently,
+each after O(n) setup.
+
+The whole flip sequence can also be built as a NumPy array without ever
+touching a Python generator. brgc_flips_array uses reflected doubling: the
+sequence for i + 1 bits is the sequence for i bits, then i, then the
+sequence for i bits again, each step being a single block copy.
+brgc_flips_chunks produces the same sequence piece by piece from trailing
+zero counts, for sizes that do not fit in memory. NumPy is only needed for
+brgc_batches, brgc_flips_array, brgc_flips_chunks and the subset tables
+below.
+
+For meet-in-the-middle subset-sum and knapsack, brgc_subset_sums returns
+the sums (or XORs) of all 2^n subsets of a weight vector, laid out in the
+same order as brgc(n). It uses the same reflected doubling as
+brgc_flips_array: the table for i + 1 items is the table for i items
+followed by its reverse with w[i] added. brgc_subset_sums_chunks gives the
+table in pieces, by looking up the low and the high half of each code word
+in two small tables of 2^(n/2) entries each.
+
 The code also includes examples in the docstrings, showing how to use
 these functions. One example demonstrates printing the Gray code sequence
 using black and white square characters, which helps visualize the
 changing bits in the sequence.
 """
 
-from typing import Generator
+from typing import TYPE_CHECKING, Any, Generator, Optional, Sequence
 
+from ec_gen._ranges import check_range
 
-def brgc_gen(n: int) -> Generator[int, None, None]:
+if TYPE_CHECKING:
+    import numpy as np
+
+
+def brgc_gen(
+    n: int, loopless: bool = False, start: int = 0, stop: Optional[int] = None
+) -> Generator[int, None, None]:
     """
     The function `brgc_gen` generates a sequence of binary reflected gray
     code numbers up to a given length `n`.
@@ -49,6 +93,16 @@ def brgc_gen(n: int) -> Generator[int, None, None]:
     :param n: The parameter `n` represents the number of bits in the
               binary reflected gray code sequence
     :type n: int
+    :param loopless: If true, the flips are produced by `brgc_gen_loopless`
+              instead of the recursive generator, defaults to False
+    :type loopless: bool
+    :param start: The position in the flip sequence to start from. Any
+              range other than the full one is served by
+              `brgc_gen_loopless`, defaults to 0
+    :type start: int
+    :param stop: The position in the flip sequence to stop before,
+              defaults to None (the end of the sequence)
+    :type stop: Optional[int]
     :return: The function `brgc_gen` returns a generator object.
 
     Examples:
@@ -70,7 +124,14 @@ def brgc_gen(n: int) -> Generator[int, None, None]:
         flip 0
         flip 1
         flip 0
+        >>> list(brgc_gen(4, start=6, stop=9))
+        [0, 3, 0]
     """
+    if loopless or start != 0 or stop is not None:
+        yield from brgc_gen_loopless(n, start, stop)
+        return
+    if n < 1:
+        return  # a single word, no flips
     if n == 1:
         yield 0
         return
@@ -79,7 +140,89 @@ def brgc_gen(n: int) -> Generator[int, None, None]:
     yield from brgc_gen(n - 1)
 
 
-def brgc(n: int) -> Generator[list[int], None, None]:
+def brgc_gen_loopless(
+    n: int, start: int = 0, stop: Optional[int] = None
+) -> Generator[int, None, None]:
+    """
+    The function `brgc_gen_loopless` generates the same flip sequence as
+    `brgc_gen`, but iteratively with O(1) work per flip.
+
+    The k-th flip (counting from 1) is given by the ruler function, i.e. the
+    number of trailing zeros of k. No recursion is involved, so the cost of
+    each flip does not grow with `n`. For the same reason the sequence can
+    be started at any position, so disjoint ranges can run independently.
+
+    :param n: The parameter `n` represents the number of bits in the
+              binary reflected gray code sequence
+    :type n: int
+    :param start: The position in the flip sequence to start from,
+              defaults to 0
+    :type start: int
+    :param stop: The position in the flip sequence to stop before,
+              defaults to None (the end of the sequence, 2**n - 1)
+    :type stop: Optional[int]
+    :return: The function `brgc_gen_loopless` returns a generator object.
+
+    Examples:
+        >>> list(brgc_gen_loopless(4))
+        [0, 1, 0, 2, 0, 1, 0, 3, 0, 1, 0, 2, 0, 1, 0]
+        >>> list(brgc_gen_loopless(5)) == list(brgc_gen(5))
+        True
+    """
+    start, stop = check_range(start, stop, (1 << n) - 1)
+    for k in range(start + 1, stop + 1):
+        yield (k & -k).bit_length() - 1
+
+
+def brgc_rank(word: int) -> int:
+    """
+    The function `brgc_rank` returns the position of a packed code word in
+    the binary reflected gray code sequence.
+
+    Bit `i` of `word` corresponds to `bits[i]` of `brgc`. The rank does not
+    depend on the number of bits.
+
+    :param word: The packed code word (a non-negative integer)
+    :type word: int
+    :return: The position `r` such that `brgc_unrank(n, r) == word`.
+
+    Examples:
+        >>> [brgc_rank(word) for word, _ in brgc_int(3)]
+        [0, 1, 2, 3, 4, 5, 6, 7]
+    """
+    if word < 0:
+        raise ValueError("word must be non-negative")
+    rank = word
+    while word:
+        word >>= 1
+        rank ^= word
+    return rank
+
+
+def brgc_unrank(n: int, rank: int) -> int:
+    """
+    The function `brgc_unrank` returns the packed code word at a given
+    position of the binary reflected gray code sequence of length `n`.
+
+    :param n: The parameter `n` represents the number of bits in the
+              binary code
+    :type n: int
+    :param rank: The position in the sequence, from 0 to 2**n - 1
+    :type rank: int
+    :return: The packed code word at position `rank`.
+
+    Examples:
+        >>> [brgc_unrank(3, r) for r in range(8)]
+        [0, 1, 3, 2, 6, 7, 5, 4]
+    """
+    if not 0 <= rank < 1 << n:
+        raise ValueError("rank out of range")
+    return rank ^ (rank >> 1)
+
+
+def brgc(
+    n: int, loopless: bool = False, start: int = 0, stop: Optional[int] = None
+) -> Generator[list[int], None, None]:
     """
     The function `brgc` generates a binary reflected gray code sequence of
     length `n`.
@@ -87,6 +230,15 @@ def brgc(n: int) -> Generator[list[int], None, None]:
     :param n: The parameter `n` represents the number of bits in the
               binary code
     :type n: int
+    :param loopless: If true, the flips are produced by `brgc_gen_loopless`
+              instead of the recursive generator, defaults to False
+    :type loopless: bool
+    :param start: The position of the first code word to generate,
+              defaults to 0
+    :type start: int
+    :param stop: The position of the code word to stop before, defaults to
+              None (the end of the sequence, 2**n)
+    :type stop: Optional[int]
 
     Examples:
         >>> s = "◾◽"
@@ -110,14 +262,366 @@ def brgc(n: int) -> Generator[list[int], None, None]:
         ◽◽◾◽
         ◽◾◾◽
         ◾◾◾◽
+        >>> for lst in brgc(4, start=6, stop=9):
+        ...     print(lst)
+        ...
+        [1, 0, 1, 0]
+        [0, 0, 1, 0]
+        [0, 0, 1, 1]
     """
-    bits = list(0 for _ in range(n))
+    start, stop = check_range(start, stop, 1 << n)
+    if start == stop:
+        return
+    word = brgc_unrank(n, start)
+    bits = list((word >> i) & 1 for i in range(n))
     yield bits
-    for idx in brgc_gen(n):
+    for idx in brgc_gen(n, loopless, start, None if stop == 1 << n else stop - 1):
         bits[idx] = 1 - bits[idx]  # flip
         yield bits
 
 
+def brgc_int(
+    n: int, loopless: bool = False, start: int = 0, stop: Optional[int] = None
+) -> Generator[tuple[int, int], None, None]:
+    """
+    The function `brgc_int` generates a binary reflected gray code sequence
+    of length `n`, with each code word packed into an integer.
+
+    Bit `i` of the packed word corresponds to `bits[i]` of `brgc`. Each word
+    is yielded together with the mask of the bit that was flipped to reach
+    it (0 for the first word), so `word ^ mask` gives back the previous word.
+
+    :param n: The parameter `n` represents the number of bits in the
+              binary code
+    :type n: int
+    :param loopless: If true, the flips are produced by `brgc_gen_loopless`
+              instead of the recursive generator, defaults to False
+    :type loopless: bool
+    :param start: The position of the first code word to generate,
+              defaults to 0
+    :type start: int
+    :param stop: The position of the code word to stop before, defaults to
+              None (the end of the sequence, 2**n)
+    :type stop: Optional[int]
+    :return: The function `brgc_int` returns a generator object that yields
+              pairs of integers `(word, mask)`.
+
+    Examples:
+        >>> for word, mask in brgc_int(3):
+        ...     print(f"{word:03b} {mask:03b}")
+        ...
+        000 000
+        001 001
+        011 010
+        010 001
+        110 100
+        111 001
+        101 010
+        100 001
+    """
+    start, stop = check_range(start, stop, 1 << n)
+    if start == stop:
+        return
+    word = brgc_unrank(n, start)
+    yield word, 0
+    for idx in brgc_gen(n, loopless, start, None if stop == 1 << n else stop - 1):
+        mask = 1 << idx
+        word ^= mask  # flip
+        yield word, mask
+
+
+def brgc_batches(
+    n: int, batch_size: int = 1 << 16
+) -> Generator["np.ndarray", None, None]:
+    """
+    The function `brgc_batches` generates the binary reflected gray code
+    sequence of length `n` in chunks of packed code words.
+
+    Each chunk is a NumPy `uint64` array computed in vectorized form from the
+    positions `r` as `r ^ (r >> 1)`. Concatenating the chunks gives the same
+    words, in the same order, as `brgc_int`.
+
+    :param n: The parameter `n` represents the number of bits in the
+              binary code (at most 64)
+    :type n: int
+    :param batch_size: The maximum number of code words per chunk,
+              defaults to 65536
+    :type batch_size: int
+    :return: The function `brgc_batches` returns a generator object that
+              yields NumPy `uint64` arrays.
+
+    Examples:
+        >>> for chunk in brgc_batches(3, batch_size=3):
+        ...     print(chunk.tolist())
+        ...
+        [0, 1, 3]
+        [2, 6, 7]
+        [5, 4]
+    """
+    import numpy as np
+
+    if not 0 <= n <= 64:
+        raise ValueError("n must be between 0 and 64")
+    if batch_size < 1:
+        raise ValueError("batch_size must be positive")
+    total = 1 << n
+    for start in range(0, total, batch_size):
+        stop = min(start + batch_size, total)
+        pos = np.arange(start, stop, dtype=np.uint64)
+        yield pos ^ (pos >> np.uint64(1))
+
+
+def mrgc_gen(radices: Sequence[int]) -> Generator[tuple[int, int], None, None]:
+    """
+    The function `mrgc_gen` generates the moves of the mixed-radix reflected
+    gray code for the given radices.
+
+    Each move `(j, delta)` changes digit `j` by `delta`, which is either
+    +1 or -1, and every word `(a_0, ..., a_{n-1})` with `0 <= a_j < m_j` is
+    reached exactly once starting from all zeros. Digit 0 changes most
+    often. The moves are found with focus pointers, so each one costs O(1).
+    Digits with radix 1 never change.
+
+    :param radices: The radices `(m_0, ..., m_{n-1})` of the digits
+    :type radices: Sequence[int]
+    :return: The function `mrgc_gen` returns a generator object that yields
+              pairs of integers `(j, delta)`.
+
+    Examples:
+        >>> for j, delta in mrgc_gen((3, 2)):
+        ...     print(f"digit {j} {delta:+d}")
+        ...
+        digit 0 +1
+        digit 0 +1
+        digit 1 +1
+        digit 0 -1
+        digit 0 -1
+        >>> [j for j, _ in mrgc_gen((2, 2, 2))] == list(brgc_gen(3))
+        True
+    """
+    if any(m < 1 for m in radices):
+        raise ValueError("radices must be positive")
+    active = [j for j, m in enumerate(radices) if m > 1]
+    last = [radices[j] - 1 for j in active]
+    n = len(active)
+    digits = [0] * n
+    focus = list(range(n + 1))
+    direction = [1] * n
+    while True:
+        j = focus[0]
+        focus[0] = 0
+        if j == n:
+            return
+        digits[j] += direction[j]
+        yield active[j], direction[j]
+        if digits[j] == 0 or digits[j] == last[j]:
+            direction[j] = -direction[j]
+            focus[j] = focus[j + 1]
+            focus[j + 1] = j + 1
+
+
+def mrgc(radices: Sequence[int]) -> Generator[list[int], None, None]:
+    """
+    The function `mrgc` generates the mixed-radix reflected gray code for
+    the given radices.
+
+    :param radices: The radices `(m_0, ..., m_{n-1})` of the digits
+    :type radices: Sequence[int]
+
+    Examples:
+        >>> for lst in mrgc((3, 2)):
+        ...     print(lst)
+        ...
+        [0, 0]
+        [1, 0]
+        [2, 0]
+        [2, 1]
+        [1, 1]
+        [0, 1]
+    """
+    digits = [0] * len(radices)
+    yield digits
+    for j, delta in mrgc_gen(radices):
+        digits[j] += delta
+        yield digits
+
+
+def brgc_flips_array(n: int, dtype: Any = "uint8") -> "np.ndarray":
+    """
+    The function `brgc_flips_array` returns the whole flip sequence of
+    `brgc_gen(n)` as a contiguous NumPy array.
+
+    The array is built by reflected doubling: after writing the sequence for
+    `i` bits, `i` is appended and the first half is copied after it.
+
+    :param n: The parameter `n` represents the number of bits in the
+              binary reflected gray code sequence
+    :type n: int
+    :param dtype: The integer dtype of the result, defaults to "uint8"
+    :return: A NumPy array of length 2**n - 1.
+
+    Examples:
+        >>> brgc_flips_array(4).tolist()
+        [0, 1, 0, 2, 0, 1, 0, 3, 0, 1, 0, 2, 0, 1, 0]
+    """
+    import numpy as np
+
+    flips = np.empty((1 << n) - 1, dtype=dtype)
+    length = 0
+    for i in range(n):
+        flips[length] = i
+        flips[length + 1 : 2 * length + 1] = flips[:length]
+        length = 2 * length + 1
+    return flips
+
+
+def brgc_flips_chunks(
+    n: int,
+    chunk_size: int = 1 << 20,
+    dtype: Any = "uint8",
+    start: int = 0,
+    stop: Optional[int] = None,
+) -> Generator["np.ndarray", None, None]:
+    """
+    The function `brgc_flips_chunks` generates the flip sequence of
+    `brgc_gen(n)` as a series of NumPy arrays.
+
+    Each chunk is computed in vectorized form: the flip at position `k` is
+    the number of trailing zeros of `k + 1`. Concatenating the chunks gives
+    `brgc_flips_array(n)[start:stop]`.
+
+    :param n: The parameter `n` represents the number of bits in the
+              binary reflected gray code sequence (at most 63)
+    :type n: int
+    :param chunk_size: The maximum number of flips per chunk, defaults to
+              1048576
+    :type chunk_size: int
+    :param dtype: The integer dtype of the chunks, defaults to "uint8"
+    :param start: The position in the flip sequence to start from,
+              defaults to 0
+    :type start: int
+    :param stop: The position in the flip sequence to stop before,
+              defaults to None (the end of the sequence, 2**n - 1)
+    :type stop: Optional[int]
+    :return: The function `brgc_flips_chunks` returns a generator object
+              that yields NumPy arrays.
+
+    Examples:
+        >>> for chunk in brgc_flips_chunks(4, chunk_size=6):
+        ...     print(chunk.tolist())
+        ...
+        [0, 1, 0, 2, 0, 1]
+        [0, 3, 0, 1, 0, 2]
+        [0, 1, 0]
+    """
+    import numpy as np
+
+    if not 0 <= n <= 63:
+        raise ValueError("n must be between 0 and 63")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+    start, stop = check_range(start, stop, (1 << n) - 1)
+    for first in range(start, stop, chunk_size):
+        last = min(first + chunk_size, stop)
+        pos = np.arange(first + 1, last + 1, dtype=np.int64)
+        lowbit = pos & -pos
+        # frexp is exact for powers of two: lowbit == 0.5 * 2**exponent
+        yield (np.frexp(lowbit.astype(np.float64))[1] - 1).astype(dtype)
+
+
+_SUBSET_OPS = ("sum", "xor")
+
+
+def brgc_subset_sums(weights: Any, op: str = "sum") -> "np.ndarray":
+    """
+    The function `brgc_subset_sums` returns the sums (or XORs) of the
+    weights of all subsets, in binary reflected gray code order.
+
+    Entry `r` of the result aggregates the weights `w[i]` for which
+    `bits[i]` is 1 in the `r`-th list yielded by `brgc(n)`.
+
+    :param weights: The weights of the `n` items, an array of shape `(n,)`
+    :param op: Either "sum" or "xor", defaults to "sum"
+    :type op: str
+    :return: A NumPy array of length 2**n.
+
+    Examples:
+        >>> brgc_subset_sums([1, 10, 100]).tolist()
+        [0, 1, 11, 10, 110, 111, 101, 100]
+        >>> brgc_subset_sums([1, 2, 4], op="xor").tolist()
+        [0, 1, 3, 2, 6, 7, 5, 4]
+    """
+    import numpy as np
+
+    ufunc = _subset_ufunc(op)
+    weights = np.asarray(weights)
+    n = len(weights)
+    table = np.zeros(1 << n, dtype=weights.dtype)
+    length = 1
+    for i in range(n):
+        # reflect: the second half visits the first half backwards with w[i]
+        ufunc(table[length - 1 :: -1], weights[i], out=table[length : 2 * length])
+        length *= 2
+    return table
+
+
+def brgc_subset_sums_chunks(
+    weights: Any, op: str = "sum", chunk_size: int = 1 << 20
+) -> Generator["np.ndarray", None, None]:
+    """
+    The function `brgc_subset_sums_chunks` generates the table of
+    `brgc_subset_sums` in chunks, for sizes that do not fit in memory.
+
+    Each entry is found by looking up the low and the high half of the code
+    word in two tables with about 2**(n/2) entries each.
+
+    :param weights: The weights of the `n` items (at most 63), an array of
+              shape `(n,)`
+    :param op: Either "sum" or "xor", defaults to "sum"
+    :type op: str
+    :param chunk_size: The maximum number of entries per chunk, defaults to
+              1048576
+    :type chunk_size: int
+    :return: The function `brgc_subset_sums_chunks` returns a generator
+              object that yields NumPy arrays.
+
+    Examples:
+        >>> for chunk in brgc_subset_sums_chunks([1, 10, 100], chunk_size=3):
+        ...     print(chunk.tolist())
+        ...
+        [0, 1, 11]
+        [10, 110, 111]
+        [101, 100]
+    """
+    import numpy as np
+
+    ufunc = _subset_ufunc(op)
+    weights = np.asarray(weights)
+    n = len(weights)
+    if n > 63:
+        raise ValueError("at most 63 weights are supported")
+    half = n // 2
+    # tables indexed by the value of the word, not by gray code position
+    tables = []
+    for part in (weights[:half], weights[half:]):
+        table = np.zeros(1 << len(part), dtype=weights.dtype)
+        for i, weight in enumerate(part):
+            ufunc(table[: 1 << i], weight, out=table[1 << i : 2 << i])
+        tables.append(table)
+    low_mask = np.uint64((1 << half) - 1)
+    for chunk in brgc_batches(n, chunk_size):
+        yield ufunc(tables[0][chunk & low_mask], tables[1][chunk >> np.uint64(half)])
+
+
+def _subset_ufunc(op: str) -> Any:
+    """Return the NumPy ufunc that aggregates subset weights for `op`."""
+    import numpy as np
+
+    if op not in _SUBSET_OPS:
+        raise ValueError(f"op must be one of {_SUBSET_OPS}")
+    return np.add if op == "sum" else np.bitwise_xor
+
+
 if __name__ == "__main__":
     import doctest
 
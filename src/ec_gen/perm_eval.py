@@ -0,0 +1,327 @@
+"""
+Incremental Tour and Assignment Costs in SJT Order
+
+This code solves small traveling salesman (TSP) and quadratic assignment
+(QAP) instances exactly, by evaluating the cost of every permutation. A
+permutation p of n elements is read as follows:
+
+- For the TSP, p is a tour that visits the cities p[0], p[1], ..., p[n-1]
+  and returns to p[0]. With a distance matrix D, its cost is
+
+      sum_i D[p[i]][p[i + 1 mod n]]
+
+- For the QAP, facility i is placed at location p[i]. With a flow matrix F
+  between the facilities and a distance matrix D between the locations,
+  its cost is
+
+      sum_i sum_j F[i][j] D[p[i]][p[j]]
+
+The permutations are visited in the Steinhaus-Johnson-Trotter order of
+sjt_gen in sjt, where the entries at positions x and x + 1 swap places from
+one permutation to the next. Only the few terms that involve these two
+positions change: for the TSP the three tour edges around them, for the QAP
+the O(n) terms in their rows and columns of F. So each new cost is the old
+one plus a small delta. As in subset_eval, the deltas are not applied one at
+a time in Python. The permutations come in batches from sjt2_batches in
+sjt_list, the swap of each step comes alongside from sjt_swaps_chunks, the
+deltas of a whole batch are gathered with NumPy, and the running cost is a
+cumulative sum. Only the first permutation of each batch is evaluated from
+scratch.
+
+A tour has the same cost whichever city it starts from, so only the tours
+that start at city 0 need to be visited, (n - 1)! instead of n!. The option
+fix_first keeps element 0 at position 0 and permutes the others. It is the
+default for the TSP, and may also be used for a QAP that is known to have a
+matching symmetry.
+
+Permutations are reported by their position in the visiting order, which is
+their rank for sjt_unrank, or with fix_first, the rank of p[1:] - 1 among
+the permutations of n - 1 elements. tour_best and qap_best keep the best
+few permutations and return them in full.
+
+NumPy is required for everything in this module.
+"""
+
+from typing import TYPE_CHECKING, Any, Generator, Optional
+
+from ec_gen.sjt import sjt_swaps_chunks, sjt_unrank
+from ec_gen.sjt_list import sjt2_batches
+from ec_gen.topk import best_of
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+def tour_cost_chunks(
+    distances: Any, fix_first: bool = True, chunk_size: int = 1 << 16
+) -> Generator[tuple["np.ndarray", "np.ndarray"], None, None]:
+    """
+    The function `tour_cost_chunks` evaluates the length of every tour, in
+    SJT order, one chunk at a time.
+
+    :param distances: The `(n, n)` array `D` of distances between the
+              cities, not necessarily symmetric
+    :param fix_first: If true, only the tours starting at city 0 are
+              visited, defaults to True
+    :type fix_first: bool
+    :param chunk_size: The maximum number of tours per chunk, defaults to
+              65536
+    :type chunk_size: int
+    :return: The function `tour_cost_chunks` returns a generator object
+              that yields pairs `(ranks, costs)` of 1D arrays.
+
+    Examples:
+        >>> distances = [[0, 1, 9, 1], [1, 0, 1, 9], [9, 1, 0, 1], [1, 9, 1, 0]]
+        >>> for ranks, costs in tour_cost_chunks(distances, chunk_size=4):
+        ...     print(ranks.tolist(), costs.tolist())
+        ...
+        [0, 1, 2, 3] [4, 20, 20, 4]
+        [4, 5] [20, 20]
+    """
+    import numpy as np
+
+    distances = _square(distances, "distances")
+    n = distances.shape[0]
+
+    def full(perms: "np.ndarray") -> "np.ndarray":
+        return distances[perms, np.roll(perms, -1, axis=1)].sum(axis=1)
+
+    def deltas(prev: "np.ndarray", x: "np.ndarray") -> "np.ndarray":
+        rows = np.arange(len(prev))
+        a, b = prev[rows, x], prev[rows, x + 1]
+        u, v = prev[rows, (x - 1) % n], prev[rows, (x + 2) % n]
+        old = distances[u, a] + distances[a, b] + distances[b, v]
+        return distances[u, b] + distances[b, a] + distances[a, v] - old
+
+    yield from _cost_chunks(n, full, deltas if n > 2 else None, fix_first, chunk_size)
+
+
+def qap_cost_chunks(
+    flows: Any, distances: Any, fix_first: bool = False, chunk_size: int = 1 << 16
+) -> Generator[tuple["np.ndarray", "np.ndarray"], None, None]:
+    """
+    The function `qap_cost_chunks` evaluates the cost of every assignment
+    of facilities to locations, in SJT order, one chunk at a time.
+
+    :param flows: The `(n, n)` array `F` of flows between the facilities
+    :param distances: The `(n, n)` array `D` of distances between the
+              locations
+    :param fix_first: If true, facility 0 stays at location 0, defaults to
+              False
+    :type fix_first: bool
+    :param chunk_size: The maximum number of assignments per chunk, defaults
+              to 65536
+    :type chunk_size: int
+    :return: The function `qap_cost_chunks` returns a generator object that
+              yields pairs `(ranks, costs)` of 1D arrays.
+
+    Examples:
+        >>> flows = [[0, 3, 0], [3, 0, 1], [0, 1, 0]]
+        >>> distances = [[0, 1, 2], [1, 0, 1], [2, 1, 0]]
+        >>> for ranks, costs in qap_cost_chunks(flows, distances):
+        ...     print(ranks.tolist(), costs.tolist())
+        ...
+        [0, 1, 2, 3, 4, 5] [8, 14, 14, 8, 10, 10]
+    """
+    import numpy as np
+
+    flows = _square(flows, "flows")
+    distances = _square(distances, "distances")
+    if flows.shape != distances.shape:
+        raise ValueError("flows and distances must have the same shape")
+    n = flows.shape[0]
+
+    def full(perms: "np.ndarray") -> "np.ndarray":
+        return (flows * distances[perms[:, :, None], perms[:, None, :]]).sum(
+            axis=(1, 2)
+        )
+
+    def deltas(prev: "np.ndarray", x: "np.ndarray") -> "np.ndarray":
+        # facilities r = x and s = x + 1 trade locations pr and ps
+        rows = np.arange(len(prev))
+        r, s = x, x + 1
+        pr, ps = prev[rows, r][:, None], prev[rows, s][:, None]
+        # the terms F[r][k] D[p[r]][p[k]] and F[k][r] D[p[k]][p[r]] for all k
+        terms = (flows[r] - flows[s]) * (distances[ps, prev] - distances[pr, prev])
+        terms += (flows[:, r].T - flows[:, s].T) * (
+            distances[prev, ps] - distances[prev, pr]
+        )
+        # k = r and k = s are the four terms among r and s themselves
+        np.put_along_axis(terms, np.stack((r, s), axis=1), 0, axis=1)
+        pr, ps = pr[:, 0], ps[:, 0]
+        d_rr, d_ss = distances[pr, pr], distances[ps, ps]
+        d_rs, d_sr = distances[pr, ps], distances[ps, pr]
+        return (
+            terms.sum(axis=1)
+            + (flows[r, r] - flows[s, s]) * (d_ss - d_rr)
+            + (flows[r, s] - flows[s, r]) * (d_sr - d_rs)
+        )
+
+    yield from _cost_chunks(n, full, deltas, fix_first, chunk_size)
+
+
+def tour_best(
+    distances: Any,
+    top: int = 1,
+    maximize: bool = False,
+    fix_first: bool = True,
+    chunk_size: int = 1 << 16,
+) -> tuple["np.ndarray", "np.ndarray"]:
+    """
+    The function `tour_best` finds the shortest tours by exhaustive search
+    in SJT order.
+
+    :param distances: The `(n, n)` array `D` of distances between the
+              cities, not necessarily symmetric
+    :param top: The number of tours to keep, defaults to 1
+    :type top: int
+    :param maximize: If true, keep the longest tours instead, defaults to
+              False
+    :type maximize: bool
+    :param fix_first: If true, only the tours starting at city 0 are
+              visited, defaults to True
+    :type fix_first: bool
+    :param chunk_size: The number of tours evaluated per vectorized step,
+              defaults to 65536
+    :type chunk_size: int
+    :return: A pair `(tours, costs)` sorted from best to worst, where
+              `tours` has shape `(top, n)` and `costs` shape `(top,)`.
+
+    Examples:
+        >>> distances = [[0, 1, 9, 1], [1, 0, 1, 9], [9, 1, 0, 1], [1, 9, 1, 0]]
+        >>> tours, costs = tour_best(distances, top=2)
+        >>> tours.tolist(), costs.tolist()
+        ([[0, 1, 2, 3], [0, 3, 2, 1]], [4, 4])
+    """
+    return _best_perms(
+        tour_cost_chunks(distances, fix_first, chunk_size),
+        len(distances),
+        top,
+        maximize,
+        fix_first,
+    )
+
+
+def qap_best(
+    flows: Any,
+    distances: Any,
+    top: int = 1,
+    maximize: bool = False,
+    fix_first: bool = False,
+    chunk_size: int = 1 << 16,
+) -> tuple["np.ndarray", "np.ndarray"]:
+    """
+    The function `qap_best` finds the cheapest assignments of facilities to
+    locations by exhaustive search in SJT order.
+
+    :param flows: The `(n, n)` array `F` of flows between the facilities
+    :param distances: The `(n, n)` array `D` of distances between the
+              locations
+    :param top: The number of assignments to keep, defaults to 1
+    :type top: int
+    :param maximize: If true, keep the most expensive assignments instead,
+              defaults to False
+    :type maximize: bool
+    :param fix_first: If true, facility 0 stays at location 0, defaults to
+              False
+    :type fix_first: bool
+    :param chunk_size: The number of assignments evaluated per vectorized
+              step, defaults to 65536
+    :type chunk_size: int
+    :return: A pair `(perms, costs)` sorted from best to worst, where row
+              `i` of `perms` gives the location of every facility.
+
+    Examples:
+        >>> flows = [[0, 3, 0], [3, 0, 1], [0, 1, 0]]
+        >>> distances = [[0, 1, 2], [1, 0, 1], [2, 1, 0]]
+        >>> perms, costs = qap_best(flows, distances)
+        >>> perms.tolist(), costs.tolist()
+        ([[0, 1, 2]], [8])
+    """
+    return _best_perms(
+        qap_cost_chunks(flows, distances, fix_first, chunk_size),
+        len(flows),
+        top,
+        maximize,
+        fix_first,
+    )
+
+
+def _square(matrix: Any, name: str) -> "np.ndarray":
+    """Check that `matrix` is a non-empty square array and return it, with
+    integers widened so that the deltas cannot wrap around."""
+    import numpy as np
+
+    matrix = np.asarray(matrix)
+    if matrix.ndim != 2 or matrix.shape[0] != matrix.shape[1] or not matrix.size:
+        raise ValueError(f"{name} must be a non-empty square matrix")
+    if matrix.dtype.kind in "biu":
+        matrix = matrix.astype(np.promote_types(matrix.dtype, np.int64))
+    return matrix
+
+
+def _cost_chunks(
+    n: int, full: Any, deltas: Optional[Any], fix_first: bool, chunk_size: int
+) -> Generator[tuple["np.ndarray", "np.ndarray"], None, None]:
+    """Walk the permutations in SJT order and accumulate the costs.
+
+    `full(perms)` evaluates whole rows of permutations and `deltas(prev, x)`
+    the changes when positions `x` and `x + 1` of the rows `prev` swap. If
+    `deltas` is None, every permutation is evaluated with `full`.
+    """
+    import numpy as np
+
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+    m = n - 1 if fix_first else n
+    dtype = np.uint8 if n <= 256 else np.int64
+    out = np.empty((chunk_size, n), dtype=dtype)
+    out[:, 0] = 0
+    perms = out[:, 1:] if fix_first else out
+    # swap r leads from permutation r to r + 1, so it is aligned with the rows
+    swaps = sjt_swaps_chunks(m, chunk_size, dtype=np.intp)
+    pending = np.empty(0, dtype=np.intp)
+    skip = 0  # the swap into the first row of a later batch is not needed
+    first = 0
+    for batch in sjt2_batches(m, out=perms) if m else [perms[:1]]:
+        if fix_first:
+            batch += 1  # the other elements are 1, ..., n - 1
+        rows = out[: len(batch)]
+        if deltas is None:
+            costs = full(rows)
+        else:
+            end = skip + len(batch) - 1
+            while len(pending) < end:
+                pending = np.concatenate((pending, next(swaps)))
+            x = pending[skip:end] + fix_first
+            pending = pending[end:]
+            skip = 1
+            costs = np.cumsum(np.concatenate((full(rows[:1]), deltas(rows[:-1], x))))
+        yield np.arange(first, first + len(batch), dtype=np.int64), costs
+        first += len(batch)
+
+
+def _best_perms(
+    chunks: Any, n: int, top: int, maximize: bool, fix_first: bool
+) -> tuple["np.ndarray", "np.ndarray"]:
+    """Keep the `top` best `(ranks, costs)` over all chunks, best first, and
+    turn the ranks into permutations of `n` elements.
+    """
+    import numpy as np
+
+    ranks, costs = best_of(chunks, top, maximize)
+    perms = np.empty((len(ranks), n), dtype=np.intp)
+    for row, rank in zip(perms, ranks.tolist()):
+        if fix_first:
+            row[0] = 0
+            row[1:] = sjt_unrank(n - 1, rank)
+            row[1:] += 1
+        else:
+            row[:] = sjt_unrank(n, rank)
+    return perms, costs
+
+
+if __name__ == "__main__":
+    import doctest
+
+    doctest.testmod()
@@ -0,0 +1,154 @@
+"""
+Exhaustive SAT Evaluation in Gray Code Order
+
+This code brute-forces small boolean formulas in conjunctive normal form
+(CNF), i.e. an AND of clauses where each clause is an OR of literals. It
+can list every satisfying assignment or just count them.
+
+The formula is given in a compact CSR-like form, as used for sparse
+matrices. Literals follow the DIMACS convention: variable v (numbered from
+1 to n) appears as v when positive and as -v when negated. All literals are
+stored back to back in one array, and clause c consists of
+
+    literals[indptr[c] : indptr[c + 1]]
+
+The helper cnf_to_csr builds these two arrays from a list of clauses.
+
+The assignments are visited in binary reflected gray code order, following
+the flips of brgc_gen in gray_code, so exactly one variable changes from one
+assignment to the next. For each clause the code keeps the number of its
+literals that are currently true, and the number of clauses for which this
+count is zero. When variable v flips, only the clauses containing v are
+touched: the counts of the clauses where the literal became true go up, the
+others go down, and the number of unsatisfied clauses is adjusted whenever
+a count moves between 0 and 1. Each step therefore costs O(occurrences of
+v) instead of O(number of clauses).
+
+An assignment is reported as a packed integer in which bit v - 1 holds the
+value of variable v, as in brgc_int.
+"""
+
+from typing import Generator, Sequence
+
+from ec_gen.gray_code import brgc_gen
+
+
+def cnf_to_csr(clauses: Sequence[Sequence[int]]) -> tuple[list[int], list[int]]:
+    """
+    The function `cnf_to_csr` converts a list of clauses into the CSR-like
+    form `(indptr, literals)`.
+
+    :param clauses: The clauses, each a sequence of DIMACS literals
+    :type clauses: Sequence[Sequence[int]]
+    :return: The pair `(indptr, literals)`.
+
+    Examples:
+        >>> cnf_to_csr([[1, -2], [2, 3, -1]])
+        ([0, 2, 5], [1, -2, 2, 3, -1])
+    """
+    indptr = [0]
+    literals: list[int] = []
+    for clause in clauses:
+        literals.extend(clause)
+        indptr.append(len(literals))
+    return indptr, literals
+
+
+def sat_gen(
+    n: int, indptr: Sequence[int], literals: Sequence[int]
+) -> Generator[int, None, None]:
+    """
+    The function `sat_gen` generates all satisfying assignments of a CNF
+    formula by walking the assignments in gray code order.
+
+    :param n: The parameter `n` represents the number of variables
+    :type n: int
+    :param indptr: The clause boundaries, of length (number of clauses) + 1
+    :type indptr: Sequence[int]
+    :param literals: The DIMACS literals of all clauses, back to back
+    :type literals: Sequence[int]
+    :return: The function `sat_gen` returns a generator object that yields
+              the satisfying assignments as packed integers.
+
+    Examples:
+        >>> indptr, literals = cnf_to_csr([[1, 2], [-1, -2], [2, 3]])
+        >>> for word in sat_gen(3, indptr, literals):
+        ...     print(f"{word:03b}")
+        ...
+        010
+        110
+        101
+    """
+    counts, pos_occ, neg_occ = _sat_setup(n, indptr, literals)
+    unsat = counts.count(0)
+    word = 0
+    if unsat == 0:
+        yield word
+    for j in brgc_gen(n, loopless=True):
+        word ^= 1 << j
+        if word >> j & 1:
+            rise, fall = pos_occ[j], neg_occ[j]
+        else:
+            rise, fall = neg_occ[j], pos_occ[j]
+        for c in rise:
+            counts[c] += 1
+            if counts[c] == 1:
+                unsat -= 1
+        for c in fall:
+            counts[c] -= 1
+            if counts[c] == 0:
+                unsat += 1
+        if unsat == 0:
+            yield word
+
+
+def sat_count(n: int, indptr: Sequence[int], literals: Sequence[int]) -> int:
+    """
+    The function `sat_count` counts the satisfying assignments of a CNF
+    formula.
+
+    :param n: The parameter `n` represents the number of variables
+    :type n: int
+    :param indptr: The clause boundaries, of length (number of clauses) + 1
+    :type indptr: Sequence[int]
+    :param literals: The DIMACS literals of all clauses, back to back
+    :type literals: Sequence[int]
+    :return: The number of models of the formula.
+
+    Examples:
+        >>> sat_count(3, *cnf_to_csr([[1, 2], [-1, -2], [2, 3]]))
+        3
+    """
+    cnt = 0
+    for _ in sat_gen(n, indptr, literals):
+        cnt += 1
+    return cnt
+
+
+def _sat_setup(
+    n: int, indptr: Sequence[int], literals: Sequence[int]
+) -> tuple[list[int], list[list[int]], list[list[int]]]:
+    """Count the true literals per clause for the all-false assignment, and
+    list the clauses in which each variable occurs positively or negatively.
+    """
+    num_clauses = len(indptr) - 1
+    counts = [0] * num_clauses
+    pos_occ: list[list[int]] = [[] for _ in range(n)]
+    neg_occ: list[list[int]] = [[] for _ in range(n)]
+    for c in range(num_clauses):
+        for lit in literals[indptr[c] : indptr[c + 1]]:
+            lit = int(lit)
+            if not 0 < abs(lit) <= n:
+                raise ValueError(f"literal {lit} out of range")
+            if lit > 0:
+                pos_occ[lit - 1].append(c)
+            else:
+                neg_occ[-lit - 1].append(c)
+                counts[c] += 1  # negative literals are true when all-false
+    return counts, pos_occ, neg_occ
+
+
+if __name__ == "__main__":
+    import doctest
+
+    doctest.testmod()
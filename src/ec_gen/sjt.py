@@ -30,6 +30,26 @@ right to left). This is achieved using two range objects: up and
 down. The functions yield positions where swaps should occur,
 alternating between these upward and downward movements.
 
+The recursion nests n - 1 generators, and every swap of a smaller element
+is passed up through the suspended frames above it. sjt_gen_loopless
+produces the same swaps with only two generators: the sweeps of the two
+largest elements are plain loops over ranges and precomputed lists, and the
+swaps of the other elements are found with Even's method (directions plus
+the inverse permutation) and focus pointers, in O(1) time per swap in the
+worst case. Both sjt_gen and PlainChanges accept loopless=True to use it.
+
+The order can also be entered in the middle, so that a sweep can be split
+across workers. sjt_rank and sjt_unrank convert between permutations and
+their positions, and sjt_gen accepts start and stop to resume the swap
+stream from any position after O(n) setup. With loopless=True the resumed
+stream comes from sjt_gen_loopless as well.
+
+For vectorized replay, sjt_swaps_array returns the whole swap sequence as
+a NumPy array (optionally cached on disk as a .npy file), and
+sjt_swaps_chunks yields it piece by piece. Both build the sequence for n
+from that for n - 1 as a 2D array of blocks, one block per pair of the
+smaller swaps, so no generator is run. NumPy is only needed for these two.
+
 An important aspect of the algorithm is that it generates permutations in a
 way that each new permutation differs from the previous one by just a single
 swap of adjacent elements. This property makes it efficient for certain
@@ -46,10 +66,21 @@ programming and mathematical applications where you need to consider all possibl
 arrangements of a set of items.
 """
 
-from typing import Generator
+import os
+import tempfile
+from itertools import islice
+from math import factorial
+from typing import TYPE_CHECKING, Any, Generator, Optional, Sequence
+
+from ec_gen._ranges import check_range
 
+if TYPE_CHECKING:
+    import numpy as np
 
-def sjt_gen(n: int) -> Generator[int, None, None]:
+
+def sjt_gen(
+    n: int, loopless: bool = False, start: int = 0, stop: Optional[int] = None
+) -> Generator[int, None, None]:
     """
     The function `sjt_gen` generates all permutations of length `n`
     using Steinhaus-Johnson-Trotter algorithm.
@@ -60,6 +91,16 @@ def sjt_gen(n: int) -> Generator[int, None, None]:
     :param n: The parameter `n` represents the number of elements
               in the permutation
     :type n: int
+    :param loopless: If true, the swaps are produced by `sjt_gen_loopless`
+              instead of the recursive generator, defaults to False
+    :type loopless: bool
+    :param start: The position in the swap sequence to start from. Swap
+              `r` turns the permutation `sjt_unrank(n, r)` into the next
+              one, defaults to 0
+    :type start: int
+    :param stop: The position in the swap sequence to stop before,
+              defaults to None (the end of the sequence, n!)
+    :type stop: Optional[int]
     :return: The function `sjt_gen` returns a generator object.
 
     Examples:
@@ -95,8 +136,22 @@ def sjt_gen(n: int) -> Generator[int, None, None]:
 
         >>> print("".join(perm))
         🍉🍌🍇🍏
+
+        >>> list(sjt_gen(4, start=5, stop=10))
+        [1, 2, 0, 2, 1]
     """
+    if start != 0 or stop is not None:
+        start, stop = check_range(start, stop, factorial(n) if n >= 2 else 0)
+        return _sjt_range(n, start, stop, loopless)
+    # the engines are returned rather than delegated to with `yield from`,
+    # which would add a frame switch to every swap
+    if loopless:
+        return sjt_gen_loopless(n)
+    return _sjt_recur(n)
+
 
+def _sjt_recur(n: int) -> Generator[int, None, None]:
+    """The swaps of `sjt_gen(n)`, recursively."""
     if n == 2:
         yield 0
         yield 0  # tricky part: return to the origin
@@ -104,7 +159,7 @@ def sjt_gen(n: int) -> Generator[int, None, None]:
 
     up_range = range(n - 1)
     down_range = range(n - 2, -1, -1)
-    gen = sjt_gen(n - 1)
+    gen = _sjt_recur(n - 1)
     for pos in gen:
         for idx in down_range:  # downward
             yield idx
@@ -114,12 +169,23 @@ def sjt_gen(n: int) -> Generator[int, None, None]:
         yield next(gen)  # tricky part
 
 
-def PlainChanges(n: int) -> Generator[int, None, None]:
+def _sjt_range(
+    n: int, start: int, stop: int, loopless: bool
+) -> Generator[int, None, None]:
+    """The swaps of `sjt_gen(n)` from position `start` to `stop`."""
+    gen = sjt_gen_loopless(n, True, start) if loopless else _sjt_from(n, start)
+    yield from islice(gen, stop - start)
+
+
+def PlainChanges(n: int, loopless: bool = False) -> Generator[int, None, None]:
     """Generate to swaps for Steinhaus-Johnson-Trotter algorithm (original method).
 
     :param n: The parameter `n` represents the number of elements in the
               permutation
     :type n: int
+    :param loopless: If true, the swaps are produced by `sjt_gen_loopless`
+              with `origin=False`, defaults to False
+    :type loopless: bool
     :return: The function `PlainChanges` returns a generator object.
 
     Examples:
@@ -155,11 +221,18 @@ def PlainChanges(n: int) -> Generator[int, None, None]:
         >>> print("".join(perm))
         🍌🍉🍇🍏
     """
+    if loopless:
+        return sjt_gen_loopless(n, origin=False)
+    return _plain_changes(n)
+
+
+def _plain_changes(n: int) -> Generator[int, None, None]:
+    """The swaps of `PlainChanges(n)`, recursively."""
     if n < 1:
         return
     up_range = range(n - 1)
     down_range = range(n - 2, -1, -1)
-    recur = PlainChanges(n - 1)
+    recur = _plain_changes(n - 1)
     try:
         while True:
             for pos in down_range:
@@ -172,6 +245,400 @@ def PlainChanges(n: int) -> Generator[int, None, None]:
         pass
 
 
+def sjt_gen_loopless(
+    n: int, origin: bool = True, start: int = 0
+) -> Generator[int, None, None]:
+    """
+    The function `sjt_gen_loopless` generates the same swaps as `sjt_gen`,
+    iteratively and with O(1) work per swap in the worst case.
+
+    The largest element sweeps down and up through the list with ranges,
+    as in `sjt_gen`, and the sweeps of the second largest one are read
+    from two precomputed lists. Only once per sweep of the second largest
+    element, the next swap of the other elements is taken from an inner
+    generator that uses Even's method: every element has a direction, and
+    the inverse permutation gives its position. Which element moves next
+    is the digit that changes in a reflected mixed-radix Gray code
+    (element `e` moves `e` times per sweep), and focus pointers find that
+    digit without a loop, as in `mrgc_gen`. Only two generators are ever
+    stacked, however large `n` is, and the result is slightly faster than
+    the recursive `sjt_gen`.
+
+    To start in the middle, the inner generator is set up from the ranks
+    of the smaller elements with `sjt_unrank`. The swaps up to the next
+    pass over the pairs below (at most 2n(n - 1) of them) are taken from
+    the recursive generator, and the loop takes over from there.
+
+    :param n: The parameter `n` represents the number of elements
+              in the permutation
+    :type n: int
+    :param origin: If false, the last swap, which returns to the original
+              permutation, is left out. This gives the `PlainChanges`
+              sequence, defaults to True
+    :type origin: bool
+    :param start: The position in the swap sequence to start from,
+              defaults to 0
+    :type start: int
+    :return: The function `sjt_gen_loopless` returns a generator object.
+
+    Examples:
+        >>> list(sjt_gen_loopless(3))
+        [1, 0, 1, 0, 1, 0]
+        >>> list(sjt_gen_loopless(6)) == list(sjt_gen(6))
+        True
+        >>> list(sjt_gen_loopless(6, origin=False)) == list(PlainChanges(6))
+        True
+        >>> list(sjt_gen_loopless(6, start=300)) == list(sjt_gen(6))[300:]
+        True
+    """
+    if start < 0:
+        raise ValueError("start must be non-negative")
+    if n < 4:
+        yield from _sjt_even(n, origin, start)
+        return
+    # every pass of the loop below takes 2n - 2 sweeps of the largest
+    # element, n swaps each, and two swaps of the inner generator
+    period = 2 * n * (n - 1)
+    passes = factorial(n - 2) // 2
+    done, offset = divmod(start, period)
+    if done >= passes:
+        return
+    if offset:
+        total = factorial(n) - (0 if origin else 1)
+        done += 1
+        yield from islice(_sjt_from(n, start), min(done * period, total) - start)
+        if done == passes:
+            return
+    down_range = range(n - 2, -1, -1)
+    up_range = range(n - 1)
+    # Each sweep of the largest element is followed by a swap of the
+    # smaller ones, shifted by one after a downward sweep. In every 2n - 2
+    # sweeps, these swaps are a downward sweep of the second largest
+    # element, one swap of the rest, an upward sweep and one more swap of
+    # the rest. The sweeps are fixed, and go into lists of pairs (one
+    # downward and one upward sweep of the largest element per pair).
+    down2 = [idx + 1 - (blk & 1) for blk, idx in enumerate(range(n - 3, -1, -1))]
+    up2 = [idx + (n + blk & 1) for blk, idx in enumerate(range(n - 2))]
+    odd = n & 1
+    if odd:
+        seg_a, mid = down2[:-1], down2[-1]
+        seg_b, tail = up2[:-1], up2[-1]
+    else:
+        seg_a, mid = down2, up2[0]
+        seg_b, tail = up2[1:-1], up2[-1]
+    pairs_a = list(zip(seg_a[::2], seg_a[1::2]))
+    pairs_b = list(zip(seg_b[::2], seg_b[1::2]))
+    rest = _sjt_even(n - 2, True, 2 * done).__next__
+    for left in range(passes - 1 - done, -1, -1):
+        for first, second in pairs_a:
+            for idx in down_range:  # downward
+                yield idx
+            yield first
+            for idx in up_range:  # upward
+                yield idx
+            yield second
+        for idx in down_range:
+            yield idx
+        yield mid if odd else rest() + 2
+        for idx in up_range:
+            yield idx
+        yield rest() + 1 if odd else mid
+        for first, second in pairs_b:
+            for idx in down_range:
+                yield idx
+            yield first
+            for idx in up_range:
+                yield idx
+            yield second
+        for idx in down_range:
+            yield idx
+        yield tail
+        for idx in up_range:
+            yield idx
+        if left:
+            yield rest()
+    if origin:
+        yield 0  # tricky part: return to the origin
+
+
+def _sjt_even(n: int, origin: bool, start: int = 0) -> Generator[int, None, None]:
+    """The swaps of `sjt_gen`: the sweeps of the largest element, with the
+    swaps of the other elements found by Even's method in between.
+
+    The stream starts at swap `start`. After `block` swaps of the other
+    elements, element `e` has made `rank % (e + 1)` steps of its sweep,
+    where `rank` is the rank of the elements `0 .. e` among themselves.
+    A digit whose element has finished its sweep is passive, and the focus
+    pointer in front of a run of passive digits points past the run.
+    """
+    if n < 2:
+        return
+    down_range = range(n - 2, -1, -1)
+    up_range = range(n - 1)
+    # the other elements 0 .. m - 1, with element m - 1 - j driven by digit j
+    m = n - 1
+    block, step = divmod(start, n)
+    if block >= factorial(m):
+        return
+    perm = sjt_unrank(m, block)
+    inv = [0] * m
+    for pos, elem in enumerate(perm):
+        inv[elem] = pos
+    digit = [0] * m
+    sign = [1] * m  # 1: the element moves to the left
+    passive = [False] * m
+    rank = block
+    for j in range(m - 1):
+        elem = m - 1 - j
+        rank, moved = divmod(rank, elem + 1)
+        # steps to the left (sign 1) while the smaller elements are at an
+        # even rank; the sign turns as soon as the sweep is over
+        digit[j] = moved if rank & 1 == 0 else elem - moved
+        passive[j] = moved == elem
+        if (rank & 1) != passive[j]:
+            sign[j] = -1
+    focus = list(range(m))
+    for j in range(m - 1, 0, -1):
+        if passive[j - 1]:
+            focus[j - 1] = focus[j] if passive[j] else j
+            focus[j] = j
+    sweep, shift = (up_range, 0) if block & 1 else (down_range, 1)
+    sweep = sweep[step:]
+    while True:
+        for idx in sweep:
+            yield idx
+        j = focus[0]
+        focus[0] = 0
+        if j == m - 1:
+            if origin:
+                yield 0  # tricky part: return to the origin
+            return
+        elem = m - 1 - j
+        pos = inv[elem]
+        other_pos = pos - sign[j]
+        other = perm[other_pos]
+        perm[other_pos], perm[pos] = elem, other
+        inv[elem], inv[other] = other_pos, pos
+        digit[j] += sign[j]
+        if digit[j] == 0 or digit[j] == elem:
+            sign[j] = -sign[j]
+            focus[j] = focus[j + 1]
+            focus[j + 1] = j + 1
+        yield min(pos, other_pos) + shift
+        sweep, shift = (up_range, 0) if shift else (down_range, 1)
+
+
+def sjt_rank(perm: Sequence[int]) -> int:
+    """
+    The function `sjt_rank` returns the position of a permutation in the
+    order generated by `sjt_gen`, starting from `list(range(n))`.
+
+    The largest element sweeps down through the positions while the rest
+    is at an even rank, and up while it is at an odd rank. So the rank is
+    `n` times the rank of the permutation without the largest element,
+    plus the number of steps the largest element has taken in its sweep.
+
+    :param perm: A permutation of `0, 1, ..., n - 1`
+    :type perm: Sequence[int]
+    :return: The position `r` such that `sjt_unrank(n, r)` gives back
+              `perm`.
+
+    Examples:
+        >>> sjt_rank([0, 1, 2, 3]), sjt_rank([3, 0, 1, 2]), sjt_rank([0, 2, 1, 3])
+        (0, 3, 7)
+    """
+    rest = list(perm)
+    if sorted(rest) != list(range(len(rest))):
+        raise ValueError("perm must be a permutation of 0, 1, ..., n - 1")
+    # (number of elements, position of the largest one), largest first
+    steps = []
+    for n in range(len(rest), 1, -1):
+        pos = rest.index(n - 1)
+        del rest[pos]
+        steps.append((n, pos))
+    rank = 0
+    for n, pos in reversed(steps):
+        rank = n * rank + (pos if rank & 1 else n - 1 - pos)
+    return rank
+
+
+def sjt_unrank(n: int, rank: int) -> list[int]:
+    """
+    The function `sjt_unrank` returns the permutation at a given position
+    in the order generated by `sjt_gen`, starting from `list(range(n))`.
+
+    :param n: The parameter `n` represents the number of elements
+              in the permutation
+    :type n: int
+    :param rank: The position in the order, from 0 to n! - 1
+    :type rank: int
+    :return: The permutation as a list of `0, 1, ..., n - 1`.
+
+    Examples:
+        >>> sjt_unrank(4, 3), sjt_unrank(4, 7)
+        ([3, 0, 1, 2], [0, 2, 1, 3])
+    """
+    if not 0 <= rank < factorial(n):
+        raise ValueError("rank out of range")
+    # the ranks of the permutations of the smaller elements
+    ranks = []
+    for i in range(n, 1, -1):
+        ranks.append(rank)
+        rank //= i
+    perm = [0]
+    for i, rank in zip(range(2, n + 1), reversed(ranks)):
+        step = rank % i
+        perm.insert(step if rank // i & 1 else i - 1 - step, i - 1)
+    return perm[:n]
+
+
+def _sjt_from(n: int, start: int) -> Generator[int, None, None]:
+    """The swaps of `sjt_gen(n)` from position `start` on.
+
+    Swap `n * j + u` is step `u` of the sweep of the largest element in
+    block `j`, or the swap `j` of the smaller elements when `u == n - 1`
+    (shifted by one when the largest element sits in front).
+    """
+    if n == 2:
+        yield from (0, 0)[start:]
+        return
+    if n < 2:
+        return
+    block, step = divmod(start, n)
+    down_range = range(n - 2, -1, -1)
+    up_range = range(n - 1)
+    for pos in _sjt_from(n - 1, block):
+        sweep = up_range if block & 1 else down_range
+        if step:
+            sweep = sweep[step:]
+            step = 0
+        for idx in sweep:
+            yield idx
+        yield pos + 1 - (block & 1)
+        block += 1
+
+
+def sjt_swaps_array(
+    n: int, dtype: Any = "uint8", cache_dir: Optional[str] = None
+) -> "np.ndarray":
+    """
+    The function `sjt_swaps_array` returns the whole swap sequence of
+    `sjt_gen(n)` as a contiguous NumPy array.
+
+    The array is built level by level without running a generator. The
+    sequence for `n` is made of blocks of `2 * n` swaps, one block per pair
+    of swaps `(a, b)` of the sequence for `n - 1`: a downward sweep, `a +
+    1`, an upward sweep and `b`. All blocks are written at once into a 2D
+    array whose rows are the blocks.
+
+    :param n: The parameter `n` represents the number of elements
+              in the permutation
+    :type n: int
+    :param dtype: The integer dtype of the result, defaults to "uint8"
+    :param cache_dir: If given, the array is loaded from (or saved to) the
+              file `sjt_swaps_<n>.npy` in this directory, defaults to None.
+              A cache file of the wrong length is rebuilt, and a new one is
+              moved into place atomically, so the directory can be shared
+              between processes.
+    :type cache_dir: Optional[str]
+    :return: A NumPy array of length n! (0 if n < 2).
+
+    Examples:
+        >>> sjt_swaps_array(3).tolist()
+        [1, 0, 1, 0, 1, 0]
+        >>> sjt_swaps_array(7).tolist() == list(sjt_gen(7))
+        True
+    """
+    import numpy as np
+
+    if cache_dir is not None:
+        path = os.path.join(cache_dir, f"sjt_swaps_{n}.npy")
+        try:
+            cached = np.load(path)
+        except (OSError, ValueError, EOFError):  # missing or unreadable
+            cached = None
+        if cached is not None and cached.shape == (factorial(n) if n >= 2 else 0,):
+            return cached.astype(dtype, copy=False)
+    swaps = np.zeros(2 if n >= 2 else 0, dtype=dtype)
+    for i in range(3, n + 1):
+        swaps = _sjt_expand(swaps, i)
+    if cache_dir is not None:
+        # write to a temporary file first, so that other processes never
+        # see a partly written cache
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(suffix=".npy", dir=cache_dir)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, swaps)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+    return swaps
+
+
+def sjt_swaps_chunks(
+    n: int, chunk_size: int = 1 << 20, dtype: Any = "uint8"
+) -> Generator["np.ndarray", None, None]:
+    """
+    The function `sjt_swaps_chunks` generates the swap sequence of
+    `sjt_gen(n)` as a series of NumPy arrays, so that large `n` can be
+    replayed without holding all n! swaps in memory.
+
+    The sequence for a smaller `n` is kept as a whole, and each short piece
+    of it is expanded level by level, in vectorized form, into a piece of
+    the sequence for `n`. Concatenating the chunks gives
+    `sjt_swaps_array(n)`.
+
+    :param n: The parameter `n` represents the number of elements
+              in the permutation
+    :type n: int
+    :param chunk_size: The maximum number of swaps per chunk, defaults to
+              1048576
+    :type chunk_size: int
+    :param dtype: The integer dtype of the chunks, defaults to "uint8"
+    :return: The function `sjt_swaps_chunks` returns a generator object
+              that yields NumPy arrays.
+
+    Examples:
+        >>> for chunk in sjt_swaps_chunks(3, chunk_size=4):
+        ...     print(chunk.tolist())
+        ...
+        [1, 0, 1, 0]
+        [1, 0]
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+    base_n = min(n, _SJT_BASE_N)
+    base = sjt_swaps_array(base_n, dtype)
+    # every pair of base swaps grows into this many swaps
+    growth = 2 * factorial(n) // factorial(base_n)
+    piece = 2 * max(1, chunk_size // growth)
+    for first in range(0, len(base), piece):
+        swaps = base[first : first + piece]
+        for i in range(base_n + 1, n + 1):
+            swaps = _sjt_expand(swaps, i)
+        for start in range(0, len(swaps), chunk_size):
+            yield swaps[start : start + chunk_size]
+
+
+# `sjt_swaps_chunks` expands pieces of the sequence for this size
+_SJT_BASE_N = 9
+
+
+def _sjt_expand(prev: "np.ndarray", n: int) -> "np.ndarray":
+    """Build the swaps of `sjt_gen(n)` for the pairs of swaps `prev` of
+    `sjt_gen(n - 1)`."""
+    import numpy as np
+
+    blocks = np.empty((len(prev) // 2, 2 * n), dtype=prev.dtype)
+    blocks[:, : n - 1] = np.arange(n - 2, -1, -1)  # downward
+    blocks[:, n - 1] = prev[0::2] + 1
+    blocks[:, n : 2 * n - 1] = np.arange(n - 1)  # upward
+    blocks[:, 2 * n - 1] = prev[1::2]
+    return blocks.ravel()
+
+
 if __name__ == "__main__":
     import doctest
 
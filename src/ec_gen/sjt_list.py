@@ -1,4 +1,38 @@
-from typing import Generator
+"""
+Steinhaus-Johnson-Trotter Permutations as Lists
+
+This code lists all permutations of n elements in the order of the
+Steinhaus-Johnson-Trotter algorithm, one after the other, so that each
+permutation differs from the previous one by a swap of two neighbours.
+Unlike sjt_gen in sjt, which only reports the swaps, it hands out the
+permutations themselves.
+
+The function sjt2 builds every permutation as a new list, by inserting the
+largest element into each permutation of the smaller ones. This is simple,
+but it costs a few allocations and an O(n) copy per permutation.
+
+The function sjt2_buffer instead keeps a single array and applies the swaps
+of PlainChanges to it in place. It yields the same object every time, by
+default a read-only memoryview of the array, so nothing is allocated or
+copied per permutation. A caller that wants to keep a permutation must copy
+it, e.g. with tolist().
+
+The function sjt2_batches fills a 2D NumPy buffer with many consecutive
+permutations at once. Each group of n consecutive rows holds one permutation of
+the smaller elements, with the largest element moving through all n
+positions, so all rows of a batch are gathered with a single fancy-indexing
+operation from those smaller permutations, which in turn come in batches
+from the same function.
+"""
+
+from array import array
+from math import factorial
+from typing import TYPE_CHECKING, Any, Generator, Optional, Union
+
+from ec_gen.sjt import PlainChanges
+
+if TYPE_CHECKING:
+    import numpy as np
 
 
 def sjt2(n: int) -> Generator[list[int], None, None]:
@@ -39,6 +73,133 @@ def sjt2(n: int) -> Generator[list[int], None, None]:
             yield pi[:i] + [n - 1] + pi[i:]
 
 
+def sjt2_buffer(
+    n: int, readonly: bool = True
+) -> Generator[Union[memoryview, array], None, None]:
+    """
+    The function `sjt2_buffer` generates the same permutations as `sjt2`,
+    in a single array that is updated in place.
+
+    Note:
+        The same object is yielded every time and changes with the next
+        permutation. Copy it (e.g. with `tolist()`) to keep a permutation.
+
+    :param n: The parameter `n` represents the number of elements in the
+              permutation
+    :type n: int
+    :param readonly: If true, a read-only memoryview of the array is
+              yielded, otherwise the array itself, defaults to True
+    :type readonly: bool
+    :return: The function `sjt2_buffer` returns a generator object.
+
+    Examples:
+        >>> for p in sjt2_buffer(3):
+        ...     print(p.tolist())
+        [0, 1, 2]
+        [0, 2, 1]
+        [2, 0, 1]
+        [2, 1, 0]
+        [1, 2, 0]
+        [1, 0, 2]
+        >>> [bytes(p) for p in sjt2_buffer(2)]
+        [b'\\x00\\x01', b'\\x01\\x00']
+    """
+    buf = array("B" if n <= 256 else "L", range(n))
+    view = memoryview(buf).toreadonly() if readonly else buf
+    yield view
+    if n < 2:
+        return
+    for x in PlainChanges(n):
+        buf[x], buf[x + 1] = buf[x + 1], buf[x]
+        yield view
+
+
+def sjt2_batches(
+    n: int, batch_size: int = 1 << 12, out: Optional[Any] = None, dtype: Any = "uint8"
+) -> Generator["np.ndarray", None, None]:
+    """
+    The function `sjt2_batches` generates the same permutations as `sjt2`,
+    as the rows of a series of 2D NumPy arrays.
+
+    All batches are written into the same buffer, and each yielded array is
+    a view of its first rows. Copy a batch to keep it.
+
+    :param n: The parameter `n` represents the number of elements in the
+              permutation (positive)
+    :type n: int
+    :param batch_size: The number of permutations per batch, defaults to
+              4096. Ignored if `out` is given.
+    :type batch_size: int
+    :param out: A preallocated buffer of shape `(batch_size, n)`, defaults
+              to None (one is allocated)
+    :param dtype: The integer dtype of the allocated buffer, defaults to
+              "uint8"
+    :return: The function `sjt2_batches` returns a generator object that
+              yields NumPy arrays of shape `(rows, n)`.
+
+    Examples:
+        >>> for batch in sjt2_batches(3, batch_size=4):
+        ...     print(batch.tolist())
+        [[0, 1, 2], [0, 2, 1], [2, 0, 1], [2, 1, 0]]
+        [[1, 2, 0], [1, 0, 2]]
+    """
+    import numpy as np
+
+    if n < 1:
+        raise ValueError("n must be positive")
+    if out is None:
+        out = np.empty((batch_size, n), dtype=dtype)
+    elif out.ndim != 2 or out.shape[1] != n:
+        raise ValueError(f"out must have shape (batch_size, {n})")
+    batch_size = out.shape[0]
+    if batch_size < 1:
+        raise ValueError("batch_size must be positive")
+
+    # row i of a downward sweep has the largest element at position n-1-i,
+    # row i of an upward sweep at position i; the other positions are
+    # taken from the permutation of the smaller elements in order
+    cols = np.arange(n)
+    pos = np.concatenate([cols[::-1], cols])[:, None]
+    gather = np.where(cols < pos, cols, np.where(cols == pos, n - 1, cols - 1))
+
+    if n == 1:
+        out[0] = 0
+        yield out[:1]
+        return
+    # the permutations of the smaller elements, one per sweep, in batches
+    smaller = sjt2_batches(n - 1, batch_size // n + 1, dtype=out.dtype)
+    rest = next(smaller)
+    last = np.empty(n, dtype=out.dtype)  # the sweep that may straddle batches
+    consumed = 0  # the number of sweeps started so far
+    total = factorial(n)
+    first = 0
+    while first < total:
+        cnt = min(batch_size, total - first)
+        sweep0, offset = divmod(first, n)
+        num = (offset + cnt - 1) // n + 1
+        ext = np.empty((num, n), dtype=out.dtype)
+        ext[:, n - 1] = n - 1
+        i = 0
+        if sweep0 < consumed:
+            ext[0] = last
+            i = 1
+        while i < num:
+            if len(rest) == 0:
+                rest = next(smaller)
+            step = min(num - i, len(rest))
+            ext[i : i + step, : n - 1] = rest[:step]
+            rest = rest[step:]
+            i += step
+        consumed = sweep0 + num
+        last[:] = ext[num - 1]
+        local = np.arange(offset, offset + cnt)
+        sweep = local // n
+        rows = ((sweep + sweep0) & 1) * n + local % n
+        out[:cnt] = ext[sweep[:, None], gather[rows]]
+        yield out[:cnt]
+        first += cnt
+
+
 if __name__ == "__main__":
     import doctest
 
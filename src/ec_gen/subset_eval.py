@@ -0,0 +1,459 @@
+"""
+Incremental Subset Objectives in Gray Code Order
+
+This code evaluates an objective function over all 2^n subsets of n items,
+which is the core of exhaustive search problems such as subset selection or
+small QUBO (quadratic unconstrained binary optimization) instances. A subset
+is represented by a binary word x, where x[i] is 1 if item i is in the
+subset.
+
+The objective is made of an additive part and an optional pairwise part:
+
+    f(x) = sum_i w[i] x[i] + sum_i sum_j Q[i][j] x[i] x[j]
+
+Several weight vectors can be given at once, as the rows of a 2D array.
+They share the pairwise matrix and are evaluated side by side.
+
+The subsets are visited in binary reflected gray code order, the same order
+as brgc in gray_code. Since exactly one bit j changes from one subset to the
+next, the objective changes by
+
+    delta = s * (w[j] + Q[j][j] + sum_{i != j} (Q[i][j] + Q[j][i]) x[i])
+
+where s is +1 if item j enters the subset and -1 if it leaves. Instead of
+applying these updates one at a time in Python, the code handles a whole
+chunk of consecutive subsets at once: the flips and signs of the chunk are
+computed in vectorized form, the deltas are gathered with NumPy, and the
+running objective is a cumulative sum. The words and flips of each chunk
+come from brgc_batches and brgc_flips_chunks. Only the first subset of
+each chunk is evaluated from scratch.
+
+On top of this, subset_best keeps the best few subsets, and
+subset_threshold streams every subset whose objective passes a threshold.
+Subsets are reported as packed integers, where bit i stands for item i,
+exactly as in brgc_int.
+
+Selection problems such as facility location or max-diversity ask for
+subsets of exactly k items instead. ksubset_objective_chunks visits them
+in the revolving-door order of emk in combin, where one item leaves and one
+enters at each step. For an additive objective the change is simply
+w[added] - w[removed]. With a distance matrix D, whose upper triangle gives
+the value of each pair, the change also includes the distances from the
+added item to the items that stay, minus those from the removed item. The
+chunks are driven by the swap table of emk_comb_gen: the subsets are kept
+as packed words and, since the revolving door is homogeneous, as the
+sorted lists of their k items, so that each step gathers only O(k)
+distances. The deltas are again accumulated with a cumulative sum, and
+ksubset_best and ksubset_threshold mirror subset_best and
+subset_threshold.
+
+NumPy is required for everything in this module.
+"""
+
+import math
+from typing import TYPE_CHECKING, Any, Generator, Iterable, Optional
+
+from ec_gen.combin import EmkSwapCache, comb, emk_swap_reader
+from ec_gen.gray_code import brgc_batches, brgc_flips_chunks
+from ec_gen.topk import best_of
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+def subset_objective_chunks(
+    weights: Any, pairwise: Any = None, chunk_size: int = 1 << 16
+) -> Generator[tuple["np.ndarray", "np.ndarray"], None, None]:
+    """
+    The function `subset_objective_chunks` evaluates the objective of every
+    subset, in binary reflected gray code order, one chunk at a time.
+
+    :param weights: The additive weights, an array of shape `(n,)`, or of
+              shape `(m, n)` for `m` weight vectors at once
+    :param pairwise: An optional `(n, n)` array `Q` adding
+              `sum_i sum_j Q[i][j] x[i] x[j]` to the objective,
+              defaults to None
+    :param chunk_size: The maximum number of subsets per chunk, defaults to
+              65536
+    :type chunk_size: int
+    :return: The function `subset_objective_chunks` returns a generator
+              object that yields pairs `(words, values)`. `words` is a
+              `uint64` array of packed subsets, and `values` has shape
+              `(len(words),)`, or `(len(words), m)` for 2D weights.
+
+    Examples:
+        >>> for words, values in subset_objective_chunks([1, 2, 4], chunk_size=4):
+        ...     print(words.tolist(), values.tolist())
+        ...
+        [0, 1, 3, 2] [0, 1, 3, 2]
+        [6, 7, 5, 4] [6, 7, 5, 4]
+    """
+    import numpy as np
+
+    weights = np.asarray(weights)
+    n = weights.shape[-1]
+    if not 0 <= n <= 63:
+        raise ValueError("the number of items must be between 0 and 63")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+    # work with m weight vectors as columns: shape (n, m), also for n = 0
+    weight_cols = weights.reshape(math.prod(weights.shape[:-1]), n).T
+    if pairwise is not None:
+        pairwise = np.asarray(pairwise)
+        if pairwise.shape != (n, n):
+            raise ValueError("pairwise must be an n x n matrix")
+        dtype = np.result_type(weights, pairwise)
+        sym = pairwise + pairwise.T
+        # delta of item j entering an empty neighbourhood: w[j] + Q[j][j]
+        base = weight_cols + np.diag(pairwise)[:, None]
+    else:
+        dtype = weights.dtype
+        base = weight_cols
+    shifts = np.arange(n, dtype=np.uint64)
+    no_flips = np.empty(0, dtype=np.intp)
+    start = 0
+    for words in brgc_batches(n, chunk_size):
+        stop = start + len(words)
+        bits = ((words[:, None] >> shifts) & np.uint64(1)).astype(dtype)
+        # evaluate the first subset of the chunk from scratch
+        first = weight_cols.T @ bits[0]
+        if pairwise is not None:
+            first = first + bits[0] @ pairwise @ bits[0]
+        # the flips leading to rows 1, 2, ... of the chunk
+        flips = next(
+            brgc_flips_chunks(n, chunk_size, np.intp, start, stop - 1), no_flips
+        )
+        rows = np.arange(1, stop - start)
+        signs = 2 * bits[rows, flips] - 1
+        deltas = base[flips]
+        if pairwise is not None:
+            # sum_{i != j} S[j][i] x[i]; bit j is excluded by subtracting it
+            field = np.einsum("kn,kn->k", sym[flips], bits[1:])
+            field -= sym[flips, flips] * bits[rows, flips]
+            deltas = deltas + field[:, None]
+        values = np.empty((stop - start, weight_cols.shape[1]), dtype=dtype)
+        values[0] = first
+        np.cumsum(signs[:, None] * deltas, axis=0, out=values[1:])
+        values[1:] += first
+        start = stop
+        yield words, (values[:, 0] if weights.ndim == 1 else values)
+
+
+def subset_best(
+    weights: Any,
+    pairwise: Any = None,
+    top: int = 1,
+    maximize: bool = False,
+    chunk_size: int = 1 << 16,
+) -> tuple["np.ndarray", "np.ndarray"]:
+    """
+    The function `subset_best` finds the subsets with the best objective
+    values by exhaustive search in gray code order.
+
+    :param weights: The additive weights, an array of shape `(n,)`, or of
+              shape `(m, n)` for `m` weight vectors at once
+    :param pairwise: An optional `(n, n)` array `Q` adding
+              `sum_i sum_j Q[i][j] x[i] x[j]` to the objective,
+              defaults to None
+    :param top: The number of subsets to keep, defaults to 1
+    :type top: int
+    :param maximize: If true, keep the largest values instead of the
+              smallest ones, defaults to False
+    :type maximize: bool
+    :param chunk_size: The number of subsets evaluated per vectorized step,
+              defaults to 65536
+    :type chunk_size: int
+    :return: A pair `(words, values)` sorted from best to worst. Both have
+              shape `(top,)`, or `(m, top)` for 2D weights, where row `i`
+              holds the best subsets for weight vector `i`.
+
+    Examples:
+        >>> pairwise = [[0, 0, 5, 0], [0] * 4, [0] * 4, [0] * 4]
+        >>> words, values = subset_best([3, -2, -4, 1], pairwise, top=2)
+        >>> words.tolist(), values.tolist()
+        ([6, 14], [-6, -5])
+    """
+    import numpy as np
+
+    return best_of(
+        subset_objective_chunks(weights, pairwise, chunk_size),
+        top,
+        maximize,
+        multi=np.ndim(weights) != 1,
+    )
+
+
+def subset_threshold(
+    weights: Any,
+    threshold: Any,
+    pairwise: Any = None,
+    maximize: bool = False,
+    chunk_size: int = 1 << 16,
+) -> Generator[tuple["np.ndarray", "np.ndarray"], None, None]:
+    """
+    The function `subset_threshold` streams the subsets whose objective is
+    at most `threshold` (at least, if `maximize` is true), in gray code
+    order.
+
+    For 2D weights a subset is reported if any of the weight vectors passes
+    the threshold; `threshold` may be a scalar or one value per vector.
+
+    :param weights: The additive weights, an array of shape `(n,)`, or of
+              shape `(m, n)` for `m` weight vectors at once
+    :param threshold: The threshold on the objective value
+    :param pairwise: An optional `(n, n)` array `Q` adding
+              `sum_i sum_j Q[i][j] x[i] x[j]` to the objective,
+              defaults to None
+    :param maximize: If true, report values at least `threshold` instead of
+              at most, defaults to False
+    :type maximize: bool
+    :param chunk_size: The number of subsets evaluated per vectorized step,
+              defaults to 65536
+    :type chunk_size: int
+    :return: The function `subset_threshold` returns a generator object that
+              yields pairs `(words, values)` of the passing subsets, one
+              pair per chunk that has any.
+
+    Examples:
+        >>> for words, values in subset_threshold([1, 2, 4], 2):
+        ...     print(words.tolist(), values.tolist())
+        ...
+        [0, 1, 2] [0, 1, 2]
+    """
+    yield from _threshold(
+        subset_objective_chunks(weights, pairwise, chunk_size), threshold, maximize
+    )
+
+
+def ksubset_objective_chunks(
+    weights: Any,
+    k: int,
+    distances: Any = None,
+    chunk_size: int = 1 << 16,
+    cache: Optional[EmkSwapCache] = None,
+) -> Generator[tuple["np.ndarray", "np.ndarray"], None, None]:
+    """
+    The function `ksubset_objective_chunks` evaluates the objective of every
+    subset of exactly `k` items, in the revolving-door order of `emk`, one
+    chunk at a time.
+
+    :param weights: The additive weights, an array of shape `(n,)`, or of
+              shape `(m, n)` for `m` weight vectors at once
+    :param k: The number of items in each subset
+    :type k: int
+    :param distances: An optional `(n, n)` array `D` adding
+              `sum_{i < j} D[i][j] x[i] x[j]` to the objective (only the
+              upper triangle is used), defaults to None
+    :param chunk_size: The maximum number of subsets per chunk, defaults to
+              65536
+    :type chunk_size: int
+    :param cache: If given, the swaps are read from (and stored in) this
+              `EmkSwapCache`, defaults to None
+    :type cache: Optional[EmkSwapCache]
+    :return: The function `ksubset_objective_chunks` returns a generator
+              object that yields pairs `(words, values)`. `words` is a
+              `uint64` array of packed subsets, and `values` has shape
+              `(len(words),)`, or `(len(words), m)` for 2D weights.
+
+    Examples:
+        >>> for words, values in ksubset_objective_chunks([1, 2, 4, 8], 2):
+        ...     print(words.tolist(), values.tolist())
+        ...
+        [3, 5, 6, 10, 9, 12] [3, 5, 6, 10, 9, 12]
+    """
+    import numpy as np
+
+    weights = np.asarray(weights)
+    n = weights.shape[-1]
+    if not 0 <= n <= 64:
+        raise ValueError("the number of items must be between 0 and 64")
+    if not 0 <= k <= n:
+        raise ValueError("k must be between 0 and the number of items")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+    # work with m weight vectors as columns: shape (n, m), also for n = 0
+    weight_cols = weights.reshape(math.prod(weights.shape[:-1]), n).T
+    if distances is not None:
+        distances = np.asarray(distances)
+        if distances.shape != (n, n):
+            raise ValueError("distances must be an n x n matrix")
+        dtype = np.result_type(weights, distances)
+        upper = np.triu(distances, 1)
+        sym = upper + upper.T
+    else:
+        dtype = weights.dtype
+    one = np.uint64(1)
+    # popcount of the bytes 0..255, for the slots in the sorted subsets
+    byte_count = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1)
+    byte_count = byte_count.sum(axis=1, dtype=np.uint8)
+    total = comb(n, k)
+    read_swaps = emk_swap_reader(n, k, cache)
+    word = np.uint64((1 << k) - 1)  # the subset before the next swap
+    for first in range(0, total, chunk_size):
+        count = min(chunk_size, total - first)
+        # row r of the chunk is subset first + r, reached by swap first + r - 1
+        skip = 1 if first == 0 else 0
+        pairs = read_swaps(count - skip)
+        pos_x, pos_y = pairs[0::2], pairs[1::2]
+        toggles = (one << pos_x.astype(np.uint64)) | (one << pos_y.astype(np.uint64))
+        words = np.empty(count, dtype=np.uint64)
+        words[0] = word
+        np.bitwise_xor.accumulate(toggles, out=words[skip:])
+        words[skip:] ^= word
+        word = words[-1]
+        # evaluate the first subset of the chunk from scratch
+        bits = (words[0] >> np.arange(n, dtype=np.uint64)) & one
+        first_row = bits.astype(dtype)
+        values = np.empty((count, weight_cols.shape[1]), dtype=dtype)
+        values[0] = weight_cols.T @ first_row
+        if distances is not None:
+            values[0] += first_row @ upper @ first_row
+        # one item leaves and one enters between consecutive rows
+        prev = words[:-1]
+        pos_x, pos_y = pos_x[1 - skip :], pos_y[1 - skip :]
+        leaves = ((prev >> pos_x.astype(np.uint64)) & one).astype(bool)
+        removed = np.where(leaves, pos_x, pos_y)
+        added = np.where(leaves, pos_y, pos_x)
+        deltas = weight_cols[added] - weight_cols[removed]
+        if distances is not None:
+            # the revolving door is homogeneous, so `added` takes the slot of
+            # `removed` in the sorted subset: the number of items below it
+            below = prev & ((one << removed.astype(np.uint64)) - one)
+            slot = byte_count[below.view(np.uint8).reshape(-1, 8)].sum(axis=1)
+            # the sorted items of every row, by forward-filling each slot
+            chosen = np.empty((count, k), dtype=np.intp)
+            steps = np.arange(count - 1)
+            for col, item in enumerate(np.flatnonzero(bits)):
+                last = np.maximum.accumulate(np.where(slot == col, steps, -1))
+                chosen[0, col] = item
+                chosen[1:, col] = np.where(last < 0, item, added[last])
+            # O(k) per step: the distances to the items of the old subset
+            chosen = chosen[:-1]
+            field = sym[added[:, None], chosen] - sym[removed[:, None], chosen]
+            field = field.sum(axis=1) - sym[added, removed]
+            deltas = deltas + field[:, None]
+        np.cumsum(deltas, axis=0, out=values[1:])
+        values[1:] += values[0]
+        yield words, (values[:, 0] if weights.ndim == 1 else values)
+
+
+def ksubset_best(
+    weights: Any,
+    k: int,
+    distances: Any = None,
+    top: int = 1,
+    maximize: bool = False,
+    chunk_size: int = 1 << 16,
+    cache: Optional[EmkSwapCache] = None,
+) -> tuple["np.ndarray", "np.ndarray"]:
+    """
+    The function `ksubset_best` finds the subsets of exactly `k` items with
+    the best objective values by exhaustive search in `emk` order.
+
+    :param weights: The additive weights, an array of shape `(n,)`, or of
+              shape `(m, n)` for `m` weight vectors at once
+    :param k: The number of items in each subset
+    :type k: int
+    :param distances: An optional `(n, n)` array `D` adding
+              `sum_{i < j} D[i][j] x[i] x[j]` to the objective (only the
+              upper triangle is used), defaults to None
+    :param top: The number of subsets to keep, defaults to 1
+    :type top: int
+    :param maximize: If true, keep the largest values instead of the
+              smallest ones, defaults to False
+    :type maximize: bool
+    :param chunk_size: The number of subsets evaluated per vectorized step,
+              defaults to 65536
+    :type chunk_size: int
+    :param cache: If given, the swaps are read from (and stored in) this
+              `EmkSwapCache`, defaults to None
+    :type cache: Optional[EmkSwapCache]
+    :return: A pair `(words, values)` sorted from best to worst. Both have
+              shape `(top,)`, or `(m, top)` for 2D weights, where row `i`
+              holds the best subsets for weight vector `i`.
+
+    Examples:
+        >>> distances = [[0, 4, 1, 3], [4, 0, 2, 5], [1, 2, 0, 6], [3, 5, 6, 0]]
+        >>> words, values = ksubset_best([0] * 4, 3, distances, maximize=True)
+        >>> words.tolist(), values.tolist()
+        ([14], [13])
+    """
+    import numpy as np
+
+    return best_of(
+        ksubset_objective_chunks(weights, k, distances, chunk_size, cache),
+        top,
+        maximize,
+        multi=np.ndim(weights) != 1,
+    )
+
+
+def ksubset_threshold(
+    weights: Any,
+    k: int,
+    threshold: Any,
+    distances: Any = None,
+    maximize: bool = False,
+    chunk_size: int = 1 << 16,
+    cache: Optional[EmkSwapCache] = None,
+) -> Generator[tuple["np.ndarray", "np.ndarray"], None, None]:
+    """
+    The function `ksubset_threshold` streams the subsets of exactly `k`
+    items whose objective is at most `threshold` (at least, if `maximize` is
+    true), in `emk` order.
+
+    For 2D weights a subset is reported if any of the weight vectors passes
+    the threshold; `threshold` may be a scalar or one value per vector.
+
+    :param weights: The additive weights, an array of shape `(n,)`, or of
+              shape `(m, n)` for `m` weight vectors at once
+    :param k: The number of items in each subset
+    :type k: int
+    :param threshold: The threshold on the objective value
+    :param distances: An optional `(n, n)` array `D` adding
+              `sum_{i < j} D[i][j] x[i] x[j]` to the objective (only the
+              upper triangle is used), defaults to None
+    :param maximize: If true, report values at least `threshold` instead of
+              at most, defaults to False
+    :type maximize: bool
+    :param chunk_size: The number of subsets evaluated per vectorized step,
+              defaults to 65536
+    :type chunk_size: int
+    :param cache: If given, the swaps are read from (and stored in) this
+              `EmkSwapCache`, defaults to None
+    :type cache: Optional[EmkSwapCache]
+    :return: The function `ksubset_threshold` returns a generator object
+              that yields pairs `(words, values)` of the passing subsets, one
+              pair per chunk that has any.
+
+    Examples:
+        >>> for words, values in ksubset_threshold([1, 2, 4, 8], 2, 9, maximize=True):
+        ...     print(words.tolist(), values.tolist())
+        ...
+        [10, 9, 12] [10, 9, 12]
+    """
+    yield from _threshold(
+        ksubset_objective_chunks(weights, k, distances, chunk_size, cache),
+        threshold,
+        maximize,
+    )
+
+
+def _threshold(
+    chunks: Iterable[tuple["np.ndarray", "np.ndarray"]],
+    threshold: Any,
+    maximize: bool,
+) -> Generator[tuple["np.ndarray", "np.ndarray"], None, None]:
+    """Filter the chunks down to the subsets that pass the threshold."""
+    for words, values in chunks:
+        passed = values >= threshold if maximize else values <= threshold
+        if passed.ndim == 2:
+            passed = passed.any(axis=1)
+        if passed.any():
+            yield words[passed], values[passed]
+
+
+if __name__ == "__main__":
+    import doctest
+
+    doctest.testmod()
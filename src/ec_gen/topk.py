@@ -0,0 +1,95 @@
+"""
+Top-k Selection over Chunks
+
+The exhaustive evaluators of this package, subset_eval and perm_eval, both
+produce their results as a stream of chunks: pairs (keys, values), where
+the keys identify the candidates (packed subsets or permutation ranks) and
+the values are their objectives. best_of keeps the best few candidates of
+such a stream without ever holding more than one chunk plus the current
+best ones in memory.
+
+Within a chunk the best candidates are found with numpy.argpartition,
+which takes linear time, and only the final few are sorted.
+
+NumPy is required for everything in this module.
+"""
+
+from typing import TYPE_CHECKING, Iterable, Optional
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+def best_of(
+    chunks: Iterable[tuple["np.ndarray", "np.ndarray"]],
+    top: int = 1,
+    maximize: bool = False,
+    multi: bool = False,
+) -> tuple["np.ndarray", "np.ndarray"]:
+    """
+    The function `best_of` keeps the `top` best `(keys, values)` over all
+    chunks, best first.
+
+    :param chunks: The pairs `(keys, values)`. `values` has shape
+              `(len(keys),)`, or `(len(keys), m)` for `m` objectives that
+              are ranked separately
+    :param top: The number of candidates to keep, defaults to 1
+    :type top: int
+    :param maximize: If true, keep the largest values instead of the
+              smallest ones, defaults to False
+    :type maximize: bool
+    :param multi: If true, the values have `m` columns, defaults to False
+    :type multi: bool
+    :return: A pair `(keys, values)` sorted from best to worst. Both have
+              shape `(top,)`, or `(m, top)` if `multi` is true, where row `i`
+              holds the best candidates for objective `i`. Fewer than `top`
+              are returned if the chunks hold fewer candidates.
+
+    Examples:
+        >>> import numpy as np
+        >>> chunks = [(np.array([5, 6, 7]), np.array([3, 1, 4])),
+        ...           (np.array([8, 9]), np.array([0, 2]))]
+        >>> keys, values = best_of(chunks, top=2)
+        >>> keys.tolist(), values.tolist()
+        ([8, 6], [0, 1])
+    """
+    import numpy as np
+
+    if top < 1:
+        raise ValueError("top must be positive")
+    best_keys: Optional[np.ndarray] = None
+    best_values: Optional[np.ndarray] = None
+    for keys, values in chunks:
+        # shape (m, len): one row per objective
+        values = np.atleast_2d(values.T)
+        keys = np.broadcast_to(keys, values.shape)
+        if best_keys is not None and best_values is not None:
+            values = np.concatenate((best_values, values), axis=1)
+            keys = np.concatenate((best_keys, keys), axis=1)
+        size = values.shape[1]
+        if size == 0:
+            continue
+        keep = min(top, size)
+        # no negation, which would overflow for unsigned values
+        if maximize:
+            idx = np.argpartition(values, size - keep, axis=1)[:, size - keep :]
+        else:
+            idx = np.argpartition(values, keep - 1, axis=1)[:, :keep]
+        best_values = np.take_along_axis(values, idx, axis=1)
+        best_keys = np.take_along_axis(keys, idx, axis=1)
+    if best_keys is None or best_values is None:
+        raise ValueError("chunks must hold at least one candidate")
+    order = np.argsort(best_values, axis=1, kind="stable")
+    if maximize:
+        order = order[:, ::-1]
+    best_values = np.take_along_axis(best_values, order, axis=1)
+    best_keys = np.take_along_axis(best_keys, order, axis=1)
+    if not multi:
+        return best_keys[0], best_values[0]
+    return best_keys, best_values
+
+
+if __name__ == "__main__":
+    import doctest
+
+    doctest.testmod()
@@ -0,0 +1,75 @@
+from math import comb as math_comb
+
+import pytest
+
+from ec_gen.binomial import BinomialTable, binomial
+
+
+def test_binomial_matches_math_comb() -> None:
+    for n in range(20):
+        for k in range(-2, n + 3):
+            expected = math_comb(n, k) if 0 <= k <= n else 0
+            assert binomial(n, k) == expected
+
+
+def test_binomial_large_n() -> None:
+    table = BinomialTable()
+    assert table(5000, 2) == 5000 * 4999 // 2
+    assert table.cache_info().items == 0
+
+
+def test_binomial_row() -> None:
+    table = BinomialTable()
+    for n in range(30):
+        assert table.row(n) == [math_comb(n, k) for k in range(n + 1)]
+    with pytest.raises(ValueError):
+        table.row(-1)
+
+
+def test_binomial_row_cache_hits() -> None:
+    table = BinomialTable()
+    row = table.row(10)
+    assert table.row(10) is row
+    assert table(10, 4) == 210
+    info = table.cache_info()
+    assert (info.hits, info.misses, info.rows, info.items) == (1, 1, 1, 11)
+    table.cache_clear()
+    assert table.cache_info() == (0, 0, 0, 0, 0, table.max_items)
+
+
+def test_binomial_eviction() -> None:
+    table = BinomialTable(max_items=25)
+    table.row(9)  # 10 items
+    table.row(10)  # 11 items
+    table.row(9)  # hit, now most recently used
+    table.row(5)  # 6 items: evicts row 10
+    info = table.cache_info()
+    assert (info.evictions, info.rows, info.items) == (1, 2, 16)
+    table.row(30)  # larger than the cap, not stored
+    assert table.cache_info().rows == 2
+    table.max_items = 10
+    info = table.cache_info()
+    assert (info.evictions, info.rows, info.items) == (2, 1, 6)
+
+
+def test_binomial_many() -> None:
+    np = pytest.importorskip("numpy")
+    ns = np.arange(67)[:, None]
+    ks = np.arange(-1, 69)[None, :]
+    result = binomial.many(ns, ks)
+    assert result.dtype == np.int64
+    expected = [
+        [math_comb(n, k) if 0 <= k <= n else 0 for k in range(-1, 69)]
+        for n in range(67)
+    ]
+    assert result.tolist() == expected
+
+
+def test_binomial_many_big() -> None:
+    np = pytest.importorskip("numpy")
+    result = binomial.many([100, 70, 5], [50, 71, 2])
+    assert result.dtype == object
+    assert result.tolist() == [math_comb(100, 50), 0, 10]
+    with pytest.raises(ValueError):
+        binomial.many([-1], [0])
+    assert binomial.many(np.zeros(0, dtype=int), 0).shape == (0,)
@@ -1,6 +1,27 @@
+import random
+import tracemalloc
+from typing import Optional
+
 import pytest
 
-from ec_gen.combin import comb, emk, emk_comb_gen
+from ec_gen.combin import (
+    EmkSwapCache,
+    comb,
+    emk,
+    emk_batches,
+    emk_bits,
+    emk_comb_gen,
+    emk_comb_gen_iter,
+    emk_index,
+    emk_index_gen,
+    emk_prune,
+    emk_rank,
+    emk_swap_reader,
+    emk_unrank,
+    multiset_comb,
+    multiset_comb_count,
+    multiset_comb_gen,
+)
 
 
 def test_comb_with_various_inputs() -> None:
@@ -112,3 +133,310 @@ def test_emk_comb_gen_edge_cases() -> None:
     gen = emk_comb_gen(2, 1)
     expected = [(0, 1)]
     assert list(gen) == expected
+
+
+@pytest.mark.parametrize("n", range(1, 13))
+def test_emk_comb_gen_iter(n: int) -> None:
+    for k in range(-1, n + 2):
+        assert list(emk_comb_gen_iter(n, k)) == list(emk_comb_gen(n, k))
+
+
+def test_emk_iterative() -> None:
+    result = ["".join(map(str, p)) for p in emk(4, 2, iterative=True)]
+    assert result == ["1100", "1010", "0110", "0101", "1001", "0011"]
+    assert list(emk_comb_gen(7, 3, iterative=True)) == list(emk_comb_gen(7, 3))
+
+
+def test_emk_swap_cache() -> None:
+    cache = EmkSwapCache()
+    for _ in range(3):
+        assert list(emk_comb_gen(10, 4, cache=cache)) == list(emk_comb_gen(10, 4))
+    info = cache.cache_info()
+    assert (info.hits, info.misses, info.entries) == (2, 1, 1)
+    assert info.nbytes == 2 * 2 * (comb(10, 4) - 1)
+    result = ["".join(map(str, p)) for p in emk(4, 2, cache=cache)]
+    assert result == ["1100", "1010", "0110", "0101", "1001", "0011"]
+    cache.cache_clear()
+    assert cache.cache_info() == (0, 0, 0, 0, 0, cache.max_bytes)
+
+
+def test_emk_swap_cache_eviction() -> None:
+    size = 2 * 2 * (comb(8, 3) - 1)
+    cache = EmkSwapCache(max_bytes=2 * size)
+    list(cache.gen(8, 3))
+    list(cache.gen(8, 5))
+    list(cache.gen(8, 3))  # (8, 5) is now the least recently used
+    list(cache.gen(7, 3))  # evicts (8, 5) to make room
+    list(cache.gen(8, 3))
+    info = cache.cache_info()
+    assert info.evictions == 1
+    assert info.entries == 2
+    assert info.nbytes <= info.max_bytes
+    assert (info.hits, info.misses) == (2, 3)
+    cache.max_bytes = 0
+    assert cache.cache_info().entries == 0
+
+
+@pytest.mark.parametrize("max_bytes", [8, 1 << 20])
+def test_emk_swap_cache_edge_ranges(max_bytes: int) -> None:
+    cache = EmkSwapCache(max_bytes=max_bytes)
+    total = comb(6, 3) - 1
+    ranges = [(0, -1), (0, None), (5, 3), (5, 5), (total, None), (total + 4, None)]
+    ranges += [(3, -2), (2, total + 10), (total - 1, -1)]
+    for start, stop in ranges:
+        expected = list(emk_comb_gen_iter(6, 3, start, stop))
+        assert list(cache.gen(6, 3, start, stop)) == expected
+    with pytest.raises(ValueError):
+        next(cache.gen(6, 3, -1))
+
+
+def test_emk_swap_cache_oversized() -> None:
+    cache = EmkSwapCache(max_bytes=8)
+    assert not cache.fits(6, 3)
+    assert list(cache.gen(6, 3)) == list(emk_comb_gen(6, 3))
+    assert list(cache.gen(6, 3, 4, 9)) == list(emk_comb_gen(6, 3))[4:9]
+    assert cache.cache_info()[:4] == (0, 2, 0, 0)
+
+
+def test_emk_swap_cache_oversized_memory() -> None:
+    cache = EmkSwapCache(max_bytes=1024)
+    tracemalloc.start()
+    try:
+        gen = cache.gen(26, 7)  # a table of about 2.6 MB
+        assert next(gen) == next(emk_comb_gen_iter(26, 7))
+        for _ in range(10000):
+            next(gen)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert peak < 64 * 1024
+    assert cache.cache_info().entries == 0
+
+
+def test_emk_index_gen_large_n_memory() -> None:
+    tracemalloc.start()
+    try:
+        gen = emk_index_gen(20000, 3)
+        for _ in range(30000):
+            next(gen)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert peak < 16 * 1024
+
+
+@pytest.mark.parametrize("n, k", [(6, 1), (7, 2), (8, 3), (9, 4), (10, 5), (9, 6)])
+def test_emk_rank_unrank(n: int, k: int) -> None:
+    for r, seq in enumerate(emk(n, k)):
+        subset = [i for i, v in enumerate(seq) if v]
+        assert emk_unrank(n, k, r) == subset
+        assert emk_rank(n, subset) == r
+
+
+def test_emk_unrank_invalid() -> None:
+    with pytest.raises(ValueError):
+        emk_unrank(6, 3, comb(6, 3))
+    with pytest.raises(ValueError):
+        emk_rank(6, [0, 6])
+
+
+@pytest.mark.parametrize("n, k", [(9, 1), (10, 4), (11, 5)])
+def test_emk_comb_gen_range_shards(n: int, k: int) -> None:
+    swaps = list(emk_comb_gen(n, k))
+    bounds = sorted({0, 3, len(swaps) // 2, len(swaps) - 1, len(swaps)})
+    shards = []
+    for start, stop in zip(bounds, bounds[1:]):
+        shards += list(emk_comb_gen(n, k, start=start, stop=stop))
+    assert shards == swaps
+
+
+def test_emk_range() -> None:
+    combs = [list(seq) for seq in emk(9, 4)]
+    assert [list(seq) for seq in emk(9, 4, start=17, stop=60)] == combs[17:60]
+    assert [list(seq) for seq in emk(9, 4, start=100)] == combs[100:]
+    assert list(emk(9, 4, start=5, stop=5)) == []
+
+
+def test_emk_swap_cache_range() -> None:
+    cache = EmkSwapCache()
+    swaps = list(emk_comb_gen(9, 4))
+    assert list(emk_comb_gen(9, 4, cache=cache, start=10, stop=40)) == swaps[10:40]
+
+
+def test_emk_bits() -> None:
+    prev = 0b1111
+    for (mask, delta), seq in zip(emk_bits(9, 4), emk(9, 4)):
+        assert mask == sum(v << i for i, v in enumerate(seq))
+        assert bin(mask).count("1") == 4
+        assert mask ^ delta == prev
+        assert delta == 0 or bin(delta).count("1") == 2
+        prev = mask
+    assert len(list(emk_bits(9, 4))) == comb(9, 4)
+
+
+def test_emk_bits_range() -> None:
+    masks = [mask for mask, _ in emk_bits(8, 3)]
+    assert [mask for mask, _ in emk_bits(8, 3, start=11, stop=30)] == masks[11:30]
+    assert list(emk_bits(5, 0)) == [(0, 0)]
+
+
+@pytest.mark.parametrize("batch_size", [1, 7, 64, 1000])
+def test_emk_batches(batch_size: int) -> None:
+    np = pytest.importorskip("numpy")
+    expected = [list(seq) for seq in emk(10, 4)]
+    batches = list(emk_batches(10, 4, batch_size=batch_size))
+    assert all(b.dtype == np.uint8 and len(b) <= batch_size for b in batches)
+    assert np.concatenate(batches).tolist() == expected
+
+
+def test_emk_batches_out_and_packed() -> None:
+    np = pytest.importorskip("numpy")
+    expected = np.array([list(seq) for seq in emk(11, 5)], dtype=np.uint8)
+    out = np.empty((50, 2), dtype=np.uint8)
+    rows = []
+    for batch in emk_batches(11, 5, batch_size=50, out=out, packed=True):
+        assert np.shares_memory(batch, out)
+        rows.append(batch.copy())
+    assert np.array_equal(np.concatenate(rows), np.packbits(expected, axis=1))
+    cache = EmkSwapCache()
+    batches = list(emk_batches(11, 5, batch_size=33, cache=cache))
+    assert np.array_equal(np.concatenate(batches), expected)
+    small = EmkSwapCache(max_bytes=64)  # too small, so the swaps are streamed
+    batches = list(emk_batches(11, 5, batch_size=33, cache=small))
+    assert np.array_equal(np.concatenate(batches), expected)
+    with pytest.raises(ValueError):
+        next(emk_batches(11, 5, batch_size=50, out=out))
+
+
+@pytest.mark.parametrize("n, k", [(3, 1), (8, 3), (9, 4), (16, 2), (17, 15)])
+def test_emk_batches_packed(n: int, k: int) -> None:
+    np = pytest.importorskip("numpy")
+    expected = np.packbits([list(seq) for seq in emk(n, k)], axis=1)
+    batches = list(emk_batches(n, k, batch_size=7, packed=True))
+    assert np.array_equal(np.concatenate(batches), expected)
+    out = np.empty((7, (n + 7) // 8), dtype=np.uint8)
+    rows = [batch.copy() for batch in emk_batches(n, k, 7, out=out, packed=True)]
+    assert np.array_equal(np.concatenate(rows), expected)
+
+
+@pytest.mark.parametrize("n, k", [(6, 1), (8, 2), (9, 3), (10, 4), (9, 8)])
+def test_emk_index(n: int, k: int) -> None:
+    expected = [[i for i, v in enumerate(seq) if v] for seq in emk(n, k)]
+    assert [list(chosen) for chosen in emk_index(n, k)] == expected
+    chosen = expected[0][:]
+    for removed, added, slot in emk_index_gen(n, k):
+        assert chosen[slot] == removed
+        chosen[slot] = added
+        assert chosen == sorted(chosen)
+    assert chosen == expected[-1]
+
+
+def test_emk_index_range() -> None:
+    expected = [list(chosen) for chosen in emk_index(12, 3)]
+    assert [list(c) for c in emk_index(12, 3, start=40, stop=90)] == expected[40:90]
+
+
+def test_emk_index_gen_large_n() -> None:
+    steps = list(emk_index_gen(2000, 2, start=1000, stop=1050))
+    assert len(steps) == 50
+
+
+@pytest.mark.parametrize("start", [5, 6, 7])
+def test_emk_index_gen_range_end(start: int) -> None:
+    assert list(emk_index_gen(4, 2, start=start)) == []
+    assert list(emk_comb_gen(4, 2, start=start)) == []
+
+
+def run_emk_prune(n: int, k: int, policy) -> list[list[int]]:
+    result = []
+    gen = emk_prune(n, k)
+    seq = next(gen)
+    while True:
+        result.append(list(seq))
+        try:
+            seq = gen.send(policy(seq))
+        except StopIteration:
+            return result
+
+
+@pytest.mark.parametrize("n, k", [(6, 3), (7, 2), (8, 4), (9, 5), (8, 1), (5, 5)])
+def test_emk_prune(n: int, k: int) -> None:
+    assert run_emk_prune(n, k, lambda seq: None) == [list(s) for s in emk(n, k)]
+    rng = random.Random(n * 10 + k)
+    decisions: dict[tuple[int, ...], Optional[int]] = {}
+
+    def policy(seq: list[int]) -> Optional[int]:
+        key = tuple(seq)
+        if key not in decisions:
+            decisions[key] = rng.choice([None, None, rng.randrange(n + 1)])
+        return decisions[key]
+
+    expected = []
+    skip_from, skip_tail = None, None
+    for seq in emk(n, k):
+        if skip_from is not None and seq[skip_from:] == skip_tail:
+            continue
+        expected.append(list(seq))
+        skip_from = policy(seq)
+        skip_tail = None if skip_from is None else seq[skip_from:]
+    assert run_emk_prune(n, k, policy) == expected
+
+
+def multiset_by_filter(mults: list[int], k: int) -> list[list[int]]:
+    """The stars-and-bars strings in emk order, restricted to mults."""
+    result = []
+    for seq in emk(k + len(mults) - 1, k):
+        counts = [0] * len(mults)
+        value = 0
+        for bit in seq:
+            if bit:
+                counts[value] += 1
+            else:
+                value += 1
+        if all(c <= m for c, m in zip(counts, mults)):
+            result.append(counts)
+    return result
+
+
+@pytest.mark.parametrize(
+    "mults", [[2, 1, 2], [3, 0, 2, 1], [1, 1, 1, 1, 1], [2, 3, 1, 2, 2], [4], [0, 3]]
+)
+def test_multiset_comb(mults: list[int]) -> None:
+    for k in range(sum(mults) + 1):
+        counts = [list(c) for c in multiset_comb(mults, k)]
+        assert counts == multiset_by_filter(mults, k)
+        assert len(counts) == multiset_comb_count(mults, k)
+        assert len({tuple(c) for c in counts}) == len(counts)
+        for before, after in zip(counts, counts[1:]):
+            diff = sorted(a - b for a, b in zip(after, before) if a != b)
+            assert diff == [-1, 1]
+
+
+def test_multiset_comb_gen_deltas() -> None:
+    mults = [3, 2, 4, 1]
+    counts = next(multiset_comb(mults, 5)).copy()
+    for down, up in multiset_comb_gen(mults, 5):
+        counts[down] -= 1
+        counts[up] += 1
+        assert 0 <= counts[down] and counts[up] <= mults[up]
+    assert sum(counts) == 5
+
+
+def test_multiset_comb_edges() -> None:
+    assert list(multiset_comb([2, 2], 5)) == []
+    assert list(multiset_comb([2, 2], -1)) == []
+    assert [list(c) for c in multiset_comb([2, 2], 0)] == [[0, 0]]
+    assert multiset_comb_count([2, 2], 5) == 0
+    assert multiset_comb_count([], 0) == 1
+    # deep recursion in the second value is handled by the explicit stack
+    assert sum(1 for _ in multiset_comb_gen([3000, 3000], 3000)) == 3000
+
+
+@pytest.mark.parametrize("cache", [None, EmkSwapCache(), EmkSwapCache(max_bytes=8)])
+def test_emk_swap_reader(cache: Optional[EmkSwapCache]) -> None:
+    np = pytest.importorskip("numpy")
+    read = emk_swap_reader(9, 4, cache)
+    parts = [read(count) for count in (1, 7, 0, 40, comb(9, 4) - 49)]
+    flat = np.concatenate(parts).tolist()
+    assert all(part.dtype == np.intp for part in parts)
+    assert list(zip(flat[0::2], flat[1::2])) == list(emk_comb_gen(9, 4))
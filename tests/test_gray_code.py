@@ -1,4 +1,22 @@
-from ec_gen.gray_code import brgc, brgc_gen
+from itertools import product
+
+import pytest
+
+from ec_gen.gray_code import (
+    brgc,
+    brgc_batches,
+    brgc_flips_array,
+    brgc_flips_chunks,
+    brgc_gen,
+    brgc_gen_loopless,
+    brgc_int,
+    brgc_rank,
+    brgc_subset_sums,
+    brgc_subset_sums_chunks,
+    brgc_unrank,
+    mrgc,
+    mrgc_gen,
+)
 
 
 def test_brgc_gen_odd() -> None:
@@ -27,3 +45,157 @@ def test_brgc_even() -> None:
     for _ in brgc(6):
         cnt += 1
     assert cnt == 2**6
+
+
+def test_brgc_gen_loopless() -> None:
+    for n in range(1, 10):
+        assert list(brgc_gen_loopless(n)) == list(brgc_gen(n))
+
+
+def test_brgc_gen_loopless_zero() -> None:
+    assert list(brgc_gen_loopless(0)) == []
+
+
+def test_brgc_gen_zero() -> None:
+    assert list(brgc_gen(0)) == []
+    assert list(brgc_int(0)) == list(brgc_int(0, loopless=True)) == [(0, 0)]
+    assert [list(bits) for bits in brgc(0)] == [[]]
+
+
+def test_brgc_loopless() -> None:
+    expected = [list(bits) for bits in brgc(6)]
+    result = [list(bits) for bits in brgc(6, loopless=True)]
+    assert result == expected
+
+
+def test_brgc_int() -> None:
+    prev = 0
+    for (word, mask), bits in zip(brgc_int(5), brgc(5)):
+        assert word == sum(b << i for i, b in enumerate(bits))
+        assert word ^ mask == prev
+        prev = word
+
+
+def test_brgc_batches() -> None:
+    np = pytest.importorskip("numpy")
+    chunks = list(brgc_batches(7, batch_size=10))
+    assert all(chunk.dtype == np.uint64 for chunk in chunks)
+    assert len(chunks) == 13
+    words = np.concatenate(chunks).tolist()
+    assert words == [word for word, _ in brgc_int(7)]
+
+
+def test_brgc_batches_invalid() -> None:
+    pytest.importorskip("numpy")
+    with pytest.raises(ValueError):
+        next(brgc_batches(65))
+    with pytest.raises(ValueError):
+        next(brgc_batches(4, batch_size=0))
+
+
+def test_brgc_rank_unrank() -> None:
+    for r, (word, _) in enumerate(brgc_int(6)):
+        assert brgc_unrank(6, r) == word
+        assert brgc_rank(word) == r
+
+
+def test_brgc_unrank_invalid() -> None:
+    with pytest.raises(ValueError):
+        brgc_unrank(3, 8)
+    with pytest.raises(ValueError):
+        brgc_rank(-1)
+
+
+def test_brgc_gen_range_shards() -> None:
+    flips = list(brgc_gen(6))
+    bounds = [0, 5, 17, 40, 63]
+    shards = []
+    for start, stop in zip(bounds, bounds[1:]):
+        shards += list(brgc_gen(6, start=start, stop=stop))
+    assert shards == flips
+
+
+def test_brgc_range() -> None:
+    words = [list(bits) for bits in brgc(5)]
+    assert [list(bits) for bits in brgc(5, start=7, stop=20)] == words[7:20]
+    assert [list(bits) for bits in brgc(5, start=30)] == words[30:]
+    assert list(brgc(5, start=9, stop=9)) == []
+
+
+def test_brgc_int_range() -> None:
+    words = [word for word, _ in brgc_int(5)]
+    assert [word for word, _ in brgc_int(5, start=3, stop=11)] == words[3:11]
+
+
+def test_brgc_flips_array() -> None:
+    np = pytest.importorskip("numpy")
+    flips = brgc_flips_array(10)
+    assert flips.dtype == np.uint8
+    assert flips.flags["C_CONTIGUOUS"]
+    assert flips.tolist() == list(brgc_gen(10))
+    assert brgc_flips_array(0).size == 0
+
+
+def test_brgc_flips_chunks() -> None:
+    np = pytest.importorskip("numpy")
+    flips = brgc_flips_array(9, dtype=np.int16)
+    chunks = list(brgc_flips_chunks(9, chunk_size=100, dtype=np.int16))
+    assert all(len(chunk) <= 100 for chunk in chunks)
+    assert np.array_equal(np.concatenate(chunks), flips)
+    part = np.concatenate(list(brgc_flips_chunks(9, chunk_size=7, start=33, stop=300)))
+    assert np.array_equal(part, flips[33:300])
+
+
+def test_mrgc_covers_product() -> None:
+    radices = (3, 1, 4, 2)
+    words = [tuple(digits) for digits in mrgc(radices)]
+    assert len(words) == 3 * 4 * 2
+    assert sorted(words) == sorted(product(*(range(m) for m in radices)))
+
+
+def test_mrgc_gen_minimal_change() -> None:
+    radices = (2, 5, 3)
+    digits = [0, 0, 0]
+    for j, delta in mrgc_gen(radices):
+        assert delta in (1, -1)
+        digits[j] += delta
+        assert 0 <= digits[j] < radices[j]
+
+
+def test_mrgc_gen_binary() -> None:
+    assert [j for j, _ in mrgc_gen([2] * 6)] == list(brgc_gen(6))
+    assert [list(d) for d in mrgc([2] * 4)] == [list(b) for b in brgc(4)]
+
+
+def test_mrgc_gen_invalid() -> None:
+    with pytest.raises(ValueError):
+        next(mrgc_gen((3, 0)))
+
+
+def test_brgc_subset_sums() -> None:
+    np = pytest.importorskip("numpy")
+    weights = np.array([3, -5, 8, 13, 21, -2])
+    table = brgc_subset_sums(weights)
+    expected = [sum(w * b for w, b in zip(weights, bits)) for bits in brgc(6)]
+    assert table.tolist() == expected
+
+
+def test_brgc_subset_sums_xor() -> None:
+    np = pytest.importorskip("numpy")
+    weights = np.array([0b1011, 0b0110, 0b1100, 0b0001, 0b1111])
+    table = brgc_subset_sums(weights, op="xor")
+    for value, bits in zip(table.tolist(), brgc(5)):
+        expected = 0
+        for w, b in zip(weights.tolist(), bits):
+            expected ^= w * b
+        assert value == expected
+
+
+def test_brgc_subset_sums_chunks() -> None:
+    np = pytest.importorskip("numpy")
+    weights = np.arange(1, 10) ** 2
+    for op in ("sum", "xor"):
+        chunks = list(brgc_subset_sums_chunks(weights, op=op, chunk_size=50))
+        assert np.array_equal(np.concatenate(chunks), brgc_subset_sums(weights, op))
+    with pytest.raises(ValueError):
+        brgc_subset_sums(weights, op="max")
@@ -1,8 +1,18 @@
 from math import factorial
 
-from ec_gen.ehr import ehr_gen
-from ec_gen.sjt import PlainChanges, sjt_gen
-from ec_gen.sjt_list import sjt2
+import pytest
+
+from ec_gen.ehr import ehr_gen, ehr_gen_loopless
+from ec_gen.sjt import (
+    PlainChanges,
+    sjt_gen,
+    sjt_gen_loopless,
+    sjt_rank,
+    sjt_swaps_array,
+    sjt_swaps_chunks,
+    sjt_unrank,
+)
+from ec_gen.sjt_list import sjt2, sjt2_batches, sjt2_buffer
 
 
 def test_sjt_gen_odd() -> None:
@@ -57,6 +67,21 @@ def test_ehr8() -> None:
     assert perm == [0, 2, 3, 1, 5, 6, 4, 7]
 
 
+@pytest.mark.parametrize("n", range(10))
+def test_ehr_gen_loopless(n: int) -> None:
+    assert list(ehr_gen_loopless(n)) == list(ehr_gen(n))
+    assert list(ehr_gen(n, loopless=True)) == list(ehr_gen(n))
+
+
+def test_ehr_gen_loopless_perms() -> None:
+    perm = list(range(7))
+    seen = {tuple(perm)}
+    for x in ehr_gen_loopless(7):
+        perm[0], perm[x] = perm[x], perm[0]
+        seen.add(tuple(perm))
+    assert len(seen) == factorial(7)
+
+
 def test_sjt2_odd() -> None:
     cnt = 0  # start from 0
     for _ in sjt2(5):
@@ -98,3 +123,155 @@ def test_plain_changes_3() -> None:
 def test_sjt2() -> None:
     p = list(sjt2(3))
     assert p == [[0, 1, 2], [0, 2, 1], [2, 0, 1], [2, 1, 0], [1, 2, 0], [1, 0, 2]]
+
+
+@pytest.mark.parametrize("n", range(2, 8))
+def test_sjt2_buffer(n: int) -> None:
+    views = []
+    perms = []
+    for view in sjt2_buffer(n):
+        views.append(view)
+        perms.append(view.tolist())
+    assert perms == list(sjt2(n))
+    assert all(view is views[0] for view in views)
+    with pytest.raises(TypeError):
+        views[0][0] = 1  # type: ignore[index]
+
+
+def test_sjt2_buffer_shared() -> None:
+    buf = next(sjt2_buffer(4, readonly=False))
+    buf[0] = 9
+    assert buf.tolist() == [9, 1, 2, 3]
+
+
+@pytest.mark.parametrize("n", range(1, 8))
+@pytest.mark.parametrize("batch_size", [1, 5, 24, 1000])
+def test_sjt2_batches(n: int, batch_size: int) -> None:
+    np = pytest.importorskip("numpy")
+    ref = list(sjt2(n)) if n > 1 else [[0]]
+    batches = [batch.copy() for batch in sjt2_batches(n, batch_size)]
+    assert np.concatenate(batches).tolist() == ref
+    assert all(len(batch) == batch_size for batch in batches[:-1])
+
+
+def test_sjt2_batches_out() -> None:
+    np = pytest.importorskip("numpy")
+    out = np.zeros((50, 5), dtype=np.int16)
+    rows = []
+    for batch in sjt2_batches(5, out=out):
+        assert np.shares_memory(batch, out)
+        rows.extend(batch.tolist())
+    assert rows == list(sjt2(5))
+    with pytest.raises(ValueError):
+        next(sjt2_batches(5, out=np.zeros((50, 4))))
+
+
+@pytest.mark.parametrize("n", range(2, 9))
+def test_sjt_gen_loopless(n: int) -> None:
+    assert list(sjt_gen_loopless(n)) == list(sjt_gen(n))
+    assert list(sjt_gen(n, loopless=True)) == list(sjt_gen(n))
+    assert list(sjt_gen_loopless(n, origin=False)) == list(PlainChanges(n))
+    assert list(PlainChanges(n, loopless=True)) == list(PlainChanges(n))
+
+
+def test_sjt_gen_loopless_small() -> None:
+    assert list(sjt_gen_loopless(0)) == []
+    assert list(sjt_gen_loopless(1)) == []
+    assert list(PlainChanges(1, loopless=True)) == list(PlainChanges(1)) == []
+
+
+@pytest.mark.parametrize("n", range(0, 9))
+def test_sjt_swaps_array(n: int) -> None:
+    pytest.importorskip("numpy")
+    expected = list(sjt_gen(n)) if n >= 2 else []
+    assert sjt_swaps_array(n).tolist() == expected
+    assert sjt_swaps_array(n, dtype="int64").dtype == "int64"
+
+
+def test_sjt_swaps_chunks() -> None:
+    np = pytest.importorskip("numpy")
+    expected = sjt_swaps_array(11)
+    chunks = list(sjt_swaps_chunks(11, chunk_size=300000))
+    assert all(len(chunk) <= 300000 for chunk in chunks)
+    assert np.array_equal(np.concatenate(chunks), expected)
+    small = [chunk.tolist() for chunk in sjt_swaps_chunks(4, chunk_size=10)]
+    assert sum(small, []) == list(sjt_gen(4))
+    with pytest.raises(ValueError):
+        next(sjt_swaps_chunks(4, chunk_size=0))
+
+
+def test_sjt_swaps_array_cache(tmp_path) -> None:
+    pytest.importorskip("numpy")
+    swaps = sjt_swaps_array(6, cache_dir=str(tmp_path))
+    assert (tmp_path / "sjt_swaps_6.npy").exists()
+    assert sjt_swaps_array(6, cache_dir=str(tmp_path)).tolist() == swaps.tolist()
+    assert [p.name for p in tmp_path.iterdir()] == ["sjt_swaps_6.npy"]
+
+
+def test_sjt_swaps_array_bad_cache(tmp_path) -> None:
+    np = pytest.importorskip("numpy")
+    path = tmp_path / "sjt_swaps_6.npy"
+    expected = list(sjt_gen(6))
+    path.write_bytes(b"\x93NUMPY")  # truncated
+    assert sjt_swaps_array(6, cache_dir=str(tmp_path)).tolist() == expected
+    np.save(path, np.zeros(10, dtype=np.uint8))  # wrong length
+    assert sjt_swaps_array(6, cache_dir=str(tmp_path)).tolist() == expected
+    assert np.load(path).tolist() == expected
+
+
+@pytest.mark.parametrize("n", range(2, 7))
+def test_sjt_rank_unrank(n: int) -> None:
+    perm = list(range(n))
+    for rank, x in enumerate(sjt_gen(n)):
+        assert sjt_rank(perm) == rank
+        assert sjt_unrank(n, rank) == perm
+        perm[x], perm[x + 1] = perm[x + 1], perm[x]
+
+
+def test_sjt_rank_invalid() -> None:
+    with pytest.raises(ValueError):
+        sjt_rank([0, 2, 2])
+    with pytest.raises(ValueError):
+        sjt_unrank(4, 24)
+    assert sjt_unrank(1, 0) == [0] and sjt_rank([0]) == 0
+
+
+@pytest.mark.parametrize("n", [5, 7])
+def test_sjt_gen_range_shards(n: int) -> None:
+    full = list(sjt_gen(n))
+    bounds = [0, 1, 17, n * 5 + 3, len(full) - 2, len(full)]
+    shards: list[int] = []
+    for start, stop in zip(bounds, bounds[1:]):
+        shards.extend(sjt_gen(n, start=start, stop=stop))
+    assert shards == full
+    assert list(sjt_gen(n, loopless=True, start=17, stop=40)) == full[17:40]
+    assert list(sjt_gen(n, start=len(full) + 5)) == []
+    with pytest.raises(ValueError):
+        next(sjt_gen(n, start=-1))
+
+
+def test_sjt_gen_resume_large() -> None:
+    start = factorial(13) // 2 + 12345
+    perm = sjt_unrank(13, start)
+    for x in sjt_gen(13, start=start, stop=start + 200):
+        perm[x], perm[x + 1] = perm[x + 1], perm[x]
+    assert sjt_rank(perm) == start + 200
+
+
+@pytest.mark.parametrize("n", [3, 4, 5, 6])
+def test_sjt_gen_loopless_range(n: int) -> None:
+    full = list(sjt_gen(n))
+    plain = list(PlainChanges(n))
+    for start in range(len(full) + 2):
+        assert list(sjt_gen(n, loopless=True, start=start)) == full[start:]
+        assert list(sjt_gen_loopless(n, origin=False, start=start)) == plain[start:]
+    with pytest.raises(ValueError):
+        next(sjt_gen_loopless(n, start=-1))
+
+
+def test_sjt_gen_loopless_resume_large() -> None:
+    start = factorial(13) // 2 + 12345
+    perm = sjt_unrank(13, start)
+    for x in sjt_gen(13, loopless=True, start=start, stop=start + 200):
+        perm[x], perm[x + 1] = perm[x + 1], perm[x]
+    assert sjt_rank(perm) == start + 200
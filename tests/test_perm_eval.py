@@ -0,0 +1,113 @@
+from itertools import permutations
+
+import pytest
+
+from ec_gen.perm_eval import qap_best, qap_cost_chunks, tour_best, tour_cost_chunks
+from ec_gen.sjt import sjt_unrank
+
+np = pytest.importorskip("numpy")
+
+
+def perm_of(n, rank, fix_first):
+    if fix_first:
+        return [0] + [x + 1 for x in sjt_unrank(n - 1, rank)]
+    return list(sjt_unrank(n, rank))
+
+
+def tour_cost(distances, perm):
+    n = len(perm)
+    return sum(distances[perm[i], perm[(i + 1) % n]] for i in range(n))
+
+
+def qap_cost(flows, distances, perm):
+    n = len(perm)
+    return sum(
+        flows[i, j] * distances[perm[i], perm[j]] for i in range(n) for j in range(n)
+    )
+
+
+@pytest.mark.parametrize("n", range(1, 7))
+@pytest.mark.parametrize("fix_first", [False, True])
+def test_tour_cost_chunks(n: int, fix_first: bool) -> None:
+    rng = np.random.default_rng(n)
+    distances = rng.integers(0, 20, size=(n, n))
+    ranks = []
+    for chunk_ranks, costs in tour_cost_chunks(distances, fix_first, chunk_size=7):
+        for rank, cost in zip(chunk_ranks.tolist(), costs.tolist()):
+            assert cost == tour_cost(distances, perm_of(n, rank, fix_first))
+        ranks.extend(chunk_ranks.tolist())
+    assert ranks == list(range(len(list(permutations(range(n - fix_first))))))
+
+
+@pytest.mark.parametrize("n", range(1, 7))
+@pytest.mark.parametrize("fix_first", [False, True])
+def test_qap_cost_chunks(n: int, fix_first: bool) -> None:
+    rng = np.random.default_rng(n)
+    flows = rng.integers(-5, 6, size=(n, n))
+    distances = rng.integers(0, 20, size=(n, n))
+    for ranks, costs in qap_cost_chunks(flows, distances, fix_first, chunk_size=5):
+        for rank, cost in zip(ranks.tolist(), costs.tolist()):
+            assert cost == qap_cost(flows, distances, perm_of(n, rank, fix_first))
+
+
+@pytest.mark.parametrize("dtype", ["uint8", "int8", "uint16", "bool"])
+def test_narrow_dtypes(dtype: str) -> None:
+    rng = np.random.default_rng(3)
+    flows = rng.integers(0, 2 if dtype == "bool" else 100, size=(5, 5))
+    distances = rng.integers(0, 2 if dtype == "bool" else 100, size=(5, 5))
+    narrow_flows, narrow_distances = flows.astype(dtype), distances.astype(dtype)
+    for ranks, costs in tour_cost_chunks(narrow_distances, False, chunk_size=7):
+        for rank, cost in zip(ranks.tolist(), costs.tolist()):
+            assert cost == tour_cost(distances, perm_of(5, rank, False))
+    for ranks, costs in qap_cost_chunks(narrow_flows, narrow_distances, chunk_size=7):
+        for rank, cost in zip(ranks.tolist(), costs.tolist()):
+            assert cost == qap_cost(flows, distances, perm_of(5, rank, False))
+    _, costs = tour_best(narrow_distances, maximize=True)
+    expected = max(
+        tour_cost(distances, (0,) + perm) for perm in permutations(range(1, 5))
+    )
+    assert costs.tolist() == [expected]
+
+
+def test_tour_best() -> None:
+    rng = np.random.default_rng(7)
+    distances = rng.random((7, 7))
+    tours, costs = tour_best(distances, top=4, chunk_size=100)
+    expected = sorted(
+        tour_cost(distances, (0,) + perm) for perm in permutations(range(1, 7))
+    )
+    assert costs.tolist() == pytest.approx(expected[:4])
+    assert (tours[:, 0] == 0).all()
+    for tour, cost in zip(tours, costs):
+        assert tour_cost(distances, tour) == pytest.approx(cost)
+
+
+def test_tour_best_rotation() -> None:
+    rng = np.random.default_rng(8)
+    distances = rng.random((6, 6))
+    _, fixed = tour_best(distances)
+    _, free = tour_best(distances, fix_first=False)
+    assert fixed.tolist() == pytest.approx(free.tolist())
+
+
+def test_qap_best() -> None:
+    rng = np.random.default_rng(9)
+    flows = rng.integers(0, 10, size=(6, 6))
+    distances = rng.integers(0, 10, size=(6, 6))
+    perms, costs = qap_best(flows, distances, top=3, maximize=True)
+    expected = sorted(
+        (qap_cost(flows, distances, perm) for perm in permutations(range(6))),
+        reverse=True,
+    )
+    assert costs.tolist() == expected[:3]
+    for perm, cost in zip(perms, costs):
+        assert qap_cost(flows, distances, perm) == cost
+
+
+def test_cost_chunks_errors() -> None:
+    with pytest.raises(ValueError):
+        next(tour_cost_chunks(np.zeros((3, 4))))
+    with pytest.raises(ValueError):
+        next(qap_cost_chunks(np.zeros((3, 3)), np.zeros((4, 4))))
+    with pytest.raises(ValueError):
+        next(tour_cost_chunks(np.zeros((3, 3)), chunk_size=0))
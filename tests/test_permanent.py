@@ -0,0 +1,52 @@
+from itertools import permutations
+from math import factorial, prod
+
+import pytest
+
+from ec_gen.permanent import permanent
+
+np = pytest.importorskip("numpy")
+
+
+def naive_permanent(matrix):
+    n = len(matrix)
+    return sum(prod(matrix[i][p[i]] for i in range(n)) for p in permutations(range(n)))
+
+
+def test_permanent_small() -> None:
+    assert permanent([[1, 2], [3, 4]]) == 10.0
+    assert permanent([[5]]) == 5.0
+    assert permanent(np.zeros((0, 0))) == 1.0
+
+
+def test_permanent_ones() -> None:
+    for n in range(1, 9):
+        assert permanent(np.ones((n, n))) == factorial(n)
+
+
+def test_permanent_random() -> None:
+    rng = np.random.default_rng(3)
+    for n in range(2, 7):
+        matrix = rng.integers(-5, 6, size=(n, n))
+        expected = naive_permanent(matrix.tolist())
+        assert permanent(matrix, chunk_size=5) == pytest.approx(expected)
+
+
+def test_permanent_complex() -> None:
+    rng = np.random.default_rng(4)
+    matrix = rng.normal(size=(5, 5)) + 1j * rng.normal(size=(5, 5))
+    expected = naive_permanent(matrix.tolist())
+    assert permanent(matrix) == pytest.approx(expected)
+
+
+def test_permanent_processes() -> None:
+    rng = np.random.default_rng(5)
+    matrix = rng.normal(size=(9, 9))
+    assert permanent(matrix, processes=3, chunk_size=17) == pytest.approx(
+        permanent(matrix)
+    )
+
+
+def test_permanent_not_square() -> None:
+    with pytest.raises(ValueError):
+        permanent([[1, 2, 3], [4, 5, 6]])
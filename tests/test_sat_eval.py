@@ -0,0 +1,51 @@
+import random
+
+import pytest
+
+from ec_gen.sat_eval import cnf_to_csr, sat_count, sat_gen
+
+
+def satisfies(clauses, word):
+    return all(
+        any((word >> (abs(lit) - 1) & 1) == (lit > 0) for lit in clause)
+        for clause in clauses
+    )
+
+
+def random_cnf(n, m, k, seed):
+    rng = random.Random(seed)
+    return [
+        [rng.choice((1, -1)) * rng.randint(1, n) for _ in range(k)] for _ in range(m)
+    ]
+
+
+def test_sat_gen_random() -> None:
+    for seed in range(5):
+        clauses = random_cnf(8, 20, 3, seed)
+        found = list(sat_gen(8, *cnf_to_csr(clauses)))
+        expected = [w for w in range(256) if satisfies(clauses, w)]
+        assert sorted(found) == expected
+        assert len(set(found)) == len(found)
+
+
+def test_sat_count() -> None:
+    clauses = random_cnf(10, 30, 3, 42)
+    expected = sum(satisfies(clauses, w) for w in range(1024))
+    assert sat_count(10, *cnf_to_csr(clauses)) == expected
+
+
+def test_sat_count_trivial() -> None:
+    assert sat_count(4, *cnf_to_csr([])) == 16
+    assert sat_count(2, *cnf_to_csr([[1], [-1]])) == 0
+    assert sat_count(2, *cnf_to_csr([[1, -1]])) == 4
+
+
+def test_sat_gen_numpy_input() -> None:
+    np = pytest.importorskip("numpy")
+    indptr, literals = cnf_to_csr([[1, 2], [-1, -2]])
+    assert sat_count(2, np.array(indptr), np.array(literals)) == 2
+
+
+def test_sat_gen_invalid_literal() -> None:
+    with pytest.raises(ValueError):
+        next(sat_gen(2, *cnf_to_csr([[1, 3]])))
@@ -0,0 +1,200 @@
+import pytest
+
+from ec_gen.combin import EmkSwapCache, emk_bits
+from ec_gen.gray_code import brgc_int
+from ec_gen.subset_eval import (
+    ksubset_best,
+    ksubset_objective_chunks,
+    ksubset_threshold,
+    subset_best,
+    subset_objective_chunks,
+    subset_threshold,
+)
+
+np = pytest.importorskip("numpy")
+
+
+def brute_force(weights, pairwise, word):
+    x = np.array([(word >> i) & 1 for i in range(len(weights))])
+    value = weights @ x
+    if pairwise is not None:
+        value = value + x @ pairwise @ x
+    return value
+
+
+def test_subset_objective_chunks_linear() -> None:
+    weights = np.array([5, -3, 2, 7, -1])
+    chunks = list(subset_objective_chunks(weights, chunk_size=7))
+    words = np.concatenate([w for w, _ in chunks]).tolist()
+    values = np.concatenate([v for _, v in chunks]).tolist()
+    assert words == [word for word, _ in brgc_int(5)]
+    assert values == [brute_force(weights, None, word) for word in words]
+
+
+def test_subset_objective_chunks_pairwise() -> None:
+    rng = np.random.default_rng(42)
+    weights = rng.integers(-9, 10, size=7)
+    pairwise = rng.integers(-9, 10, size=(7, 7))
+    for words, values in subset_objective_chunks(weights, pairwise, chunk_size=20):
+        for word, value in zip(words.tolist(), values.tolist()):
+            assert value == brute_force(weights, pairwise, word)
+
+
+def test_subset_objective_chunks_multi() -> None:
+    rng = np.random.default_rng(1)
+    weights = rng.normal(size=(3, 6))
+    pairwise = rng.normal(size=(6, 6))
+    for words, values in subset_objective_chunks(weights, pairwise, chunk_size=16):
+        assert values.shape == (len(words), 3)
+        for word, row in zip(words.tolist(), values):
+            expected = [brute_force(w, pairwise, word) for w in weights]
+            assert np.allclose(row, expected)
+
+
+def test_subset_best() -> None:
+    rng = np.random.default_rng(7)
+    weights = rng.integers(-20, 20, size=8)
+    pairwise = rng.integers(-5, 5, size=(8, 8))
+    values = sorted(brute_force(weights, pairwise, word) for word in range(256))
+    words, best = subset_best(weights, pairwise, top=5, chunk_size=30)
+    assert best.tolist() == values[:5]
+    assert [brute_force(weights, pairwise, w) for w in words.tolist()] == values[:5]
+    _, best = subset_best(weights, pairwise, top=3, maximize=True)
+    assert best.tolist() == values[::-1][:3]
+
+
+def test_subset_best_multi() -> None:
+    weights = np.array([[1, 2, 3], [-1, -2, -3]])
+    words, values = subset_best(weights, top=2)
+    assert words.tolist() == [[0, 1], [7, 6]]
+    assert values.tolist() == [[0, 1], [-6, -5]]
+
+
+def test_subset_objective_chunks_empty() -> None:
+    chunks = list(subset_objective_chunks(np.zeros(0, dtype=int)))
+    assert [(w.tolist(), v.tolist()) for w, v in chunks] == [([0], [0])]
+    chunks = list(subset_objective_chunks(np.zeros((2, 0)), np.zeros((0, 0))))
+    assert [(w.tolist(), v.tolist()) for w, v in chunks] == [([0], [[0.0, 0.0]])]
+    words, values = subset_best(np.zeros(0))
+    assert words.tolist() == [0] and values.tolist() == [0.0]
+
+
+def test_subset_threshold() -> None:
+    weights = np.array([4, -1, 2, -3])
+    found: dict[int, int] = {}
+    for words, values in subset_threshold(weights, -1, chunk_size=5):
+        found.update(zip(words.tolist(), values.tolist()))
+    expected = {
+        word: brute_force(weights, None, word)
+        for word in range(16)
+        if brute_force(weights, None, word) <= -1
+    }
+    assert found == expected
+
+
+def test_subset_objective_chunks_invalid() -> None:
+    with pytest.raises(ValueError):
+        next(subset_objective_chunks([1, 2], [[1, 2, 3]]))
+    with pytest.raises(ValueError):
+        subset_best([1, 2], top=0)
+
+
+def ksubset_brute_force(weights, distances, word):
+    x = np.array([(word >> i) & 1 for i in range(len(weights))])
+    value = weights @ x
+    if distances is not None:
+        value = value + x @ np.triu(distances, 1) @ x
+    return value
+
+
+def test_ksubset_objective_chunks() -> None:
+    rng = np.random.default_rng(3)
+    weights = rng.integers(-9, 10, size=9)
+    distances = rng.integers(0, 10, size=(9, 9))
+    chunks = list(ksubset_objective_chunks(weights, 4, distances, chunk_size=11))
+    words = np.concatenate([w for w, _ in chunks]).tolist()
+    values = np.concatenate([v for _, v in chunks]).tolist()
+    assert words == [mask for mask, _ in emk_bits(9, 4)]
+    assert values == [ksubset_brute_force(weights, distances, w) for w in words]
+
+
+def test_ksubset_objective_chunks_multi_cached() -> None:
+    rng = np.random.default_rng(5)
+    weights = rng.normal(size=(2, 8))
+    distances = rng.normal(size=(8, 8))
+    cache = EmkSwapCache()
+    for _ in range(2):
+        chunks = ksubset_objective_chunks(weights, 3, distances, 10, cache)
+        for words, values in chunks:
+            assert values.shape == (len(words), 2)
+            for word, row in zip(words.tolist(), values):
+                expected = [ksubset_brute_force(w, distances, word) for w in weights]
+                assert np.allclose(row, expected)
+    assert cache.cache_info().hits == 1
+
+
+def test_ksubset_best() -> None:
+    rng = np.random.default_rng(11)
+    weights = rng.integers(-20, 20, size=10)
+    distances = rng.integers(0, 9, size=(10, 10))
+    values = sorted(
+        ksubset_brute_force(weights, distances, word)
+        for word in range(1 << 10)
+        if bin(word).count("1") == 4
+    )
+    words, best = ksubset_best(weights, 4, distances, top=6, chunk_size=25)
+    assert best.tolist() == values[:6]
+    assert all(bin(w).count("1") == 4 for w in words.tolist())
+    _, best = ksubset_best(weights, 4, distances, top=2, maximize=True)
+    assert best.tolist() == values[::-1][:2]
+
+
+def test_ksubset_threshold() -> None:
+    weights = np.array([4, -1, 2, -3, 5, 0])
+    found: dict[int, int] = {}
+    for words, values in ksubset_threshold(weights, 3, 0, chunk_size=4):
+        found.update(zip(words.tolist(), values.tolist()))
+    expected = {
+        word: ksubset_brute_force(weights, None, word)
+        for word in range(1 << 6)
+        if bin(word).count("1") == 3 and ksubset_brute_force(weights, None, word) <= 0
+    }
+    assert found == expected
+
+
+def test_ksubset_objective_chunks_edges() -> None:
+    words, values = next(ksubset_objective_chunks([1, 2, 3], 0))
+    assert (words.tolist(), values.tolist()) == ([0], [0])
+    words, values = next(ksubset_objective_chunks([1, 2, 3], 3, np.ones((3, 3))))
+    assert (words.tolist(), values.tolist()) == ([7], [9])
+    with pytest.raises(ValueError):
+        next(ksubset_objective_chunks([1, 2], 3))
+    with pytest.raises(ValueError):
+        next(ksubset_objective_chunks([1, 2], 1, [[1, 2, 3]]))
+
+
+def test_ksubset_objective_chunks_empty() -> None:
+    chunks = list(ksubset_objective_chunks(np.zeros(0), 0, np.zeros((0, 0))))
+    assert [(w.tolist(), v.tolist()) for w, v in chunks] == [([0], [0.0])]
+    words, values = next(ksubset_objective_chunks(np.zeros((2, 0)), 0))
+    assert (words.tolist(), values.shape) == ([0], (1, 2))
+
+
+def test_ksubset_objective_chunks_wide() -> None:
+    rng = np.random.default_rng(3)
+    weights = rng.integers(-9, 10, size=64)
+    distances = rng.integers(-9, 10, size=(64, 64))
+    for chunk_size in (1, 97, 4096):
+        for words, values in ksubset_objective_chunks(
+            weights, 2, distances, chunk_size=chunk_size
+        ):
+            for word, value in zip(words.tolist(), values.tolist()):
+                assert value == ksubset_brute_force(weights, distances, word)
+
+
+def test_best_unsigned_maximize() -> None:
+    weights = np.array([3, 5, 7, 40], dtype=np.uint8)
+    words, best = subset_best(weights, top=2, maximize=True)
+    assert words.tolist() == [15, 14] and best.tolist() == [55, 52]
+    words, best = ksubset_best(weights, 2, top=2, maximize=True)
+    assert words.tolist() == [12, 10] and best.tolist() == [47, 45]
@@ -0,0 +1,45 @@
+import pytest
+
+from ec_gen.topk import best_of
+
+np = pytest.importorskip("numpy")
+
+
+def test_best_of_matches_sort() -> None:
+    rng = np.random.default_rng(7)
+    keys = np.arange(50)
+    values = rng.integers(-20, 20, size=50)
+    chunks = [(keys[i : i + 8], values[i : i + 8]) for i in range(0, 50, 8)]
+    best_keys, best_values = best_of(chunks, top=5, maximize=True)
+    assert best_values.tolist() == sorted(values.tolist(), reverse=True)[:5]
+    assert values[best_keys].tolist() == best_values.tolist()
+
+
+def test_best_of_multi() -> None:
+    keys = np.array([10, 11, 12])
+    values = np.array([[3, 0], [1, 2], [2, 1]])
+    best_keys, best_values = best_of([(keys, values)], top=2, multi=True)
+    assert best_keys.tolist() == [[11, 12], [10, 12]]
+    assert best_values.tolist() == [[1, 2], [0, 1]]
+
+
+def test_best_of_short_and_invalid() -> None:
+    best_keys, _ = best_of([(np.array([4]), np.array([1.5]))], top=3)
+    assert best_keys.tolist() == [4]
+    with pytest.raises(ValueError):
+        best_of([(np.array([4]), np.array([1.5]))], top=0)
+
+
+def test_best_of_unsigned_maximize() -> None:
+    keys = np.arange(6)
+    values = np.array([3, 250, 0, 255, 7, 1], dtype=np.uint8)
+    best_keys, best_values = best_of([(keys, values)], top=3, maximize=True)
+    assert best_keys.tolist() == [3, 1, 4]
+    assert best_values.tolist() == [255, 250, 7]
+
+
+def test_best_of_empty() -> None:
+    with pytest.raises(ValueError):
+        best_of([], top=2)
+    with pytest.raises(ValueError):
+        best_of([(np.array([], dtype=int), np.array([]))], top=2)